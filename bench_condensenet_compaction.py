@@ -0,0 +1,192 @@
+"""
+    Benchmark of inference latency and peak memory for CondenseNet (Gluon) before and after compaction (BatchNorm
+    layers are folded into grouped convolutions, and the classifier gather into its weight), with verification of
+    outputs.
+"""
+
+import argparse
+import os
+import sys
+import shutil
+import tempfile
+import subprocess
+import logging
+
+from common.logger_utils import initialize_logging
+
+
+_script_template = """
+import time
+import resource
+import numpy as np
+import mxnet as mx
+from gluon.gluoncv2.model_provider import get_model
+from gluon.utils import compact_condensenet
+ctx = mx.gpu(0) if {use_gpu} else mx.cpu()
+mx.random.seed(0)
+net = get_model('{model}', pretrained={use_pretrained}, ctx=ctx)
+if not {use_pretrained}:
+    net.initialize(mx.init.MSRAPrelu(), ctx=ctx)
+compacted_count = compact_condensenet(net) if {compact} else 0
+net.hybridize(static_alloc=True, static_shape=True)
+x = mx.nd.array(np.random.RandomState(0).normal(size=({batch_size}, 3, 224, 224)), ctx=ctx)
+for i in range({num_warmup_steps} + {num_steps}):
+    if i == {num_warmup_steps}:
+        mx.nd.waitall()
+        tic = time.time()
+    y = net(x)
+mx.nd.waitall()
+latency = (time.time() - tic) / {num_steps}
+if {use_gpu}:
+    free_memory, total_memory = mx.context.gpu_memory_info(0)
+    peak_memory = total_memory - free_memory
+else:
+    peak_memory = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+y = y.asnumpy()
+if {compact}:
+    max_abs_diff = float(np.abs(y - np.load('{ref_file_path}')).max())
+else:
+    np.save('{ref_file_path}', y)
+    max_abs_diff = 0.0
+print('{{}} {{}} {{}} {{}}'.format(latency, peak_memory, max_abs_diff, compacted_count))
+"""
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description='Benchmark inference latency and peak memory for CondenseNet compaction (Gluon)',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    parser.add_argument(
+        '--models',
+        type=str,
+        default='condensenet74_c4_g4,condensenet74_c8_g8',
+        help='list of CondenseNet models')
+    parser.add_argument(
+        '--use-pretrained',
+        action='store_true',
+        help='use pretrained weights (random ones are used otherwise)')
+    parser.add_argument(
+        '--batch-size',
+        type=int,
+        default=1,
+        help='batch size')
+    parser.add_argument(
+        '--num-warmup-steps',
+        type=int,
+        default=5,
+        help='number of warm-up steps')
+    parser.add_argument(
+        '--num-steps',
+        type=int,
+        default=50,
+        help='number of measured steps')
+    parser.add_argument(
+        '--num-gpus',
+        type=int,
+        default=0,
+        help='number of gpus to use (0 or 1)')
+
+    parser.add_argument(
+        '--save-dir',
+        type=str,
+        default='',
+        help='directory of saved log-files')
+    parser.add_argument(
+        '--logging-file-name',
+        type=str,
+        default='bench.log',
+        help='filename of log')
+    parser.add_argument(
+        '--log-packages',
+        type=str,
+        default='mxnet',
+        help='list of python packages for logging')
+    parser.add_argument(
+        '--log-pip-packages',
+        type=str,
+        default='mxnet-cu92',
+        help='list of pip packages for logging')
+    args = parser.parse_args()
+    return args
+
+
+def measure_inference(args,
+                      model_name,
+                      compact,
+                      ref_file_path):
+    """
+    Measure inference latency and peak memory in a fresh interpreter.
+
+    Parameters:
+    ----------
+    args : ArgumentParser
+        Main script arguments.
+    model_name : str
+        Name of the model.
+    compact : bool
+        Whether to compact the model.
+    ref_file_path : str
+        Path to the file with the reference output (it's written by the original model).
+
+    Returns
+    -------
+    tuple of (float, float, float, int)
+        Latency (in seconds), peak memory (in bytes), maximal absolute difference with the reference output and number
+        of compacted blocks.
+    """
+    script = _script_template.format(
+        model=model_name,
+        use_pretrained=args.use_pretrained,
+        use_gpu=(args.num_gpus > 0),
+        compact=compact,
+        batch_size=args.batch_size,
+        num_warmup_steps=args.num_warmup_steps,
+        num_steps=args.num_steps,
+        ref_file_path=ref_file_path)
+    output = subprocess.check_output(
+        [sys.executable, '-c', script],
+        cwd=os.path.dirname(os.path.abspath(__file__)))
+    latency, peak_memory, max_abs_diff, compacted_count = output.decode().strip().split('\n')[-1].split()
+    return float(latency), float(peak_memory), float(max_abs_diff), int(compacted_count)
+
+
+def main():
+    args = parse_args()
+
+    initialize_logging(
+        logging_dir_path=args.save_dir,
+        logging_file_name=args.logging_file_name,
+        script_args=args,
+        log_packages=args.log_packages,
+        log_pip_packages=args.log_pip_packages)
+
+    tmp_dir_path = tempfile.mkdtemp()
+    try:
+        for model_name in args.models.split(','):
+            model_name = model_name.strip()
+            ref_file_path = os.path.join(tmp_dir_path, '{}.npy'.format(model_name))
+            results = []
+            for compact in [False, True]:
+                latency, peak_memory, max_abs_diff, compacted_count = measure_inference(
+                    args=args,
+                    model_name=model_name,
+                    compact=compact,
+                    ref_file_path=ref_file_path)
+                results.append((latency, peak_memory))
+                logging.info('{model} ({mode}): latency={latency:.2f} ms,\tpeak memory={peak_memory:.1f} MB'.format(
+                    model=model_name,
+                    mode=('compacted, {} blocks, max-abs-diff={:.3e}'.format(compacted_count, max_abs_diff)
+                          if compact else 'original'),
+                    latency=(latency * 1000.0),
+                    peak_memory=(peak_memory / 2 ** 20)))
+            ratio_msg = '{model}: compacted vs original: latency x{time_ratio:.2f},\tpeak memory x{memory_ratio:.2f}'
+            logging.info(ratio_msg.format(
+                model=model_name,
+                time_ratio=(results[1][0] / results[0][0]),
+                memory_ratio=(results[1][1] / results[0][1])))
+    finally:
+        shutil.rmtree(tmp_dir_path, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,168 @@
+"""
+    Benchmark of per-step overhead of gradient clipping and gradient accumulation reset (Gluon): loops over parameters
+    versus the flat gradient buffer.
+"""
+
+import argparse
+import time
+import logging
+
+import mxnet as mx
+from mxnet import gluon
+
+from common.logger_utils import initialize_logging
+from gluon.gluoncv2.model_provider import get_model
+from gluon.utils import prepare_mx_context, FlatGradBuffer
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description='Benchmark per-step overhead of gradient clipping and accumulation reset (Gluon)',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    parser.add_argument(
+        '--model',
+        type=str,
+        default='nasnet_4a1056',
+        help='name of model')
+    parser.add_argument(
+        '--input-size',
+        type=int,
+        default=224,
+        help='size of the input for model (if model has no `in_size` attribute)')
+    parser.add_argument(
+        '--grad-clip',
+        type=float,
+        default=1.0,
+        help='max_norm for gradient clipping')
+    parser.add_argument(
+        '--num-warmup-steps',
+        type=int,
+        default=5,
+        help='number of warm-up steps')
+    parser.add_argument(
+        '--num-steps',
+        type=int,
+        default=100,
+        help='number of measured steps')
+    parser.add_argument(
+        '--num-gpus',
+        type=int,
+        default=0,
+        help='number of gpus to use')
+
+    parser.add_argument(
+        '--save-dir',
+        type=str,
+        default='',
+        help='directory of saved log-files')
+    parser.add_argument(
+        '--logging-file-name',
+        type=str,
+        default='bench.log',
+        help='filename of log')
+    parser.add_argument(
+        '--log-packages',
+        type=str,
+        default='mxnet',
+        help='list of python packages for logging')
+    parser.add_argument(
+        '--log-pip-packages',
+        type=str,
+        default='mxnet-cu92',
+        help='list of pip packages for logging')
+    args = parser.parse_args()
+    return args
+
+
+def loop_step(net,
+              ctx,
+              max_norm):
+    params = net.collect_params()
+    grads = [v.grad(ctx[0]) for v in params.values() if v._grad is not None]
+    gluon.utils.clip_global_norm(grads, max_norm=max_norm)
+    for p in params.values():
+        p.zero_grad()
+
+
+def flat_step(grad_buffer,
+              max_norm):
+    grad_buffer.clip_global_norm(max_norm=max_norm)
+    grad_buffer.zero_grad()
+
+
+def measure_step(step_func,
+                 num_warmup_steps,
+                 num_steps):
+    """
+    Measure time of a gradient processing step.
+
+    Parameters:
+    ----------
+    step_func : function
+        Step function (without arguments).
+    num_warmup_steps : int
+        Number of warm-up steps.
+    num_steps : int
+        Number of measured steps.
+
+    Returns
+    -------
+    float
+        Step time in seconds.
+    """
+    for _ in range(num_warmup_steps):
+        step_func()
+    mx.nd.waitall()
+    tic = time.time()
+    for _ in range(num_steps):
+        step_func()
+    mx.nd.waitall()
+    return (time.time() - tic) / num_steps
+
+
+def main():
+    args = parse_args()
+
+    initialize_logging(
+        logging_dir_path=args.save_dir,
+        logging_file_name=args.logging_file_name,
+        script_args=args,
+        log_packages=args.log_packages,
+        log_pip_packages=args.log_pip_packages)
+
+    ctx, _ = prepare_mx_context(
+        num_gpus=args.num_gpus,
+        batch_size=1)
+
+    net = get_model(args.model)
+    net.initialize(mx.init.MSRAPrelu(), ctx=ctx)
+    for p in net.collect_params().values():
+        p.grad_req = 'add'
+    in_size = net.in_size if hasattr(net, 'in_size') else (args.input_size, args.input_size)
+    for ctx_i in ctx:
+        x = mx.nd.random.normal(shape=(1, 3) + tuple(in_size), ctx=ctx_i)
+        with mx.autograd.record():
+            y = net(x)
+        y.backward()
+
+    params = [p for p in net.collect_params().values() if p.grad_req != 'null']
+    logging.info('{}: {} parameters, {} contexts'.format(args.model, len(params), len(ctx)))
+
+    loop_time = measure_step(
+        step_func=(lambda: loop_step(net, ctx, args.grad_clip)),
+        num_warmup_steps=args.num_warmup_steps,
+        num_steps=args.num_steps)
+    logging.info('Loops over parameters: {:.3f} ms/step'.format(loop_time * 1000.0))
+
+    grad_buffer = FlatGradBuffer(net.collect_params())
+    grad_buffer.attach()
+    flat_time = measure_step(
+        step_func=(lambda: flat_step(grad_buffer, args.grad_clip)),
+        num_warmup_steps=args.num_warmup_steps,
+        num_steps=args.num_steps)
+    logging.info('Flat gradient buffer: {:.3f} ms/step'.format(flat_time * 1000.0))
+    logging.info('Speedup: x{:.2f}'.format(loop_time / flat_time))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,166 @@
+"""
+    Benchmark of inference latency (PyTorch) for eager models versus traced TorchScript modules.
+"""
+
+import argparse
+import time
+import logging
+
+import torch
+
+from common.logger_utils import initialize_logging
+from pytorch.pytorchcv.model_provider import get_model
+from pytorch.jit_cache import trace_model
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description='Benchmark inference latency of eager and TorchScript models (PyTorch)',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    parser.add_argument(
+        '--models',
+        type=str,
+        default='nasnet_4a1056,pnasnet5large,darts,shufflenetv2_w1,menet108_8x1_g3,sqnxt23_w1',
+        help='list of models')
+    parser.add_argument(
+        '--batch-size',
+        type=int,
+        default=1,
+        help='batch size')
+    parser.add_argument(
+        '--input-size',
+        type=int,
+        default=224,
+        help='size of the input for model (if model has no `in_size` attribute)')
+    parser.add_argument(
+        '--num-warmup-steps',
+        type=int,
+        default=5,
+        help='number of warm-up steps')
+    parser.add_argument(
+        '--num-steps',
+        type=int,
+        default=50,
+        help='number of measured steps')
+    parser.add_argument(
+        '--num-threads',
+        type=int,
+        default=0,
+        help='number of CPU threads (0 means default)')
+    parser.add_argument(
+        '--num-gpus',
+        type=int,
+        default=0,
+        help='number of gpus to use (0 or 1)')
+
+    parser.add_argument(
+        '--save-dir',
+        type=str,
+        default='',
+        help='directory of saved log-files')
+    parser.add_argument(
+        '--logging-file-name',
+        type=str,
+        default='bench.log',
+        help='filename of log')
+    parser.add_argument(
+        '--log-packages',
+        type=str,
+        default='torch',
+        help='list of python packages for logging')
+    parser.add_argument(
+        '--log-pip-packages',
+        type=str,
+        default='',
+        help='list of pip packages for logging')
+    args = parser.parse_args()
+    return args
+
+
+def measure_latency(net,
+                    x,
+                    use_cuda,
+                    num_warmup_steps,
+                    num_steps):
+    """
+    Measure inference latency.
+
+    Parameters:
+    ----------
+    net : Module
+        Model.
+    x : Tensor
+        Input batch.
+    use_cuda : bool
+        Whether the model is on GPU.
+    num_warmup_steps : int
+        Number of warm-up steps.
+    num_steps : int
+        Number of measured steps.
+
+    Returns
+    -------
+    float
+        Latency in seconds.
+    """
+    with torch.no_grad():
+        for _ in range(num_warmup_steps):
+            net(x)
+        if use_cuda:
+            torch.cuda.synchronize()
+        tic = time.time()
+        for _ in range(num_steps):
+            net(x)
+        if use_cuda:
+            torch.cuda.synchronize()
+    return (time.time() - tic) / num_steps
+
+
+def main():
+    args = parse_args()
+
+    initialize_logging(
+        logging_dir_path=args.save_dir,
+        logging_file_name=args.logging_file_name,
+        script_args=args,
+        log_packages=args.log_packages,
+        log_pip_packages=args.log_pip_packages)
+
+    if args.num_threads > 0:
+        torch.set_num_threads(args.num_threads)
+    use_cuda = (args.num_gpus > 0)
+
+    for model_name in args.models.split(','):
+        model_name = model_name.strip()
+        net = get_model(model_name)
+        if use_cuda:
+            net = net.cuda()
+        net.eval()
+        in_size = net.in_size if hasattr(net, 'in_size') else (args.input_size, args.input_size)
+        x = torch.randn((args.batch_size, 3) + tuple(in_size), device=('cuda' if use_cuda else 'cpu'))
+
+        eager_time = measure_latency(
+            net=net,
+            x=x,
+            use_cuda=use_cuda,
+            num_warmup_steps=args.num_warmup_steps,
+            num_steps=args.num_steps)
+        traced_net = trace_model(
+            net=net,
+            input_shape=((3,) + tuple(in_size)),
+            use_cuda=use_cuda)
+        if traced_net is None:
+            logging.info('{}: eager={:.2f} ms,\ttracing is failed'.format(model_name, eager_time * 1000.0))
+            continue
+        traced_time = measure_latency(
+            net=traced_net,
+            x=x,
+            use_cuda=use_cuda,
+            num_warmup_steps=args.num_warmup_steps,
+            num_steps=args.num_steps)
+        logging.info('{}: eager={:.2f} ms,\tscripted={:.2f} ms,\tspeedup x{:.2f}'.format(
+            model_name, eager_time * 1000.0, traced_time * 1000.0, eager_time / traced_time))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,201 @@
+"""
+    Benchmark of training throughput (Gluon) with per-step host synchronization for training metrics (loss value and
+    `mx.metric.Accuracy`) versus metrics accumulated on devices and read back only at log intervals.
+"""
+
+import argparse
+import time
+import logging
+
+import mxnet as mx
+from mxnet import gluon, autograd
+
+from common.logger_utils import initialize_logging
+from gluon.gluoncv2.model_provider import get_model
+from gluon.utils import prepare_mx_context, DeviceMetricAccumulator
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description='Benchmark training throughput with host-synchronized and device-resident metrics (Gluon)',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    parser.add_argument(
+        '--model',
+        type=str,
+        default='mobilenet_wd4',
+        help='name of model')
+    parser.add_argument(
+        '--batch-size',
+        type=int,
+        default=16,
+        help='batch size')
+    parser.add_argument(
+        '--input-size',
+        type=int,
+        default=112,
+        help='size of the input for model')
+    parser.add_argument(
+        '--log-interval',
+        type=int,
+        default=50,
+        help='number of batches between metric readings')
+    parser.add_argument(
+        '--num-warmup-steps',
+        type=int,
+        default=5,
+        help='number of warm-up training steps')
+    parser.add_argument(
+        '--num-steps',
+        type=int,
+        default=100,
+        help='number of measured training steps')
+    parser.add_argument(
+        '--num-gpus',
+        type=int,
+        default=0,
+        help='number of gpus to use')
+
+    parser.add_argument(
+        '--save-dir',
+        type=str,
+        default='',
+        help='directory of saved log-files')
+    parser.add_argument(
+        '--logging-file-name',
+        type=str,
+        default='bench.log',
+        help='filename of log')
+    parser.add_argument(
+        '--log-packages',
+        type=str,
+        default='mxnet',
+        help='list of python packages for logging')
+    parser.add_argument(
+        '--log-pip-packages',
+        type=str,
+        default='mxnet-cu92',
+        help='list of pip packages for logging')
+    args = parser.parse_args()
+    return args
+
+
+def measure_training(net,
+                     trainer,
+                     loss_func,
+                     data_list,
+                     label_list,
+                     device_metrics,
+                     log_interval,
+                     num_warmup_steps,
+                     num_steps):
+    """
+    Measure time of a training step.
+
+    Parameters:
+    ----------
+    net : HybridBlock
+        Model.
+    trainer : Trainer
+        Trainer.
+    loss_func : Loss
+        Loss function.
+    data_list : list of NDArray
+        Input batch (per context).
+    label_list : list of NDArray
+        Labels (per context).
+    device_metrics : bool
+        Whether to use metrics accumulated on devices.
+    log_interval : int
+        Number of batches between metric readings.
+    num_warmup_steps : int
+        Number of warm-up steps.
+    num_steps : int
+        Number of measured steps.
+
+    Returns
+    -------
+    float
+        Step time in seconds.
+    """
+    batch_size = sum([x.shape[0] for x in data_list])
+    if device_metrics:
+        train_metrics = DeviceMetricAccumulator()
+    else:
+        acc_top1 = mx.metric.Accuracy()
+    train_loss = 0.0
+    for i in range(num_warmup_steps + num_steps):
+        if i == num_warmup_steps:
+            mx.nd.waitall()
+            tic = time.time()
+        with autograd.record():
+            outputs_list = [net(x) for x in data_list]
+            loss_list = [loss_func(y_hat, y) for y_hat, y in zip(outputs_list, label_list)]
+        for loss in loss_list:
+            loss.backward()
+        trainer.step(batch_size)
+        if device_metrics:
+            train_metrics.update(
+                labels=label_list,
+                preds=outputs_list,
+                losses=loss_list)
+            if not (i + 1) % log_interval:
+                train_metrics.get()
+        else:
+            train_loss += sum([loss.mean().asscalar() for loss in loss_list]) / len(loss_list)
+            acc_top1.update(
+                labels=label_list,
+                preds=outputs_list)
+            if not (i + 1) % log_interval:
+                acc_top1.get()
+    mx.nd.waitall()
+    return (time.time() - tic) / num_steps
+
+
+def main():
+    args = parse_args()
+
+    initialize_logging(
+        logging_dir_path=args.save_dir,
+        logging_file_name=args.logging_file_name,
+        script_args=args,
+        log_packages=args.log_packages,
+        log_pip_packages=args.log_pip_packages)
+
+    ctx, batch_size = prepare_mx_context(
+        num_gpus=args.num_gpus,
+        batch_size=args.batch_size)
+
+    net = get_model(args.model)
+    net.initialize(mx.init.MSRAPrelu(), ctx=ctx)
+    net.hybridize(static_alloc=True, static_shape=True)
+    trainer = gluon.Trainer(net.collect_params(), 'sgd', {'learning_rate': 0.01, 'momentum': 0.9})
+    loss_func = gluon.loss.SoftmaxCrossEntropyLoss()
+
+    data = mx.nd.random.normal(shape=(batch_size, 3, args.input_size, args.input_size))
+    label = mx.nd.random.randint(low=0, high=1000, shape=(batch_size,)).astype('float32')
+    data_list = gluon.utils.split_and_load(data, ctx_list=ctx, batch_axis=0)
+    label_list = gluon.utils.split_and_load(label, ctx_list=ctx, batch_axis=0)
+
+    results = []
+    for device_metrics in [False, True]:
+        step_time = measure_training(
+            net=net,
+            trainer=trainer,
+            loss_func=loss_func,
+            data_list=data_list,
+            label_list=label_list,
+            device_metrics=device_metrics,
+            log_interval=args.log_interval,
+            num_warmup_steps=args.num_warmup_steps,
+            num_steps=args.num_steps)
+        results.append(step_time)
+        logging.info('{model} ({mode}): step time={step_time:.2f} ms,\tspeed={speed:.2f} samples/sec'.format(
+            model=args.model,
+            mode=('device metrics' if device_metrics else 'per-step host sync'),
+            step_time=step_time * 1000.0,
+            speed=batch_size / step_time))
+    logging.info('Device metrics vs per-step host sync: speedup x{:.2f}'.format(results[0] / results[1]))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,145 @@
+"""
+    Benchmark of cold-start model creation time for the lazy model provider (in comparison with importing the whole
+    model zoo, as the eager provider did).
+"""
+
+import argparse
+import os
+import sys
+import subprocess
+import logging
+
+import numpy as np
+
+from common.logger_utils import initialize_logging
+
+
+_framework_packages = {
+    'gluon': ('mxnet', 'gluon.gluoncv2'),
+    'pytorch': ('torch', 'pytorch.pytorchcv'),
+}
+
+_script_template = """
+import time
+tic = time.time()
+import {framework_module}
+framework_time = time.time() - tic
+from importlib import import_module
+from {package}.model_provider import _models, get_model
+if {eager}:
+    for value in _models.values():
+        import_module('{package}.models.' + value.split(':')[0])
+net = get_model('{model}')
+print('{{}} {{}}'.format(framework_time, time.time() - tic))
+"""
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description='Benchmark cold-start model creation time for lazy/eager model providers',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    parser.add_argument(
+        '--frameworks',
+        type=str,
+        default='gluon,pytorch',
+        help='list of frameworks for benchmarking')
+    parser.add_argument(
+        '--model',
+        type=str,
+        default='resnet18',
+        help='name of model to create')
+    parser.add_argument(
+        '--num-runs',
+        type=int,
+        default=5,
+        help='number of cold-start runs for each mode')
+
+    parser.add_argument(
+        '--save-dir',
+        type=str,
+        default='',
+        help='directory of saved log-files')
+    parser.add_argument(
+        '--logging-file-name',
+        type=str,
+        default='bench.log',
+        help='filename of log')
+    parser.add_argument(
+        '--log-packages',
+        type=str,
+        default='mxnet, torch',
+        help='list of python packages for logging')
+    parser.add_argument(
+        '--log-pip-packages',
+        type=str,
+        default='mxnet-cu92, torch',
+        help='list of pip packages for logging')
+    args = parser.parse_args()
+    return args
+
+
+def measure_cold_start(framework_module,
+                       package,
+                       model,
+                       eager):
+    """
+    Measure model creation time in a fresh interpreter.
+
+    Parameters:
+    ----------
+    framework_module : str
+        Name of framework module (imported first, its import time is reported separately).
+    package : str
+        Package with model provider.
+    model : str
+        Name of model.
+    eager : bool
+        Whether to import all model modules before model creation.
+
+    Returns
+    -------
+    tuple of 2 float
+        Framework import time and total time.
+    """
+    script = _script_template.format(
+        framework_module=framework_module,
+        package=package,
+        eager=eager,
+        model=model)
+    output = subprocess.check_output(
+        [sys.executable, '-c', script],
+        cwd=os.path.dirname(os.path.abspath(__file__)))
+    framework_time, total_time = output.decode().strip().split('\n')[-1].split()
+    return float(framework_time), float(total_time)
+
+
+def main():
+    args = parse_args()
+
+    initialize_logging(
+        logging_dir_path=args.save_dir,
+        logging_file_name=args.logging_file_name,
+        script_args=args,
+        log_packages=args.log_packages,
+        log_pip_packages=args.log_pip_packages)
+
+    frameworks = args.frameworks.replace(' ', '').split(',')
+    for framework in frameworks:
+        framework_module, package = _framework_packages[framework]
+        for eager in [True, False]:
+            times = np.array([measure_cold_start(framework_module, package, args.model, eager)
+                              for _ in range(args.num_runs)])
+            framework_times = times[:, 0]
+            total_times = times[:, 1]
+            logging.info('{framework} ({mode}): total={total:.3f} sec (min={total_min:.3f}),'
+                         '\tframework import={fw:.3f} sec,\tzoo+model={zoo:.3f} sec'.format(
+                             framework=framework,
+                             mode=('eager' if eager else 'lazy'),
+                             total=total_times.mean(),
+                             total_min=total_times.min(),
+                             fw=framework_times.mean(),
+                             zoo=(total_times - framework_times).mean()))
+
+
+if __name__ == '__main__':
+    main()
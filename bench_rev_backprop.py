@@ -0,0 +1,166 @@
+"""
+    Benchmark of peak memory and training step time for i-RevNet with the default backpropagation and with the
+    memory-saving reversible one (activations are reconstructed by inversion during backward pass).
+"""
+
+import argparse
+import os
+import sys
+import subprocess
+import logging
+
+from common.logger_utils import initialize_logging
+
+
+_script_template = """
+import time
+import resource
+import mxnet as mx
+from gluon.gluoncv2.model_provider import get_model
+ctx = mx.gpu(0) if {use_gpu} else mx.cpu()
+net = get_model('{model}')
+net.initialize(mx.init.MSRAPrelu(), ctx=ctx)
+net.hybridize()
+trainer = mx.gluon.Trainer(net.collect_params(), 'sgd', {{'learning_rate': 0.01, 'momentum': 0.9}})
+loss_func = mx.gluon.loss.SoftmaxCrossEntropyLoss()
+x = mx.nd.random.normal(shape=({batch_size}, 3, {input_size}, {input_size}), ctx=ctx)
+label = mx.nd.zeros(({batch_size},), ctx=ctx)
+for i in range({num_warmup_steps} + {num_steps}):
+    if i == {num_warmup_steps}:
+        mx.nd.waitall()
+        tic = time.time()
+    if {reversible_backprop}:
+        _, loss = net.forward_backward(x, loss_func, label)
+    else:
+        with mx.autograd.record():
+            loss = loss_func(net(x), label)
+        loss.backward()
+    trainer.step({batch_size})
+mx.nd.waitall()
+step_time = (time.time() - tic) / {num_steps}
+if {use_gpu}:
+    free_memory, total_memory = mx.context.gpu_memory_info(0)
+    peak_memory = total_memory - free_memory
+else:
+    peak_memory = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+print('{{}} {{}}'.format(step_time, peak_memory))
+"""
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description='Benchmark peak memory and step time for reversible backpropagation (Gluon/i-RevNet)',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    parser.add_argument(
+        '--model',
+        type=str,
+        default='irevnet301',
+        help='name of model (with `forward_backward` method)')
+    parser.add_argument(
+        '--batch-size',
+        type=int,
+        default=16,
+        help='batch size')
+    parser.add_argument(
+        '--input-size',
+        type=int,
+        default=224,
+        help='size of the input for model')
+    parser.add_argument(
+        '--num-warmup-steps',
+        type=int,
+        default=2,
+        help='number of warm-up training steps')
+    parser.add_argument(
+        '--num-steps',
+        type=int,
+        default=10,
+        help='number of measured training steps')
+    parser.add_argument(
+        '--num-gpus',
+        type=int,
+        default=0,
+        help='number of gpus to use (0 or 1)')
+
+    parser.add_argument(
+        '--save-dir',
+        type=str,
+        default='',
+        help='directory of saved log-files')
+    parser.add_argument(
+        '--logging-file-name',
+        type=str,
+        default='bench.log',
+        help='filename of log')
+    parser.add_argument(
+        '--log-packages',
+        type=str,
+        default='mxnet',
+        help='list of python packages for logging')
+    parser.add_argument(
+        '--log-pip-packages',
+        type=str,
+        default='mxnet-cu92',
+        help='list of pip packages for logging')
+    args = parser.parse_args()
+    return args
+
+
+def measure_training(args,
+                     reversible_backprop):
+    """
+    Measure training step time and peak memory in a fresh interpreter.
+
+    Parameters:
+    ----------
+    args : ArgumentParser
+        Main script arguments.
+    reversible_backprop : bool
+        Whether to use reversible backpropagation.
+
+    Returns
+    -------
+    tuple of 2 float
+        Step time (in seconds) and peak memory (in bytes).
+    """
+    script = _script_template.format(
+        model=args.model,
+        use_gpu=(args.num_gpus > 0),
+        batch_size=args.batch_size,
+        input_size=args.input_size,
+        num_warmup_steps=args.num_warmup_steps,
+        num_steps=args.num_steps,
+        reversible_backprop=reversible_backprop)
+    output = subprocess.check_output(
+        [sys.executable, '-c', script],
+        cwd=os.path.dirname(os.path.abspath(__file__)))
+    step_time, peak_memory = output.decode().strip().split('\n')[-1].split()
+    return float(step_time), float(peak_memory)
+
+
+def main():
+    args = parse_args()
+
+    initialize_logging(
+        logging_dir_path=args.save_dir,
+        logging_file_name=args.logging_file_name,
+        script_args=args,
+        log_packages=args.log_packages,
+        log_pip_packages=args.log_pip_packages)
+
+    results = []
+    for reversible_backprop in [False, True]:
+        step_time, peak_memory = measure_training(args, reversible_backprop)
+        results.append((step_time, peak_memory))
+        logging.info('{model} ({mode}): step time={step_time:.3f} sec,\tpeak memory={peak_memory:.1f} MB'.format(
+            model=args.model,
+            mode=('reversible' if reversible_backprop else 'default'),
+            step_time=step_time,
+            peak_memory=peak_memory / 2 ** 20))
+    logging.info('Reversible vs default: step time x{time_ratio:.2f},\tpeak memory x{memory_ratio:.2f}'.format(
+        time_ratio=(results[1][0] / results[0][0]),
+        memory_ratio=(results[1][1] / results[0][1])))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,168 @@
+"""
+    Benchmark of inference latency (Gluon) for models with channel shuffle layers before and after folding of the
+    shuffles into adjacent convolutions, with verification of outputs.
+"""
+
+import argparse
+import os
+import time
+import shutil
+import tempfile
+import logging
+
+import mxnet as mx
+
+from common.logger_utils import initialize_logging
+from gluon.gluoncv2.model_provider import get_model
+from gluon.gluoncv2.models.common import ChannelShuffle, ChannelShuffle2
+from gluon.utils import fold_channel_shuffles
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description='Benchmark inference latency for channel shuffle folding (Gluon)',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    parser.add_argument(
+        '--models',
+        type=str,
+        default='shufflenet_g1_w1,shufflenet_g3_w1,menet108_8x1_g3,shufflenetv2_w1,shufflenetv2b_w1,igcv3_w1',
+        help='list of models')
+    parser.add_argument(
+        '--batch-size',
+        type=int,
+        default=1,
+        help='batch size')
+    parser.add_argument(
+        '--input-size',
+        type=int,
+        default=224,
+        help='size of the input for model (if model has no `in_size` attribute)')
+    parser.add_argument(
+        '--num-warmup-steps',
+        type=int,
+        default=5,
+        help='number of warm-up steps')
+    parser.add_argument(
+        '--num-steps',
+        type=int,
+        default=200,
+        help='number of measured steps')
+    parser.add_argument(
+        '--num-gpus',
+        type=int,
+        default=0,
+        help='number of gpus to use (0 or 1)')
+
+    parser.add_argument(
+        '--save-dir',
+        type=str,
+        default='',
+        help='directory of saved log-files')
+    parser.add_argument(
+        '--logging-file-name',
+        type=str,
+        default='bench.log',
+        help='filename of log')
+    parser.add_argument(
+        '--log-packages',
+        type=str,
+        default='mxnet',
+        help='list of python packages for logging')
+    parser.add_argument(
+        '--log-pip-packages',
+        type=str,
+        default='mxnet-cu92',
+        help='list of pip packages for logging')
+    args = parser.parse_args()
+    return args
+
+
+def measure_latency(net,
+                    x,
+                    num_warmup_steps,
+                    num_steps):
+    """
+    Measure inference latency.
+
+    Parameters:
+    ----------
+    net : HybridBlock
+        Model.
+    x : NDArray
+        Input batch.
+    num_warmup_steps : int
+        Number of warm-up steps.
+    num_steps : int
+        Number of measured steps.
+
+    Returns
+    -------
+    float
+        Latency in seconds.
+    """
+    for _ in range(num_warmup_steps):
+        net(x)
+    mx.nd.waitall()
+    tic = time.time()
+    for _ in range(num_steps):
+        net(x)
+    mx.nd.waitall()
+    return (time.time() - tic) / num_steps
+
+
+def main():
+    args = parse_args()
+
+    initialize_logging(
+        logging_dir_path=args.save_dir,
+        logging_file_name=args.logging_file_name,
+        script_args=args,
+        log_packages=args.log_packages,
+        log_pip_packages=args.log_pip_packages)
+
+    ctx = mx.gpu(0) if args.num_gpus > 0 else mx.cpu()
+    tmp_dir_path = tempfile.mkdtemp()
+    try:
+        for model_name in args.models.split(','):
+            model_name = model_name.strip()
+            net = get_model(model_name)
+            net.initialize(mx.init.MSRAPrelu(), ctx=ctx)
+            in_size = net.in_size if hasattr(net, 'in_size') else (args.input_size, args.input_size)
+            x = mx.nd.random.normal(shape=((args.batch_size, 3) + tuple(in_size)), ctx=ctx)
+            y_ref = net(x)
+
+            # The model is folded before hybridization, so the original one is measured on a copy:
+            params_file_path = os.path.join(tmp_dir_path, '{}.params'.format(model_name))
+            net.save_parameters(params_file_path)
+            orig_net = get_model(model_name)
+            orig_net.load_parameters(params_file_path, ctx=ctx)
+            orig_net.hybridize(static_alloc=True, static_shape=True)
+            orig_time = measure_latency(
+                net=orig_net,
+                x=x,
+                num_warmup_steps=args.num_warmup_steps,
+                num_steps=args.num_steps)
+            del orig_net
+
+            blocks = []
+            net.apply(blocks.append)
+            shuffle_count = len([block for block in blocks if isinstance(block, (ChannelShuffle, ChannelShuffle2))])
+            folded_count = fold_channel_shuffles(net)
+            net.hybridize(static_alloc=True, static_shape=True)
+            max_abs_diff = (net(x) - y_ref).abs().max().asscalar()
+            folded_time = measure_latency(
+                net=net,
+                x=x,
+                num_warmup_steps=args.num_warmup_steps,
+                num_steps=args.num_steps)
+            logging.info('{}: folded {}/{} shuffles,\toriginal={:.2f} ms,\tfolded={:.2f} ms,'
+                         '\tsaved={:.2f} ms ({:.1f}%),\tmax-abs-diff={:.3e}'.format(
+                             model_name, folded_count, shuffle_count, orig_time * 1000.0, folded_time * 1000.0,
+                             (orig_time - folded_time) * 1000.0, (orig_time - folded_time) / orig_time * 100.0,
+                             max_abs_diff))
+    finally:
+        shutil.rmtree(tmp_dir_path, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
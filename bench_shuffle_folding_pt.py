@@ -0,0 +1,170 @@
+"""
+    Benchmark of inference latency (PyTorch) for models with channel shuffle layers before and after folding of the
+    shuffles into adjacent convolutions, with verification of outputs.
+"""
+
+import argparse
+import time
+import logging
+
+import torch
+
+from common.logger_utils import initialize_logging
+from pytorch.pytorchcv.model_provider import get_model
+from pytorch.pytorchcv.models.common import ChannelShuffle, ChannelShuffle2
+from pytorch.utils import fold_channel_shuffles
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description='Benchmark inference latency for channel shuffle folding (PyTorch)',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    parser.add_argument(
+        '--models',
+        type=str,
+        default='shufflenet_g1_w1,shufflenet_g3_w1,menet108_8x1_g3,shufflenetv2_w1,shufflenetv2b_w1,igcv3_w1',
+        help='list of models')
+    parser.add_argument(
+        '--batch-size',
+        type=int,
+        default=1,
+        help='batch size')
+    parser.add_argument(
+        '--input-size',
+        type=int,
+        default=224,
+        help='size of the input for model (if model has no `in_size` attribute)')
+    parser.add_argument(
+        '--num-warmup-steps',
+        type=int,
+        default=5,
+        help='number of warm-up steps')
+    parser.add_argument(
+        '--num-steps',
+        type=int,
+        default=200,
+        help='number of measured steps')
+    parser.add_argument(
+        '--num-threads',
+        type=int,
+        default=0,
+        help='number of CPU threads (0 means default)')
+    parser.add_argument(
+        '--num-gpus',
+        type=int,
+        default=0,
+        help='number of gpus to use (0 or 1)')
+
+    parser.add_argument(
+        '--save-dir',
+        type=str,
+        default='',
+        help='directory of saved log-files')
+    parser.add_argument(
+        '--logging-file-name',
+        type=str,
+        default='bench.log',
+        help='filename of log')
+    parser.add_argument(
+        '--log-packages',
+        type=str,
+        default='torch',
+        help='list of python packages for logging')
+    parser.add_argument(
+        '--log-pip-packages',
+        type=str,
+        default='',
+        help='list of pip packages for logging')
+    args = parser.parse_args()
+    return args
+
+
+def measure_latency(net,
+                    x,
+                    use_cuda,
+                    num_warmup_steps,
+                    num_steps):
+    """
+    Measure inference latency.
+
+    Parameters:
+    ----------
+    net : Module
+        Model.
+    x : Tensor
+        Input batch.
+    use_cuda : bool
+        Whether the model is on GPU.
+    num_warmup_steps : int
+        Number of warm-up steps.
+    num_steps : int
+        Number of measured steps.
+
+    Returns
+    -------
+    float
+        Latency in seconds.
+    """
+    with torch.no_grad():
+        for _ in range(num_warmup_steps):
+            net(x)
+        if use_cuda:
+            torch.cuda.synchronize()
+        tic = time.time()
+        for _ in range(num_steps):
+            net(x)
+        if use_cuda:
+            torch.cuda.synchronize()
+    return (time.time() - tic) / num_steps
+
+
+def main():
+    args = parse_args()
+
+    initialize_logging(
+        logging_dir_path=args.save_dir,
+        logging_file_name=args.logging_file_name,
+        script_args=args,
+        log_packages=args.log_packages,
+        log_pip_packages=args.log_pip_packages)
+
+    if args.num_threads > 0:
+        torch.set_num_threads(args.num_threads)
+    use_cuda = (args.num_gpus > 0)
+
+    for model_name in args.models.split(','):
+        model_name = model_name.strip()
+        net = get_model(model_name)
+        if use_cuda:
+            net = net.cuda()
+        net.eval()
+        in_size = net.in_size if hasattr(net, 'in_size') else (args.input_size, args.input_size)
+        x = torch.randn((args.batch_size, 3) + tuple(in_size), device=('cuda' if use_cuda else 'cpu'))
+        shuffle_count = len([m for m in net.modules() if isinstance(m, (ChannelShuffle, ChannelShuffle2))])
+
+        with torch.no_grad():
+            y_ref = net(x)
+        orig_time = measure_latency(
+            net=net,
+            x=x,
+            use_cuda=use_cuda,
+            num_warmup_steps=args.num_warmup_steps,
+            num_steps=args.num_steps)
+        folded_count = fold_channel_shuffles(net)
+        with torch.no_grad():
+            max_abs_diff = (net(x) - y_ref).abs().max().item()
+        folded_time = measure_latency(
+            net=net,
+            x=x,
+            use_cuda=use_cuda,
+            num_warmup_steps=args.num_warmup_steps,
+            num_steps=args.num_steps)
+        logging.info('{}: folded {}/{} shuffles,\toriginal={:.2f} ms,\tfolded={:.2f} ms,\tsaved={:.2f} ms ({:.1f}%),'
+                     '\tmax-abs-diff={:.3e}'.format(
+                         model_name, folded_count, shuffle_count, orig_time * 1000.0, folded_time * 1000.0,
+                         (orig_time - folded_time) * 1000.0, (orig_time - folded_time) / orig_time * 100.0,
+                         max_abs_diff))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,196 @@
+"""
+    Benchmark of the training step overhead of the stage profiler (Gluon): training steps without the profiler versus
+    steps with the profiler enabled for several sample intervals.
+"""
+
+import argparse
+import time
+import logging
+
+import mxnet as mx
+from mxnet import gluon, autograd
+
+from common.logger_utils import initialize_logging
+from common.stage_profiler import StageProfiler, null_stage
+from gluon.gluoncv2.model_provider import get_model
+from gluon.utils import prepare_mx_context
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description='Benchmark training step overhead of the stage profiler (Gluon)',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    parser.add_argument(
+        '--model',
+        type=str,
+        default='mobilenet_wd4',
+        help='name of model')
+    parser.add_argument(
+        '--batch-size',
+        type=int,
+        default=16,
+        help='batch size')
+    parser.add_argument(
+        '--input-size',
+        type=int,
+        default=224,
+        help='size of the input for model')
+    parser.add_argument(
+        '--sample-intervals',
+        type=str,
+        default='100,10',
+        help='list of profiler sample intervals')
+    parser.add_argument(
+        '--num-warmup-steps',
+        type=int,
+        default=10,
+        help='number of warm-up training steps')
+    parser.add_argument(
+        '--num-steps',
+        type=int,
+        default=400,
+        help='number of measured training steps')
+    parser.add_argument(
+        '--num-repeats',
+        type=int,
+        default=3,
+        help='number of measurement rounds (the best step time of the rounds is taken for each mode)')
+    parser.add_argument(
+        '--num-gpus',
+        type=int,
+        default=0,
+        help='number of gpus to use')
+
+    parser.add_argument(
+        '--save-dir',
+        type=str,
+        default='',
+        help='directory of saved log-files')
+    parser.add_argument(
+        '--logging-file-name',
+        type=str,
+        default='bench.log',
+        help='filename of log')
+    parser.add_argument(
+        '--log-packages',
+        type=str,
+        default='mxnet',
+        help='list of python packages for logging')
+    parser.add_argument(
+        '--log-pip-packages',
+        type=str,
+        default='mxnet-cu92',
+        help='list of pip packages for logging')
+    args = parser.parse_args()
+    return args
+
+
+def measure_training(net,
+                     trainer,
+                     loss_func,
+                     batches,
+                     ctx,
+                     sample_interval,
+                     num_warmup_steps,
+                     num_steps):
+    """
+    Measure time of a training step.
+
+    Parameters:
+    ----------
+    net : HybridBlock
+        Model.
+    trainer : Trainer
+        Trainer.
+    loss_func : Loss
+        Loss function.
+    batches : list of tuple of (NDArray, NDArray)
+        Input batches with labels (on the host).
+    ctx : list of Context
+        MXNet contexts.
+    sample_interval : int or None
+        Profiler sample interval (the profiler is disabled if None).
+    num_warmup_steps : int
+        Number of warm-up steps.
+    num_steps : int
+        Number of measured steps.
+
+    Returns
+    -------
+    float
+        Step time in seconds.
+    """
+    profiler = StageProfiler(
+        sync_func=mx.nd.waitall,
+        sample_interval=sample_interval) if sample_interval is not None else None
+    stage = profiler.stage if profiler is not None else null_stage
+    data_source = [batches[i % len(batches)] for i in range(num_warmup_steps + num_steps)]
+    batch_size = batches[0][0].shape[0]
+    for i, (data, label) in enumerate(profiler.iterate(data_source) if profiler is not None else data_source):
+        if i == num_warmup_steps:
+            mx.nd.waitall()
+            tic = time.time()
+        with stage('h2d'):
+            data_list = gluon.utils.split_and_load(data, ctx_list=ctx, batch_axis=0)
+            label_list = gluon.utils.split_and_load(label, ctx_list=ctx, batch_axis=0)
+        with stage('forward'):
+            with autograd.record():
+                outputs_list = [net(x) for x in data_list]
+                loss_list = [loss_func(y_hat, y) for y_hat, y in zip(outputs_list, label_list)]
+        with stage('backward'):
+            for loss in loss_list:
+                loss.backward()
+        with stage('update'):
+            trainer.step(batch_size)
+    mx.nd.waitall()
+    return (time.time() - tic) / num_steps
+
+
+def main():
+    args = parse_args()
+
+    initialize_logging(
+        logging_dir_path=args.save_dir,
+        logging_file_name=args.logging_file_name,
+        script_args=args,
+        log_packages=args.log_packages,
+        log_pip_packages=args.log_pip_packages)
+
+    ctx, batch_size = prepare_mx_context(
+        num_gpus=args.num_gpus,
+        batch_size=args.batch_size)
+
+    net = get_model(args.model)
+    net.initialize(mx.init.MSRAPrelu(), ctx=ctx)
+    net.hybridize(static_alloc=True, static_shape=True)
+    trainer = gluon.Trainer(net.collect_params(), 'sgd', {'learning_rate': 0.01, 'momentum': 0.9})
+    loss_func = gluon.loss.SoftmaxCrossEntropyLoss()
+
+    batches = [(mx.nd.random.normal(shape=(batch_size, 3, args.input_size, args.input_size)),
+                mx.nd.random.randint(low=0, high=1000, shape=(batch_size,)).astype('float32')) for _ in range(4)]
+
+    sample_intervals = [None] + [int(interval) for interval in args.sample_intervals.split(',')]
+    step_times = [float('inf')] * len(sample_intervals)
+    for _ in range(args.num_repeats):
+        for j, sample_interval in enumerate(sample_intervals):
+            step_time = measure_training(
+                net=net,
+                trainer=trainer,
+                loss_func=loss_func,
+                batches=batches,
+                ctx=ctx,
+                sample_interval=sample_interval,
+                num_warmup_steps=args.num_warmup_steps,
+                num_steps=args.num_steps)
+            step_times[j] = min(step_times[j], step_time)
+
+    for sample_interval, step_time in zip(sample_intervals, step_times):
+        logging.info('{model} ({mode}): step time={step_time:.2f} ms,\toverhead={overhead:+.2%}'.format(
+            model=args.model,
+            mode=('no profiler' if sample_interval is None else 'sample interval {}'.format(sample_interval)),
+            step_time=step_time * 1000.0,
+            overhead=(step_time / step_times[0] - 1.0)))
+
+
+if __name__ == '__main__':
+    main()
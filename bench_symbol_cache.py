@@ -0,0 +1,151 @@
+"""
+    Benchmark of model startup latency (Gluon): building and tracing of a model versus loading it from the symbol cache.
+    Each measurement is made in a fresh interpreter (the time until the output of the first batch).
+"""
+
+import argparse
+import os
+import sys
+import subprocess
+import logging
+
+from common.logger_utils import initialize_logging
+
+
+_script_template = """
+import time
+tic = time.time()
+import mxnet as mx
+from gluon.utils import prepare_model
+ctx = mx.gpu(0) if {use_gpu} else mx.cpu()
+import_time = time.time() - tic
+tic = time.time()
+net = prepare_model(
+    model_name='{model}',
+    use_pretrained=True,
+    pretrained_model_file_path='',
+    dtype='{dtype}',
+    ctx=ctx,
+    symbol_cache_dir='{symbol_cache_dir}',
+    input_image_size=({input_size}, {input_size}))
+in_size = net.in_size if hasattr(net, 'in_size') else ({input_size}, {input_size})
+x = mx.nd.zeros((1, 3) + tuple(in_size), ctx=ctx, dtype='{dtype}')
+net(x).wait_to_read()
+print('{{}} {{}}'.format(import_time, time.time() - tic))
+"""
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description='Benchmark model startup latency with and without the symbol cache (Gluon)',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    parser.add_argument(
+        '--models',
+        type=str,
+        default='nasnet_6a4032,pnasnet5large,dla34,fishnet150',
+        help='list of models')
+    parser.add_argument(
+        '--dtype',
+        type=str,
+        default='float32',
+        help='data type of models')
+    parser.add_argument(
+        '--input-size',
+        type=int,
+        default=224,
+        help='size of the input for model (if model has no `in_size` attribute)')
+    parser.add_argument(
+        '--symbol-cache-dir',
+        type=str,
+        default='../imgclsmob_data/symbol_cache',
+        help='directory of exported models')
+    parser.add_argument(
+        '--num-gpus',
+        type=int,
+        default=0,
+        help='number of gpus to use (0 or 1)')
+
+    parser.add_argument(
+        '--save-dir',
+        type=str,
+        default='',
+        help='directory of saved log-files')
+    parser.add_argument(
+        '--logging-file-name',
+        type=str,
+        default='bench.log',
+        help='filename of log')
+    parser.add_argument(
+        '--log-packages',
+        type=str,
+        default='mxnet',
+        help='list of python packages for logging')
+    parser.add_argument(
+        '--log-pip-packages',
+        type=str,
+        default='mxnet-cu92',
+        help='list of pip packages for logging')
+    args = parser.parse_args()
+    return args
+
+
+def measure_startup(args,
+                    model_name,
+                    symbol_cache_dir):
+    """
+    Measure startup latency of a model in a fresh interpreter.
+
+    Parameters:
+    ----------
+    args : ArgumentParser
+        Main script arguments.
+    model_name : str
+        Name of the model.
+    symbol_cache_dir : str
+        Directory of exported models (empty string for disabled cache).
+
+    Returns
+    -------
+    tuple of 2 float
+        Time of package import and time until the output of the first batch (in seconds).
+    """
+    script = _script_template.format(
+        model=model_name,
+        use_gpu=(args.num_gpus > 0),
+        dtype=args.dtype,
+        input_size=args.input_size,
+        symbol_cache_dir=symbol_cache_dir)
+    output = subprocess.check_output(
+        [sys.executable, '-c', script],
+        cwd=os.path.dirname(os.path.abspath(__file__)))
+    import_time, startup_time = output.decode().strip().split('\n')[-1].split()
+    return float(import_time), float(startup_time)
+
+
+def main():
+    args = parse_args()
+
+    initialize_logging(
+        logging_dir_path=args.save_dir,
+        logging_file_name=args.logging_file_name,
+        script_args=args,
+        log_packages=args.log_packages,
+        log_pip_packages=args.log_pip_packages)
+
+    for model_name in args.models.split(','):
+        model_name = model_name.strip()
+        # The first run with the cache exports the model (and it also downloads weights if necessary):
+        _, export_time = measure_startup(args, model_name, args.symbol_cache_dir)
+        _, build_time = measure_startup(args, model_name, '')
+        _, cached_time = measure_startup(args, model_name, args.symbol_cache_dir)
+        logging.info('{model}: build={build:.3f} sec,\texport={export:.3f} sec,\tcached={cached:.3f} sec,\t'
+                     'speedup x{speedup:.2f}'.format(
+                         model=model_name,
+                         build=build_time,
+                         export=export_time,
+                         cached=cached_time,
+                         speedup=(build_time / cached_time)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,295 @@
+"""
+    Script for calculating model statistics (FLOPs, MACs, parameters, activation memory) by shape propagation, without
+    running a forward pass.
+"""
+
+import os
+import gc
+import csv
+import time
+import argparse
+import logging
+
+from common.logger_utils import initialize_logging
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description='Calculate model statistics by shape propagation',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    parser.add_argument(
+        '--framework',
+        type=str,
+        default='gluon',
+        help='framework (gluon or pytorch)')
+    parser.add_argument(
+        '--models',
+        type=str,
+        default='',
+        help='list of models (all models from the model provider if empty)')
+    parser.add_argument(
+        '--in-channels',
+        type=int,
+        default=3,
+        help='number of input channels')
+    parser.add_argument(
+        '--input-size',
+        type=int,
+        default=224,
+        help='size of the input for models without `in_size` attribute')
+    parser.add_argument(
+        '--per-layer',
+        action='store_true',
+        help='log per-layer statistics')
+    parser.add_argument(
+        '--verify',
+        action='store_true',
+        help='compare results with the forward pass (hook-based) statistics')
+    parser.add_argument(
+        '--calc-memory',
+        action='store_true',
+        help='calculate peak activation memory for eval/train modes and max batch sizes')
+    parser.add_argument(
+        '--memory-limits',
+        type=str,
+        default='4,8,16,32',
+        help='list of device memory sizes (in GB) for max batch size calculation')
+    parser.add_argument(
+        '--stats-csv',
+        type=str,
+        default='model_stats.csv',
+        help='filename of CSV with model statistics')
+
+    parser.add_argument(
+        '--save-dir',
+        type=str,
+        default='',
+        help='directory of saved log-files')
+    parser.add_argument(
+        '--logging-file-name',
+        type=str,
+        default='model_stats.log',
+        help='filename of log')
+    parser.add_argument(
+        '--log-packages',
+        type=str,
+        default='mxnet, torch',
+        help='list of python packages for logging')
+    parser.add_argument(
+        '--log-pip-packages',
+        type=str,
+        default='mxnet-cu92, torch',
+        help='list of pip packages for logging')
+    args = parser.parse_args()
+    return args
+
+
+def get_framework_routines(framework):
+    """
+    Get the model provider routines for a framework.
+
+    Parameters:
+    ----------
+    framework : str
+        Framework name.
+
+    Returns
+    -------
+    tuple of (list of str, function, function, function, function)
+        Model names, model creation function, shape propagation analyzer, forward pass measurer and memory profiler.
+    """
+    if framework == 'gluon':
+        import mxnet as mx
+        from gluon.gluoncv2.model_provider import _models, get_model
+        from gluon.model_stats import analyze_model, measure_model, profile_model_memory
+
+        def create_model(model_name):
+            return get_model(model_name)
+
+        def measure_model_forward(model_name, net, in_channels, in_size):
+            net.initialize(ctx=mx.cpu())
+            result = measure_model(net, in_channels, in_size)
+            mx.nd.waitall()
+            return result
+
+        return list(_models.keys()), create_model, analyze_model, measure_model_forward, profile_model_memory
+    elif framework == 'pytorch':
+        import torch
+        from pytorch.pytorchcv.model_provider import _models, get_model
+        from pytorch.model_stats import analyze_model, measure_model, profile_model_memory
+
+        def create_model(model_name):
+            with torch.device('meta'):
+                return get_model(model_name)
+
+        def measure_model_forward(model_name, net, in_channels, in_size):
+            return measure_model(get_model(model_name), in_channels, in_size)
+
+        return list(_models.keys()), create_model, analyze_model, measure_model_forward, profile_model_memory
+    else:
+        raise ValueError('Unsupported framework: {}'.format(framework))
+
+
+def log_layers(layers):
+    logging.info('{:<60} {:<24} {:<24} {:>10} {:>14} {:>14}'.format(
+        'layer', 'type', 'output', 'params', 'FLOPs', 'MACs'))
+    for layer in layers:
+        logging.info('{:<60} {:<24} {:<24} {:>10} {:>14} {:>14}'.format(
+            layer.name,
+            layer.type_name,
+            'x'.join([str(s) for s in layer.out_shapes[0]]) if layer.out_shapes else '',
+            layer.num_params,
+            '?' if layer.num_flops is None else layer.num_flops,
+            '?' if layer.num_macs is None else layer.num_macs))
+
+
+def calc_memory_stats(net,
+                      in_channels,
+                      in_size,
+                      num_params,
+                      train,
+                      profile_model_memory,
+                      memory_limits,
+                      dtype_size=4):
+    """
+    Calculate peak activation memory and max batch sizes. The peak memory is a linear function of the batch size, so it
+    is profiled for two batch sizes (2 and 4, to allow batch normalization in the train mode). The fixed part is
+    completed with the parameters (and the optimizer momentum buffers in the train mode).
+
+    Parameters:
+    ----------
+    net : object
+        Model.
+    in_channels : int
+        Number of input channels.
+    in_size : tuple of two ints
+        Spatial size of the expected input image.
+    num_params : int
+        Number of trainable parameters.
+    train : bool
+        Whether to use the train mode.
+    profile_model_memory : function
+        Memory profiler.
+    memory_limits : list of float
+        Device memory sizes in GB.
+    dtype_size : int, default 4
+        Size of a tensor element in bytes.
+
+    Returns
+    -------
+    per_sample_bytes : int
+        Activation memory per sample.
+    peak_layer : str
+        Layer at the peak.
+    max_batch_sizes : list of int
+        Max batch sizes for the memory limits.
+    """
+    peak_bytes2, peak_layer = profile_model_memory(net, in_channels, in_size, batch_size=2, train=train)
+    peak_bytes4, _ = profile_model_memory(net, in_channels, in_size, batch_size=4, train=train)
+    per_sample_bytes = max((peak_bytes4 - peak_bytes2) // 2, 1)
+    fixed_bytes = peak_bytes2 - 2 * per_sample_bytes + (2 if train else 1) * dtype_size * num_params
+    max_batch_sizes = [max(int((limit * 2 ** 30 - fixed_bytes) // per_sample_bytes), 0) for limit in memory_limits]
+    return per_sample_bytes, peak_layer, max_batch_sizes
+
+
+def main():
+    args = parse_args()
+
+    initialize_logging(
+        logging_dir_path=args.save_dir,
+        logging_file_name=args.logging_file_name,
+        script_args=args,
+        log_packages=args.log_packages,
+        log_pip_packages=args.log_pip_packages)
+
+    model_names, create_model, analyze_model, measure_model_forward, profile_model_memory =\
+        get_framework_routines(args.framework)
+    if args.models:
+        model_names = args.models.replace(' ', '').split(',')
+    memory_limits = [float(limit) for limit in args.memory_limits.split(',')]
+    modes = ['eval', 'train'] if args.calc_memory else []
+
+    rows = []
+    num_fallbacks = 0
+    num_mismatched = 0
+    num_unverified = 0
+    num_failed = 0
+    tic = time.time()
+    for model_name in model_names:
+        # Models have reference cycles (Gluon blocks), and their weights are freed only by the garbage collector:
+        net = None
+        gc.collect()
+        net = create_model(model_name)
+        in_size = net.in_size if hasattr(net, 'in_size') else (args.input_size, args.input_size)
+        try:
+            num_flops, num_macs, num_params, activation_memory, layers = analyze_model(
+                net, args.in_channels, in_size)
+        except Exception as e:
+            logging.warning('Model {}: shape propagation failed ({}: {}), using forward pass'.format(
+                model_name, type(e).__name__, e))
+            # The failed model can be left in an unusable state (e.g. with consumed autograd functions):
+            net = None
+            gc.collect()
+            net = create_model(model_name)
+            try:
+                num_flops, num_macs, num_params = measure_model_forward(model_name, net, args.in_channels, in_size)
+            except Exception as e:
+                logging.warning('Model {}: forward pass statistics are not calculated ({}: {}), skipped'.format(
+                    model_name, type(e).__name__, e))
+                num_failed += 1
+                continue
+            logging.info('Model {}: params={}, FLOPs={}, MACs={} (forward pass)'.format(
+                model_name, num_params, num_flops, num_macs))
+            rows.append([model_name, 'x'.join([str(s) for s in in_size]), num_params, num_flops, num_macs, '',
+                         'forward'] + [''] * (len(modes) * (2 + len(memory_limits))))
+            num_fallbacks += 1
+            continue
+        logging.info('Model {}: params={}, FLOPs={}, MACs={}, activations={:.2f}MB'.format(
+            model_name, num_params, num_flops, num_macs, activation_memory / 2.0 ** 20))
+        if args.per_layer:
+            log_layers(layers)
+        if args.verify:
+            try:
+                forward_stats = measure_model_forward(model_name, net, args.in_channels, in_size)
+            except Exception as e:
+                # The forward pass counter fails on layer types, which are skipped by shape propagation:
+                logging.warning('Model {}: forward pass statistics are not calculated ({}: {})'.format(
+                    model_name, type(e).__name__, e))
+                forward_stats = None
+                num_unverified += 1
+            if (forward_stats is not None) and (tuple(forward_stats) != (num_flops, num_macs, num_params)):
+                logging.warning('Model {}: forward pass statistics are different: {}'.format(
+                    model_name, forward_stats))
+                num_mismatched += 1
+        row = [model_name, 'x'.join([str(s) for s in in_size]), num_params, num_flops, num_macs, activation_memory,
+               'shapes']
+        for mode in modes:
+            per_sample_bytes, peak_layer, max_batch_sizes = calc_memory_stats(
+                net=net,
+                in_channels=args.in_channels,
+                in_size=in_size,
+                num_params=num_params,
+                train=(mode == 'train'),
+                profile_model_memory=profile_model_memory,
+                memory_limits=memory_limits)
+            logging.info('Model {} ({}): peak activations={:.2f}MB/sample at {},\tmax batch sizes: {}'.format(
+                model_name, mode, per_sample_bytes / 2.0 ** 20, peak_layer,
+                ', '.join(['{}GB: {}'.format(limit, bs) for limit, bs in zip(memory_limits, max_batch_sizes)])))
+            row += [per_sample_bytes, peak_layer] + max_batch_sizes
+        rows.append(row)
+    logging.info('Analyzed {} models in {:.2f} sec ({} by forward pass, {} failed{})'.format(
+        len(rows), time.time() - tic, num_fallbacks, num_failed,
+        (', {} mismatched, {} unverified'.format(num_mismatched, num_unverified) if args.verify else '')))
+
+    with open(os.path.join(args.save_dir, args.stats_csv), 'w') as f:
+        writer = csv.writer(f)
+        header = ['model', 'input_size', 'params', 'flops', 'macs', 'activation_memory', 'method']
+        for mode in modes:
+            header += ['{}_peak_memory_per_sample'.format(mode), '{}_peak_layer'.format(mode)]
+            header += ['{}_max_batch_{}gb'.format(mode, limit) for limit in args.memory_limits.split(',')]
+        writer.writerow(header)
+        writer.writerows(rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -4,7 +4,7 @@ import numpy as np
 
 import chainer
 from chainer import iterators
-from chainer import Chain
+from chainer import Chain, ChainList
 from chainer.dataset import DatasetMixin
 
 from chainercv.transforms import scale
@@ -12,7 +12,11 @@ from chainercv.transforms import center_crop
 from chainercv.datasets import directory_parsing_label_names
 from chainercv.datasets import DirectoryParsingLabelDataset
 
-__all__ = ['add_dataset_parser_arguments', 'get_val_data_iterator', 'get_data_iterators', 'ImagenetPredictor']
+from common.val_crop_cache import ValCropCache, get_val_crop_cache_dir_path
+from common.val_crop_cache import is_val_crop_cache_ready, write_val_crop_cache
+
+__all__ = ['add_dataset_parser_arguments', 'get_val_data_iterator', 'get_data_iterators', 'ImagenetPredictor',
+           'ImagenetMultiPredictor']
 
 
 def add_dataset_parser_arguments(parser):
@@ -32,6 +36,11 @@ def add_dataset_parser_arguments(parser):
         type=float,
         default=0.875,
         help='inverted ratio for input image crop')
+    parser.add_argument(
+        '--val-cache-dir',
+        type=str,
+        default='',
+        help='directory of preprocessed validation image cache (disabled if empty)')
 
     parser.add_argument(
         '--num-classes',
@@ -82,6 +91,59 @@ class ImagenetPredictor(Chain):
         return output
 
 
+class ImagenetMultiPredictor(Chain):
+    """
+    Predictor for several models with the same input size. Each image is preprocessed once for all models.
+
+    Parameters:
+    ----------
+    base_models : list of Chain
+        Models.
+    scale_size : int, default 256
+        Size of the shorter side after scaling.
+    crop_size : int or tuple of 2 int, default 224
+        Size of the center crop.
+    mean : tuple of 3 float, default (0.485, 0.456, 0.406)
+        Mean values for normalization.
+    std : tuple of 3 float, default (0.229, 0.224, 0.225)
+        Standard deviation values for normalization.
+    """
+    def __init__(self,
+                 base_models,
+                 scale_size=256,
+                 crop_size=224,
+                 mean=(0.485, 0.456, 0.406),
+                 std=(0.229, 0.224, 0.225)):
+        super(ImagenetMultiPredictor, self).__init__()
+        self.scale_size = scale_size
+        if isinstance(crop_size, int):
+            crop_size = (crop_size, crop_size)
+        self.crop_size = crop_size
+        self.mean = np.array(mean, np.float32)[:, np.newaxis, np.newaxis]
+        self.std = np.array(std, np.float32)[:, np.newaxis, np.newaxis]
+        with self.init_scope():
+            self.models = ChainList(*base_models)
+
+    def _preprocess(self, img):
+        img = scale(img=img, size=self.scale_size)
+        img = center_crop(img, self.crop_size)
+        img /= 255.0
+        img -= self.mean
+        img /= self.std
+        return img
+
+    def predict(self, imgs):
+        imgs = self.xp.asarray([self._preprocess(img) for img in imgs])
+
+        outputs = []
+        with chainer.using_config('train', False), chainer.function.no_backprop_mode():
+            imgs = chainer.Variable(imgs)
+            for model in self.models:
+                predictions = model(imgs)
+                outputs.append(chainer.backends.cuda.to_cpu(predictions.array))
+        return outputs
+
+
 class PreprocessedDataset(DatasetMixin):
 
     def __init__(self,
@@ -115,6 +177,92 @@ class PreprocessedDataset(DatasetMixin):
         return image, label
 
 
+class CropDataset(DatasetMixin):
+    """
+    Dataset of scaled and center-cropped uint8 images (in HWC layout) for writing into the crop cache.
+    """
+    def __init__(self,
+                 root,
+                 scale_size=256,
+                 crop_size=224):
+        self.base = DirectoryParsingLabelDataset(root)
+        self.scale_size = scale_size
+        if isinstance(crop_size, int):
+            crop_size = (crop_size, crop_size)
+        self.crop_size = crop_size
+
+    def __len__(self):
+        return len(self.base)
+
+    def get_example(self, i):
+        image, label = self.base[i]
+        image = scale(img=image, size=self.scale_size)
+        image = center_crop(image, self.crop_size)
+        image = np.clip(np.round(image), 0, 255).astype(np.uint8).transpose((1, 2, 0))
+        return image, label
+
+
+class ValCropCacheDataset(DatasetMixin):
+    """
+    Dataset of preprocessed validation images from the crop cache.
+    """
+    def __init__(self,
+                 cache,
+                 mean=(0.485, 0.456, 0.406),
+                 std=(0.229, 0.224, 0.225)):
+        self.cache = cache
+        self.mean = np.array(mean, np.float32)[:, np.newaxis, np.newaxis]
+        self.std = np.array(std, np.float32)[:, np.newaxis, np.newaxis]
+
+    def __len__(self):
+        return len(self.cache)
+
+    def get_example(self, i):
+        image, label = self.cache[i]
+        image = image.transpose((2, 0, 1)).astype(np.float32)
+        image /= 255.0
+        image -= self.mean
+        image /= self.std
+        return image, label
+
+
+def get_val_cache_dataset(val_dir_path,
+                          cache_dir,
+                          batch_size,
+                          num_workers,
+                          input_image_size,
+                          resize_value):
+    if isinstance(input_image_size, int):
+        input_image_size = (input_image_size, input_image_size)
+    cache_dir_path = get_val_crop_cache_dir_path(
+        cache_dir_path=cache_dir,
+        tag='ch',
+        input_image_size=input_image_size,
+        resize_value=resize_value)
+    if not is_val_crop_cache_ready(cache_dir_path):
+        crop_dataset = CropDataset(
+            root=val_dir_path,
+            scale_size=resize_value,
+            crop_size=input_image_size)
+        crop_iterator = iterators.MultiprocessIterator(
+            dataset=crop_dataset,
+            batch_size=batch_size,
+            repeat=False,
+            shuffle=False,
+            n_processes=num_workers)
+
+        def get_batches():
+            for batch in crop_iterator:
+                images, labels = zip(*batch)
+                yield np.stack(images), np.array(labels)
+
+        write_val_crop_cache(
+            cache_dir_path=cache_dir_path,
+            batches=get_batches(),
+            num_samples=len(crop_dataset))
+    return ValCropCacheDataset(ValCropCache(cache_dir_path))
+
+
 def get_val_data_iterator(data_dir,
                           batch_size,
                           num_workers,
@@ -141,7 +289,8 @@ def get_data_iterators(data_dir,
                        num_workers,
                        num_classes,
                        input_image_size=224,
-                       resize_inv_factor=0.875):
+                       resize_inv_factor=0.875,
+                       val_cache_dir=''):
     assert (resize_inv_factor > 0.0)
     resize_value = int(math.ceil(float(input_image_size) / resize_inv_factor))
 
@@ -153,10 +302,19 @@ def get_data_iterators(data_dir,
     assert(len(directory_parsing_label_names(train_dir_path)) == num_classes)
 
     val_dir_path = os.path.join(data_dir, 'val')
-    val_dataset = PreprocessedDataset(
-        root=val_dir_path,
-        scale_size=resize_value,
-        crop_size=input_image_size)
+    if val_cache_dir:
+        val_dataset = get_val_cache_dataset(
+            val_dir_path=val_dir_path,
+            cache_dir=val_cache_dir,
+            batch_size=batch_size,
+            num_workers=num_workers,
+            input_image_size=input_image_size,
+            resize_value=resize_value)
+    else:
+        val_dataset = PreprocessedDataset(
+            root=val_dir_path,
+            scale_size=resize_value,
+            crop_size=input_image_size)
     assert (len(directory_parsing_label_names(val_dir_path)) == num_classes)
 
     train_iterator = iterators.MultiprocessIterator(
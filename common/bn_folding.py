@@ -0,0 +1,137 @@
+"""
+    Folding of inference-mode Batch normalization into adjacent convolution weights (framework independent, numpy).
+"""
+
+__all__ = ['fold_bn_into_prev_conv', 'fold_bn_into_next_conv']
+
+import numpy as np
+
+
+def _get_bn_scale_shift(gamma,
+                        beta,
+                        running_mean,
+                        running_var,
+                        eps):
+    """
+    Get the affine transform `y = scale * x + shift` equivalent to an inference-mode BatchNorm.
+
+    Parameters:
+    ----------
+    gamma : np.array or None
+        BatchNorm scale (None if the layer isn't scaled).
+    beta : np.array or None
+        BatchNorm shift (None if the layer isn't centered).
+    running_mean : np.array
+        Running mean.
+    running_var : np.array
+        Running variance.
+    eps : float
+        Small value added to the variance.
+
+    Returns
+    -------
+    tuple of 2 np.array
+        Scale and shift.
+    """
+    scale = 1.0 / np.sqrt(running_var.astype(np.float64) + eps)
+    if gamma is not None:
+        scale *= gamma
+    shift = -running_mean * scale
+    if beta is not None:
+        shift += beta
+    return scale, shift
+
+
+def fold_bn_into_prev_conv(weight,
+                           bias,
+                           gamma,
+                           beta,
+                           running_mean,
+                           running_var,
+                           eps):
+    """
+    Fold a BatchNorm into the convolution before it (`bn(conv(x))`). Works for any grouping, since BatchNorm acts on
+    output channels.
+
+    Parameters:
+    ----------
+    weight : np.array
+        Convolution weight (out_channels x in_channels/groups x kh x kw).
+    bias : np.array or None
+        Convolution bias.
+    gamma : np.array or None
+        BatchNorm scale.
+    beta : np.array or None
+        BatchNorm shift.
+    running_mean : np.array
+        Running mean.
+    running_var : np.array
+        Running variance.
+    eps : float
+        Small value added to the variance.
+
+    Returns
+    -------
+    tuple of 2 np.array
+        Fused convolution weight and bias (in the dtype of the weight).
+    """
+    scale, shift = _get_bn_scale_shift(gamma, beta, running_mean, running_var, eps)
+    fused_weight = weight.astype(np.float64) * scale.reshape((-1,) + (1,) * (weight.ndim - 1))
+    fused_bias = shift if bias is None else bias * scale + shift
+    return fused_weight.astype(weight.dtype), fused_bias.astype(weight.dtype)
+
+
+def fold_bn_into_next_conv(weight,
+                           bias,
+                           groups,
+                           gamma,
+                           beta,
+                           running_mean,
+                           running_var,
+                           eps):
+    """
+    Fold a BatchNorm into the convolution after it (`conv(bn(x))`). It's exact only for convolutions without padding,
+    because padded zeros aren't transformed by BatchNorm.
+
+    Parameters:
+    ----------
+    weight : np.array
+        Convolution weight (out_channels x in_channels/groups x kh x kw).
+    bias : np.array or None
+        Convolution bias.
+    groups : int
+        Number of convolution groups.
+    gamma : np.array or None
+        BatchNorm scale.
+    beta : np.array or None
+        BatchNorm shift.
+    running_mean : np.array
+        Running mean.
+    running_var : np.array
+        Running variance.
+    eps : float
+        Small value added to the variance.
+
+    Returns
+    -------
+    tuple of 2 np.array
+        Fused convolution weight and bias (in the dtype of the weight).
+    """
+    scale, shift = _get_bn_scale_shift(gamma, beta, running_mean, running_var, eps)
+    out_channels = weight.shape[0]
+    group_in_channels = weight.shape[1]
+    spatial_ones = (1,) * (weight.ndim - 2)
+
+    def expand(x):
+        # Input channel i of group g is seen by the output channels of group g as channel i of the kernel:
+        x = x.reshape((groups, 1, group_in_channels))
+        x = np.broadcast_to(x, (groups, out_channels // groups, group_in_channels))
+        return x.reshape((out_channels, group_in_channels) + spatial_ones)
+
+    dtype = weight.dtype
+    weight = weight.astype(np.float64)
+    fused_weight = weight * expand(scale)
+    fused_bias = (weight * expand(shift)).reshape((out_channels, -1)).sum(axis=1)
+    if bias is not None:
+        fused_bias += bias
+    return fused_weight.astype(dtype), fused_bias.astype(dtype)
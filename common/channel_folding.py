@@ -0,0 +1,55 @@
+"""
+    Folding of channel permutations (channel shuffle, channel gather) into adjacent layer weights (framework
+    independent, numpy).
+"""
+
+__all__ = ['get_channel_shuffle_permutation', 'densify_gathered_dense']
+
+import numpy as np
+
+
+def get_channel_shuffle_permutation(channels,
+                                    groups):
+    """
+    Get the permutation of a channel shuffle: `y[:, c] = x[:, perm[c]]`.
+
+    Parameters:
+    ----------
+    channels : int
+        Number of channels.
+    groups : int
+        Number of groups.
+
+    Returns
+    -------
+    np.array
+        Permutation of channels.
+    """
+    assert (channels % groups == 0)
+    return np.arange(channels).reshape((groups, channels // groups)).T.reshape(-1)
+
+
+def densify_gathered_dense(weight,
+                           index,
+                           in_units):
+    """
+    Convert a fully connected layer of gathered features (`dense(x[:, index])`) into a fully connected layer of the
+    whole input.
+
+    Parameters:
+    ----------
+    weight : np.array
+        Layer weight (units x len(index)).
+    index : np.array
+        Indices of gathered features.
+    in_units : int
+        Number of input features.
+
+    Returns
+    -------
+    np.array
+        Layer weight (units x in_units).
+    """
+    dense_weight = np.zeros((weight.shape[0], in_units), np.float64)
+    np.add.at(dense_weight, (slice(None), index), weight)
+    return dense_weight.astype(weight.dtype)
@@ -0,0 +1,29 @@
+"""
+    File system helpers shared by caches and checkpoint writers.
+"""
+
+__all__ = ['replace_file']
+
+import os
+
+
+def replace_file(src_file_path,
+                 dst_file_path):
+    """
+    Rename a (temporary) file over the destination one. The rename is atomic where the platform allows it, so readers
+    see either the old file or the complete new one. Python 2 has no `os.replace`, and there the destination is removed
+    before the rename.
+
+    Parameters:
+    ----------
+    src_file_path : str
+        Path to the source file.
+    dst_file_path : str
+        Path to the destination file.
+    """
+    if hasattr(os, 'replace'):
+        os.replace(src_file_path, dst_file_path)
+    else:
+        if os.path.exists(dst_file_path):
+            os.remove(dst_file_path)
+        os.rename(src_file_path, dst_file_path)
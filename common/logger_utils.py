@@ -44,3 +44,43 @@ def initialize_logging(logging_dir_path,
             packages=packages,
             pip_packages=pip_packages)))
     return logger, log_file_exist
+
+
+class EpochSpeedMemoryMeter(object):
+    """
+    Meter of the training throughput and the memory usage of epochs, which are logged with the deltas against the
+    previous epoch (the peak resident memory of a process on CPU only grows, so the delta is its growth during the
+    epoch).
+    """
+    def __init__(self):
+        super(EpochSpeedMemoryMeter, self).__init__()
+        self.throughput = None
+        self.memory_usage = None
+
+    def update(self, throughput, memory_usage):
+        """
+        Update the meter with the statistics of an epoch.
+
+        Parameters:
+        ----------
+        throughput : float
+            Throughput in samples per second.
+        memory_usage : int
+            Memory usage in bytes.
+
+        Returns
+        -------
+        speed_str : str
+            Throughput with the delta for the log.
+        memory_str : str
+            Memory usage with the delta for the log.
+        """
+        speed_str = '{:.2f} samples/sec'.format(throughput)
+        memory_str = '{:.1f} MB'.format(memory_usage / 2.0 ** 20)
+        if self.throughput:
+            speed_str += ' ({:+.1%})'.format(float(throughput) / self.throughput - 1.0)
+        if self.memory_usage is not None:
+            memory_str += ' ({:+.1f} MB)'.format((memory_usage - self.memory_usage) / 2.0 ** 20)
+        self.throughput = throughput
+        self.memory_usage = memory_usage
+        return speed_str, memory_str
@@ -0,0 +1,115 @@
+"""
+    Memory-mappable weight file format. The file consists of a magic string, a JSON header with the name, dtype, shape
+    and offset of each tensor, and the raw tensor data (aligned). Tensors are mapped straight from the disk, so
+    processes which serve the same model share the page cache instead of keeping private copies.
+"""
+
+__all__ = ['mmap_weights_file_ext', 'is_mmap_weights_file', 'save_mmap_weights', 'load_mmap_weights']
+
+import os
+import json
+import struct
+from collections import OrderedDict
+import numpy as np
+from .file_utils import replace_file
+
+mmap_weights_file_ext = '.mmap'
+
+_magic = b'IMGCLSMM'
+_alignment = 64
+
+
+def is_mmap_weights_file(file_path):
+    """
+    Check whether the file is a memory-mappable weight file (by the extension).
+
+    Parameters:
+    ----------
+    file_path : str
+        Path to the file.
+
+    Returns
+    -------
+    bool
+        Whether the file has the memory-mappable weight format.
+    """
+    return file_path.endswith(mmap_weights_file_ext)
+
+
+def _align(offset):
+    return (offset + _alignment - 1) // _alignment * _alignment
+
+
+def save_mmap_weights(file_path,
+                      arrays):
+    """
+    Save tensors into a memory-mappable weight file. The file is written under a temporary name and renamed at the end.
+
+    Parameters:
+    ----------
+    file_path : str
+        Path to the file.
+    arrays : OrderedDict of str -> np.array
+        Named tensors.
+    """
+    tensors = []
+    offset = 0
+    for name, array in arrays.items():
+        array = np.asarray(array)
+        offset = _align(offset)
+        tensors.append({
+            'name': name,
+            'dtype': array.dtype.str,
+            'shape': list(array.shape),
+            'offset': offset})
+        offset += array.nbytes
+    header = json.dumps({'tensors': tensors}).encode('utf-8')
+    data_offset = _align(len(_magic) + 8 + len(header))
+
+    tmp_file_path = file_path + '.tmp'
+    with open(tmp_file_path, 'wb') as f:
+        f.write(_magic)
+        f.write(struct.pack('<Q', len(header)))
+        f.write(header)
+        for tensor, array in zip(tensors, arrays.values()):
+            f.seek(data_offset + tensor['offset'])
+            f.write(np.ascontiguousarray(array).tobytes())
+        f.truncate(data_offset + offset)
+    replace_file(
+        src_file_path=tmp_file_path,
+        dst_file_path=file_path)
+
+
+def load_mmap_weights(file_path):
+    """
+    Map tensors from a memory-mappable weight file. The mapping is copy-on-write: pages are shared with other processes
+    until a tensor is modified in place.
+
+    Parameters:
+    ----------
+    file_path : str
+        Path to the file.
+
+    Returns
+    -------
+    OrderedDict of str -> np.array
+        Named tensors (views on the mapped file).
+    """
+    with open(file_path, 'rb') as f:
+        magic = f.read(len(_magic))
+        if magic != _magic:
+            raise ValueError('File {} is not a memory-mappable weight file'.format(file_path))
+        header_size, = struct.unpack('<Q', f.read(8))
+        header = json.loads(f.read(header_size).decode('utf-8'))
+    data_offset = _align(len(_magic) + 8 + header_size)
+
+    file_size = os.path.getsize(file_path)
+    buffer = np.memmap(file_path, dtype=np.uint8, mode='c', offset=data_offset, shape=(file_size - data_offset,))
+    arrays = OrderedDict()
+    for tensor in header['tensors']:
+        dtype = np.dtype(tensor['dtype'])
+        shape = tuple(tensor['shape'])
+        count = int(np.prod(shape))
+        begin = tensor['offset']
+        arrays[tensor['name']] = buffer[begin:(begin + count * dtype.itemsize)].view(dtype).reshape(shape)
+    return arrays
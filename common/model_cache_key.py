@@ -0,0 +1,62 @@
+"""
+    Keys of on-disk caches of prepared models (Gluon symbol cache, PyTorch JIT cache): hash of model weights and hash
+    of the cache key.
+"""
+
+__all__ = ['get_weights_sha1', 'calc_cache_key_hash']
+
+import hashlib
+
+
+def get_weights_sha1(model_name,
+                     use_pretrained,
+                     pretrained_model_file_path,
+                     get_model_name_suffix_data):
+    """
+    Get SHA-1 hash of model weights.
+
+    Parameters:
+    ----------
+    model_name : str
+        Name of the model.
+    use_pretrained : bool
+        Whether the pretrained weights from the model store are used.
+    pretrained_model_file_path : str
+        Path to the file with weights (or empty string).
+    get_model_name_suffix_data : function
+        Function of the model store, which returns the error, SHA-1 hash and repo release tag for a model name.
+
+    Returns
+    -------
+    str or None
+        SHA-1 hash (None for randomly initialized weights).
+    """
+    if pretrained_model_file_path:
+        sha1 = hashlib.sha1()
+        with open(pretrained_model_file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                sha1.update(chunk)
+        return sha1.hexdigest()
+    if use_pretrained:
+        _, sha1_hash, _ = get_model_name_suffix_data(model_name)
+        return sha1_hash
+    return None
+
+
+def calc_cache_key_hash(key,
+                        **kwargs):
+    """
+    Calculate a short hash of a cache key.
+
+    Parameters:
+    ----------
+    key : list of str
+        Key items.
+
+    Returns
+    -------
+    str
+        Hash of the key items and the extra keyword arguments (in sorted order).
+    """
+    key = list(key) + ['{}={}'.format(k, kwargs[k]) for k in sorted(kwargs.keys())]
+    return hashlib.sha1('|'.join(key).encode('utf-8')).hexdigest()[:16]
@@ -0,0 +1,135 @@
+"""
+    Helpers for batched multi-model evaluation: models are grouped by the input size and the resize inverse factor, so
+    that each validation batch is decoded once and fed to every model in the group.
+"""
+
+__all__ = ['parse_model_specs', 'group_prepared_models', 'calc_error_code', 'write_errors_csv']
+
+import os
+import csv
+import logging
+from collections import OrderedDict
+
+
+def parse_model_specs(models,
+                      default_resize_inv_factor):
+    """
+    Parse a list of model specifications. Each specification is `name` or `name:resize_inv_factor`.
+
+    Parameters:
+    ----------
+    models : str
+        Comma-separated list of model specifications.
+    default_resize_inv_factor : float
+        Resize inverse factor for models without an explicit one.
+
+    Returns
+    -------
+    list of tuple of (str, float)
+        Model names with resize inverse factors.
+    """
+    model_specs = []
+    for model_spec in models.replace(' ', '').split(','):
+        if not model_spec:
+            continue
+        if ':' in model_spec:
+            model_name, resize_inv_factor = model_spec.split(':')
+            resize_inv_factor = float(resize_inv_factor)
+        else:
+            model_name, resize_inv_factor = model_spec, default_resize_inv_factor
+        model_specs.append((model_name, resize_inv_factor))
+    return model_specs
+
+
+def group_prepared_models(model_specs,
+                          prepare_net,
+                          get_in_size,
+                          max_group_size=8):
+    """
+    Prepare models one by one and group them by the input size (taken from the prepared network) and the resize
+    inverse factor. Each model is built only once. When `max_group_size` models are loaded, the largest pending group is
+    yielded and released, so the number of simultaneously loaded models is bounded. The remaining groups are yielded at
+    the end.
+
+    Parameters:
+    ----------
+    model_specs : list of tuple of (str, float)
+        Model names with resize inverse factors.
+    prepare_net : function
+        Function returning the prepared network for a model name.
+    get_in_size : function
+        Function returning the input size (tuple of 2 int) for a prepared network.
+    max_group_size : int, default 8
+        Maximal number of simultaneously loaded models (and so models in a group).
+
+    Returns
+    -------
+    iterator of tuple of (tuple of 2 int, float, list of str, list of nets)
+        Input size, resize inverse factor, model names and prepared networks for each group.
+    """
+    pending_groups = OrderedDict()
+    num_pending_models = 0
+    for model_name, resize_inv_factor in model_specs:
+        net = prepare_net(model_name)
+        key = (tuple(get_in_size(net)), resize_inv_factor)
+        model_names, nets = pending_groups.setdefault(key, ([], []))
+        model_names.append(model_name)
+        nets.append(net)
+        del model_names, nets, net
+        num_pending_models += 1
+        if num_pending_models >= max_group_size:
+            key = max(pending_groups.keys(), key=lambda k: len(pending_groups[k][0]))
+            model_names, nets = pending_groups.pop(key)
+            num_pending_models -= len(model_names)
+            yield key[0], key[1], model_names, nets
+            del model_names, nets
+    while pending_groups:
+        (in_size, resize_inv_factor), (model_names, nets) = pending_groups.popitem(last=False)
+        yield in_size, resize_inv_factor, model_names, nets
+        del model_names, nets
+
+
+def calc_error_code(err):
+    """
+    Convert an error value into the four-digit code used in the `_model_sha1` tables of model stores.
+
+    Parameters:
+    ----------
+    err : float
+        Error value (in range [0, 1]).
+
+    Returns
+    -------
+    str
+        Error code.
+    """
+    return '{:04d}'.format(int(round(err * 10000)))
+
+
+def write_errors_csv(file_path,
+                     rows):
+    """
+    Write evaluation results for a list of models into a CSV file.
+
+    Parameters:
+    ----------
+    file_path : str
+        Path to the CSV file.
+    rows : list of tuple of (str, tuple of 2 int, float, float, float)
+        Model name, input size, resize inverse factor, top-1 error and top-5 error for each model.
+    """
+    file_dir_path = os.path.dirname(file_path)
+    if file_dir_path and not os.path.exists(file_dir_path):
+        os.makedirs(file_dir_path)
+    with open(file_path, 'w') as f:
+        writer = csv.writer(f)
+        writer.writerow(['model', 'input_size', 'resize_inv_factor', 'err_top1', 'err_top5', 'error'])
+        for model_name, in_size, resize_inv_factor, err_top1, err_top5 in rows:
+            writer.writerow([
+                model_name,
+                'x'.join([str(s) for s in in_size]),
+                resize_inv_factor,
+                '{:.4f}'.format(err_top1),
+                '{:.4f}'.format(err_top5),
+                calc_error_code(err_top5)])
+    logging.info('Evaluation results are saved to {}'.format(file_path))
@@ -0,0 +1,37 @@
+"""
+    Sequential sampler of a dataset shard for distributed evaluation.
+"""
+
+__all__ = ['ShardSampler']
+
+
+class ShardSampler(object):
+    """
+    Sequential sampler (for Gluon/PyTorch data loaders), which takes every `num_parts`-th sample starting from
+    `part_index`. Unlike `DistributedSampler`, shards aren't padded with duplicate samples up to equal sizes, so
+    metrics, which are summed over workers, count each sample exactly once.
+
+    Parameters:
+    ----------
+    length : int
+        Number of samples.
+    num_parts : int, default 1
+        Number of parts (workers).
+    part_index : int, default 0
+        Index of the part (worker).
+    """
+    def __init__(self,
+                 length,
+                 num_parts=1,
+                 part_index=0):
+        super(ShardSampler, self).__init__()
+        assert (0 <= part_index < num_parts)
+        self.length = length
+        self.num_parts = num_parts
+        self.part_index = part_index
+
+    def __iter__(self):
+        return iter(range(self.part_index, self.length, self.num_parts))
+
+    def __len__(self):
+        return len(range(self.part_index, self.length, self.num_parts))
@@ -0,0 +1,219 @@
+"""
+    Profiler of training loop stages (data loading, host-to-device copy, forward, backward, update, metrics).
+"""
+
+__all__ = ['StageProfiler', 'null_stage']
+
+import os
+import time
+import json
+import logging
+from collections import OrderedDict
+
+# Python 2 has no `time.perf_counter`:
+_perf_counter = getattr(time, 'perf_counter', time.time)
+
+
+class _NullStage(object):
+    """
+    Stage context for steps which are not sampled.
+    """
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+
+_null_stage = _NullStage()
+
+
+def null_stage(name):
+    """
+    Get a context for a stage without profiling (when the profiler is disabled).
+
+    Parameters:
+    ----------
+    name : str
+        Stage name.
+
+    Returns
+    -------
+    object
+        Context manager.
+    """
+    return _null_stage
+
+
+class _Stage(object):
+    """
+    Stage context for sampled steps.
+
+    Parameters:
+    ----------
+    profiler : StageProfiler
+        Profiler.
+    name : str
+        Stage name.
+    """
+    def __init__(self,
+                 profiler,
+                 name):
+        self.profiler = profiler
+        self.name = name
+        self.tic = None
+
+    def __enter__(self):
+        self.tic = _perf_counter()
+        return self
+
+    def __exit__(self, *args):
+        if self.profiler.sync_func is not None:
+            self.profiler.sync_func()
+        toc = _perf_counter()
+        stage_times = self.profiler.stage_times
+        stage_times[self.name] = stage_times.get(self.name, 0.0) + (toc - self.tic)
+        self.profiler._add_trace_event(self.name, self.tic, toc, tid=1)
+        return False
+
+
+class StageProfiler(object):
+    """
+    Profiler of training loop stages. Every `sample_interval`-th step is sampled: its stages are timed (with device
+    synchronization at the end of each stage, so asynchronously launched work is attributed to the right stage) and
+    recorded into a Chrome trace. Other steps run without synchronization and with negligible overhead. The `data`
+    stage is the time of waiting for the next batch from the data loader queue.
+
+    Parameters:
+    ----------
+    sync_func : function or None
+        Function for synchronization with devices (e.g. `mx.nd.waitall` or `torch.cuda.synchronize`).
+    sample_interval : int, default 100
+        Interval of sampled steps.
+    trace_file_path : str or None, default None
+        Path to the Chrome trace file (JSON, it can be opened in chrome://tracing or Perfetto).
+    max_trace_events : int, default 200000
+        Maximal number of events in the trace.
+    """
+    def __init__(self,
+                 sync_func,
+                 sample_interval=100,
+                 trace_file_path=None,
+                 max_trace_events=200000):
+        super(StageProfiler, self).__init__()
+        assert (sample_interval > 0)
+        self.sync_func = sync_func
+        self.sample_interval = sample_interval
+        self.trace_file_path = trace_file_path
+        self.max_trace_events = max_trace_events
+
+        self.step_count = 0
+        self.sampled = False
+        self.step_tic = None
+        self.stage_times = OrderedDict()
+        self.step_times = []
+        self.trace_events = []
+        self.time_origin = _perf_counter()
+
+    def iterate(self, data_source):
+        """
+        Iterate over a data source, each item is a new step (waiting for an item is the `data` stage).
+
+        Parameters:
+        ----------
+        data_source : iterable
+            Data loader.
+        """
+        data_iter = iter(data_source)
+        while True:
+            self._begin_step()
+            with self.stage('data'):
+                try:
+                    batch = next(data_iter)
+                except StopIteration:
+                    self.sampled = False
+                    self.step_tic = None
+                    return
+            yield batch
+
+    def stage(self, name):
+        """
+        Get a context for timing of a stage.
+
+        Parameters:
+        ----------
+        name : str
+            Stage name.
+
+        Returns
+        -------
+        object
+            Context manager.
+        """
+        if not self.sampled:
+            return _null_stage
+        return _Stage(self, name)
+
+    def log_summary(self, title):
+        """
+        Log the summary for sampled steps since the last summary and reset it.
+
+        Parameters:
+        ----------
+        title : str
+            Title of the summary.
+        """
+        self._end_step()
+        if not self.step_times:
+            return
+        num_steps = len(self.step_times)
+        step_time = sum(self.step_times) / num_steps
+        stages_str = '\t'.join(['{}={:.1f}ms ({:.0%})'.format(name, 1000.0 * t / num_steps, t / num_steps / step_time)
+                                for name, t in self.stage_times.items()])
+        logging.info('{} stages (over {} sampled steps): step={:.1f}ms\t{}'.format(
+            title, num_steps, 1000.0 * step_time, stages_str))
+        self.stage_times = OrderedDict()
+        self.step_times = []
+
+    def close(self):
+        """
+        Write the Chrome trace file.
+        """
+        self._end_step()
+        if not self.trace_file_path:
+            return
+        trace_dir_path = os.path.dirname(self.trace_file_path)
+        if trace_dir_path and not os.path.exists(trace_dir_path):
+            os.makedirs(trace_dir_path)
+        with open(self.trace_file_path, 'w') as f:
+            json.dump({'traceEvents': self.trace_events, 'displayTimeUnit': 'ms'}, f)
+        logging.info('Stage trace is saved: {}'.format(self.trace_file_path))
+
+    def _begin_step(self):
+        self._end_step()
+        self.step_count += 1
+        self.sampled = (self.step_count % self.sample_interval == 0)
+        if self.sampled:
+            if self.sync_func is not None:
+                self.sync_func()
+            self.step_tic = _perf_counter()
+
+    def _end_step(self):
+        if not self.sampled:
+            return
+        step_toc = _perf_counter()
+        self.step_times.append(step_toc - self.step_tic)
+        self._add_trace_event('step', self.step_tic, step_toc, tid=0)
+        self.sampled = False
+        self.step_tic = None
+
+    def _add_trace_event(self, name, tic, toc, tid):
+        if len(self.trace_events) < self.max_trace_events:
+            self.trace_events.append({
+                'name': name,
+                'ph': 'X',
+                'ts': 1e6 * (tic - self.time_origin),
+                'dur': 1e6 * (toc - tic),
+                'pid': os.getpid(),
+                'tid': tid,
+                'args': {'step': self.step_count}})
@@ -0,0 +1,218 @@
+"""
+    Step-granular training checkpoints, which allow to continue an interrupted training from the exact batch.
+"""
+
+__all__ = ['ResumableRandomSampler', 'StepCheckpointer', 'load_step_checkpoint_meta', 'restore_rng_states']
+
+import os
+import time
+import random
+import pickle
+import logging
+import numpy as np
+from .file_utils import replace_file
+
+
+class ResumableRandomSampler(object):
+    """
+    Random sampler (for Gluon/PyTorch data loaders), which permutes samples by the seed and the epoch index, and which
+    can start an epoch from an arbitrary position. So the order of samples doesn't depend on the history of the global
+    random number generators. For distributed training each worker takes its own equal part of the same permutation.
+
+    Parameters:
+    ----------
+    seed : int
+        Seed for permutations (should be the same for all workers).
+    length : int or None, default None
+        Number of samples (it can be set later by `set_length`).
+    num_parts : int, default 1
+        Number of parts (workers).
+    part_index : int, default 0
+        Index of the part (worker).
+    """
+    def __init__(self,
+                 seed,
+                 length=None,
+                 num_parts=1,
+                 part_index=0):
+        super(ResumableRandomSampler, self).__init__()
+        assert (0 <= part_index < num_parts)
+        self.seed = seed
+        self.length = length
+        self.num_parts = num_parts
+        self.part_index = part_index
+        self.epoch = 0
+        self.start_index = 0
+
+    def set_length(self, length):
+        self.length = length
+
+    def set_epoch(self,
+                  epoch,
+                  start_index=0):
+        """
+        Set the epoch for the next iteration.
+
+        Parameters:
+        ----------
+        epoch : int
+            Epoch index.
+        start_index : int, default 0
+            Number of samples of the epoch which are skipped (only for the next iteration).
+        """
+        self.epoch = epoch
+        self.start_index = start_index
+
+    def __iter__(self):
+        indices = np.random.RandomState(self.seed + self.epoch).permutation(self.length)
+        part_length = self.length // self.num_parts
+        indices = indices[(self.part_index * part_length):((self.part_index + 1) * part_length)]
+        start_index = self.start_index
+        self.start_index = 0
+        return iter(indices[start_index:].tolist())
+
+    def __len__(self):
+        return self.length // self.num_parts - self.start_index
+
+
+class StepCheckpointer(object):
+    """
+    Saver of mid-epoch checkpoints with a cadence in training steps and/or in wall-clock minutes. A checkpoint consists
+    of files written by the save callback (model, optimizer state) and a meta file (position in training, states of
+    Python/NumPy random number generators and any framework specific data). The meta file is written last and
+    atomically, so an interrupted saving doesn't produce a broken checkpoint.
+
+    Parameters:
+    ----------
+    checkpoint_file_path_prefix : str
+        Prefix for checkpoint file paths.
+    checkpoint_file_save_callback : function
+        Callback for real saving of checkpoint files.
+    checkpoint_file_exts : tuple of str
+        List of checkpoint file extensions (excluding the meta file).
+    interval_steps : int, default 0
+        Interval of checkpoint saving in training steps (0 means disabled).
+    interval_minutes : float, default 0.0
+        Interval of checkpoint saving in minutes (0 means disabled).
+    checkpoint_file_count : int, default 2
+        Count of checkpoints kept on disk.
+    """
+    meta_file_ext = '.resume'
+
+    def __init__(self,
+                 checkpoint_file_path_prefix,
+                 checkpoint_file_save_callback,
+                 checkpoint_file_exts,
+                 interval_steps=0,
+                 interval_minutes=0.0,
+                 checkpoint_file_count=2):
+        super(StepCheckpointer, self).__init__()
+        assert (interval_steps >= 0) and (interval_minutes >= 0.0)
+        assert (checkpoint_file_count > 0)
+        checkpoint_dir_path = os.path.dirname(checkpoint_file_path_prefix)
+        if checkpoint_dir_path and not os.path.exists(checkpoint_dir_path):
+            os.makedirs(checkpoint_dir_path)
+        self.checkpoint_file_path_prefix = checkpoint_file_path_prefix
+        self.checkpoint_file_save_callback = checkpoint_file_save_callback
+        self.checkpoint_file_exts = checkpoint_file_exts
+        self.interval_steps = interval_steps
+        self.interval_minutes = interval_minutes
+        self.checkpoint_file_count = checkpoint_file_count
+
+        self.step_count = 0
+        self.last_save_time = time.time()
+        self.checkpoint_file_stems = []
+
+    def step(self):
+        """
+        Register a training step.
+
+        Returns
+        -------
+        bool
+            Whether a checkpoint should be saved now.
+        """
+        self.step_count += 1
+        if (self.interval_steps > 0) and (self.step_count % self.interval_steps == 0):
+            return True
+        if (self.interval_minutes > 0.0) and (time.time() - self.last_save_time >= 60.0 * self.interval_minutes):
+            return True
+        return False
+
+    def save(self,
+             epoch,
+             batch,
+             meta,
+             **kwargs):
+        """
+        Save a checkpoint.
+
+        Parameters:
+        ----------
+        epoch : int
+            Index of the current epoch (from 0).
+        batch : int
+            Number of processed batches in the current epoch.
+        meta : dict
+            Framework specific data for the meta file.
+        """
+        file_stem = "{}_{:04d}_{:07d}".format(self.checkpoint_file_path_prefix, epoch + 1, batch)
+        self.checkpoint_file_save_callback(file_stem, **kwargs)
+
+        meta = dict(meta)
+        meta["epoch"] = epoch
+        meta["batch"] = batch
+        meta["python_rng_state"] = random.getstate()
+        meta["numpy_rng_state"] = np.random.get_state()
+        meta_file_path = file_stem + self.meta_file_ext
+        with open(meta_file_path + ".tmp", "wb") as f:
+            pickle.dump(meta, f, protocol=pickle.HIGHEST_PROTOCOL)
+        replace_file(
+            src_file_path=(meta_file_path + ".tmp"),
+            dst_file_path=meta_file_path)
+        logging.info('Checkpoint is saved: {}'.format(meta_file_path))
+
+        self.checkpoint_file_stems.append(file_stem)
+        if len(self.checkpoint_file_stems) > self.checkpoint_file_count:
+            removed_checkpoint_file_stem = self.checkpoint_file_stems[0]
+            for ext in (self.meta_file_ext,) + tuple(self.checkpoint_file_exts):
+                removed_checkpoint_file_path = removed_checkpoint_file_stem + ext
+                if os.path.exists(removed_checkpoint_file_path):
+                    os.remove(removed_checkpoint_file_path)
+            del self.checkpoint_file_stems[0]
+
+        self.last_save_time = time.time()
+
+
+def load_step_checkpoint_meta(file_path):
+    """
+    Load the meta file of a step checkpoint.
+
+    Parameters:
+    ----------
+    file_path : str
+        Path to the meta file.
+
+    Returns
+    -------
+    tuple of str and dict
+        Stem of the checkpoint file paths and the meta data.
+    """
+    assert file_path.endswith(StepCheckpointer.meta_file_ext)
+    with open(file_path, "rb") as f:
+        meta = pickle.load(f)
+    file_stem = file_path[:-len(StepCheckpointer.meta_file_ext)]
+    return file_stem, meta
+
+
+def restore_rng_states(meta):
+    """
+    Restore states of Python/NumPy random number generators from the meta data of a step checkpoint.
+
+    Parameters:
+    ----------
+    meta : dict
+        Meta data of a step checkpoint.
+    """
+    random.setstate(meta["python_rng_state"])
+    np.random.set_state(meta["numpy_rng_state"])
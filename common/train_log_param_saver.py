@@ -1,5 +1,12 @@
 import os
 import shutil
+import atexit
+import threading
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+from .file_utils import replace_file
 
 
 class TrainLogParamSaver(object):
@@ -29,6 +36,11 @@ class TrainLogParamSaver(object):
         count of the best checkpoint files
     checkpoint_file_save_callback : function or None
         Callback for real saving of checkpoint file
+    checkpoint_file_snapshot_callback : function or None
+        Callback for copying of checkpoint data into host memory (for asynchronous saving)
+    checkpoint_file_write_callback : function or None
+        Callback for writing of checkpoint data from host memory (for asynchronous saving)
+        if both snapshot and write callbacks are set then checkpoint files are written by a background thread
     checkpoint_file_exts : tuple of str
         List of checkpoint file extensions
     save_interval : int
@@ -56,6 +68,8 @@ class TrainLogParamSaver(object):
                  last_checkpoint_file_count=2,
                  best_checkpoint_file_count=2,
                  checkpoint_file_save_callback=None,
+                 checkpoint_file_snapshot_callback=None,
+                 checkpoint_file_write_callback=None,
                  checkpoint_file_exts=('.params',),
                  save_interval=1,
                  num_epochs=-1,
@@ -147,7 +161,19 @@ class TrainLogParamSaver(object):
         self.last_checkpoint_params_file_stems = []
         self.best_checkpoint_params_file_stems = []
 
-        self.can_save = (self.checkpoint_file_save_callback is not None)
+        self.checkpoint_file_snapshot_callback = checkpoint_file_snapshot_callback
+        self.checkpoint_file_write_callback = checkpoint_file_write_callback
+        self.async_save = ((self.checkpoint_file_snapshot_callback is not None) and
+                           (self.checkpoint_file_write_callback is not None))
+        if self.async_save:
+            self.write_queue = queue.Queue()
+            self.write_error = None
+            self.write_thread = threading.Thread(target=self._write_worker)
+            self.write_thread.daemon = True
+            self.write_thread.start()
+            atexit.register(self.flush)
+
+        self.can_save = (self.checkpoint_file_save_callback is not None) or self.async_save
 
     def __del__(self):
         """
@@ -167,15 +193,11 @@ class TrainLogParamSaver(object):
             last_checkpoint_params_file_stem = None
             if (epoch1 % self.save_interval == 0) or (epoch1 == self.num_epochs):
                 last_checkpoint_params_file_stem = self._get_last_checkpoint_params_file_stem(epoch1, curr_acc)
-                self.checkpoint_file_save_callback(last_checkpoint_params_file_stem, **kwargs)
+                self._save_checkpoint(last_checkpoint_params_file_stem, **kwargs)
 
                 self.last_checkpoint_params_file_stems.append(last_checkpoint_params_file_stem)
                 if len(self.last_checkpoint_params_file_stems) > self.last_checkpoint_file_count:
-                    removed_checkpoint_file_stem = self.last_checkpoint_params_file_stems[0]
-                    for ext in self.checkpoint_file_exts:
-                        removed_checkpoint_file_path = removed_checkpoint_file_stem + ext
-                        if os.path.exists(removed_checkpoint_file_path):
-                            os.remove(removed_checkpoint_file_path)
+                    self._run(self._remove_checkpoint, self.last_checkpoint_params_file_stems[0])
                     del self.last_checkpoint_params_file_stems[0]
 
             if (self.best_eval_metric_value is None) or (curr_acc < self.best_eval_metric_value):
@@ -184,23 +206,13 @@ class TrainLogParamSaver(object):
                 best_checkpoint_params_file_stem = self._get_best_checkpoint_params_file_stem(epoch1, curr_acc)
 
                 if last_checkpoint_params_file_stem is not None:
-                    for ext in self.checkpoint_file_exts:
-                        last_checkpoint_params_file_path = last_checkpoint_params_file_stem + ext
-                        best_checkpoint_params_file_path = best_checkpoint_params_file_stem + ext
-                        assert (os.path.exists(last_checkpoint_params_file_path))
-                        shutil.copy(
-                            src=last_checkpoint_params_file_path,
-                            dst=best_checkpoint_params_file_path)
+                    self._run(self._link_checkpoint, last_checkpoint_params_file_stem, best_checkpoint_params_file_stem)
                 else:
-                    self.checkpoint_file_save_callback(best_checkpoint_params_file_stem, **kwargs)
+                    self._save_checkpoint(best_checkpoint_params_file_stem, **kwargs)
 
                 self.best_checkpoint_params_file_stems.append(best_checkpoint_params_file_stem)
                 if len(self.best_checkpoint_params_file_stems) > self.best_checkpoint_file_count:
-                    removed_checkpoint_file_stem = self.best_checkpoint_params_file_stems[0]
-                    for ext in self.checkpoint_file_exts:
-                        removed_checkpoint_file_path = removed_checkpoint_file_stem + ext
-                        if os.path.exists(removed_checkpoint_file_path):
-                            os.remove(removed_checkpoint_file_path)
+                    self._run(self._remove_checkpoint, self.best_checkpoint_params_file_stems[0])
                     del self.best_checkpoint_params_file_stems[0]
 
                 if self.best_map_log_file is not None:
@@ -213,6 +225,81 @@ class TrainLogParamSaver(object):
             self.score_log_file.write(score_log_file_row)
             self.score_log_file.flush()
 
+    def flush(self):
+        """
+        Wait until all pending checkpoint files are written (in asynchronous mode).
+        """
+        if self.async_save:
+            self.write_queue.join()
+            self._check_write_error()
+
+    def _check_write_error(self):
+        if self.write_error is not None:
+            write_error = self.write_error
+            self.write_error = None
+            raise write_error
+
+    def _write_worker(self):
+        while True:
+            func, args = self.write_queue.get()
+            try:
+                if self.write_error is None:
+                    func(*args)
+            except Exception as e:
+                self.write_error = e
+            finally:
+                self.write_queue.task_done()
+
+    def _run(self, func, *args):
+        """
+        Run a file operation (in order with checkpoint writing in asynchronous mode).
+        """
+        if self.async_save:
+            self._check_write_error()
+            self.write_queue.put((func, args))
+        else:
+            func(*args)
+
+    def _save_checkpoint(self, file_stem, **kwargs):
+        if self.async_save:
+            # Only one snapshot is kept in host memory:
+            self.flush()
+            snapshot = self.checkpoint_file_snapshot_callback(**kwargs)
+            self._run(self._write_checkpoint, file_stem, snapshot)
+        else:
+            self.checkpoint_file_save_callback(file_stem, **kwargs)
+
+    def _write_checkpoint(self, file_stem, snapshot):
+        tmp_file_stem = file_stem + ".tmp"
+        self.checkpoint_file_write_callback(tmp_file_stem, **snapshot)
+        for ext in self.checkpoint_file_exts:
+            replace_file(
+                src_file_path=(tmp_file_stem + ext),
+                dst_file_path=(file_stem + ext))
+
+    def _remove_checkpoint(self, file_stem):
+        for ext in self.checkpoint_file_exts:
+            file_path = file_stem + ext
+            if os.path.exists(file_path):
+                os.remove(file_path)
+
+    def _link_checkpoint(self, src_file_stem, dst_file_stem):
+        """
+        Make a checkpoint available under another name (by hardlinks if possible, otherwise by copying).
+        """
+        for ext in self.checkpoint_file_exts:
+            src_file_path = src_file_stem + ext
+            dst_file_path = dst_file_stem + ext
+            assert (os.path.exists(src_file_path))
+            if os.path.exists(dst_file_path):
+                os.remove(dst_file_path)
+            try:
+                os.link(src_file_path, dst_file_path)
+            except OSError:
+                shutil.copy(
+                    src=src_file_path,
+                    dst=dst_file_path)
+
     @staticmethod
     def _create_checkpoint_file_path_full_prefix(checkpoint_dir_path,
                                                  checkpoint_file_name_prefix,
@@ -0,0 +1,180 @@
+"""
+    On-disk cache of preprocessed (resized and center-cropped) validation images. Crops are stored as uint8 HWC arrays in
+    memory-mappable shards, so repeated evaluation streams them without decoding and resizing JPEGs. Normalization is
+    applied on the fly by the framework-specific loaders.
+"""
+
+__all__ = ['ValCropCache', 'get_val_crop_cache_dir_path', 'is_val_crop_cache_ready', 'write_val_crop_cache']
+
+import os
+import json
+import logging
+import numpy as np
+from .file_utils import replace_file
+
+_meta_file_name = 'meta.json'
+_labels_file_name = 'labels.npy'
+_shard_file_name_template = 'shard_{:05d}.npy'
+
+
+def get_val_crop_cache_dir_path(cache_dir_path,
+                                tag,
+                                input_image_size,
+                                resize_value):
+    """
+    Get the path to the cache directory for a preprocessing configuration.
+
+    Parameters:
+    ----------
+    cache_dir_path : str
+        Root directory for caches.
+    tag : str
+        Tag of the resize implementation (caches made by different frameworks aren't interchangeable).
+    input_image_size : tuple of 2 int
+        Spatial size of the center crop.
+    resize_value : int
+        Size of the shorter side after resizing.
+
+    Returns
+    -------
+    str
+        Path to the cache directory.
+    """
+    return os.path.join(
+        os.path.expanduser(cache_dir_path),
+        '{}_{}x{}_{}'.format(tag, input_image_size[0], input_image_size[1], resize_value))
+
+
+def is_val_crop_cache_ready(cache_dir_path):
+    """
+    Check whether the cache is completely written.
+
+    Parameters:
+    ----------
+    cache_dir_path : str
+        Path to the cache directory.
+
+    Returns
+    -------
+    bool
+        Whether the cache is ready.
+    """
+    return os.path.exists(os.path.join(cache_dir_path, _meta_file_name))
+
+
+def write_val_crop_cache(cache_dir_path,
+                         batches,
+                         num_samples,
+                         shard_size=2048):
+    """
+    Write preprocessed images into the cache. The meta file is written last, so an interrupted cache isn't used.
+
+    Parameters:
+    ----------
+    cache_dir_path : str
+        Path to the cache directory.
+    batches : iterable of tuple of (np.array, np.array)
+        Batches of uint8 images (NHWC) and labels.
+    num_samples : int
+        Number of images.
+    shard_size : int, default 2048
+        Number of images in a shard.
+    """
+    if not os.path.exists(cache_dir_path):
+        os.makedirs(cache_dir_path)
+    logging.info('Writing validation crop cache: {}'.format(cache_dir_path))
+
+    def save_shard(shard_index, shard):
+        shard_file_path = os.path.join(cache_dir_path, _shard_file_name_template.format(shard_index))
+        tmp_file_path = shard_file_path + '.tmp.npy'
+        np.save(tmp_file_path, shard)
+        replace_file(
+            src_file_path=tmp_file_path,
+            dst_file_path=shard_file_path)
+
+    labels = np.zeros((num_samples,), dtype=np.int32)
+    shard = None
+    shard_pos = 0
+    shard_index = 0
+    pos = 0
+    for data, label in batches:
+        assert (data.dtype == np.uint8) and (data.ndim == 4)
+        labels[pos:(pos + len(label))] = label
+        pos += len(label)
+        batch_pos = 0
+        while batch_pos < len(data):
+            if shard is None:
+                shard = np.empty((min(shard_size, num_samples - shard_index * shard_size),) + data.shape[1:],
+                                 dtype=np.uint8)
+                shard_pos = 0
+            count = min(len(shard) - shard_pos, len(data) - batch_pos)
+            shard[shard_pos:(shard_pos + count)] = data[batch_pos:(batch_pos + count)]
+            shard_pos += count
+            batch_pos += count
+            if shard_pos == len(shard):
+                save_shard(shard_index, shard)
+                shard = None
+                shard_index += 1
+    assert (pos == num_samples) and (shard is None)
+
+    np.save(os.path.join(cache_dir_path, _labels_file_name), labels)
+    with open(os.path.join(cache_dir_path, _meta_file_name), 'w') as f:
+        json.dump({
+            'num_samples': num_samples,
+            'shard_size': shard_size,
+            'num_shards': shard_index}, f)
+
+
+class ValCropCache(object):
+    """
+    Memory-mapped cache of preprocessed validation images.
+
+    Parameters:
+    ----------
+    cache_dir_path : str
+        Path to the cache directory.
+    """
+    def __init__(self,
+                 cache_dir_path):
+        super(ValCropCache, self).__init__()
+        with open(os.path.join(cache_dir_path, _meta_file_name), 'r') as f:
+            meta = json.load(f)
+        self.num_samples = meta['num_samples']
+        self.shard_size = meta['shard_size']
+        self.shards = [np.load(os.path.join(cache_dir_path, _shard_file_name_template.format(i)), mmap_mode='r')
+                       for i in range(meta['num_shards'])]
+        self.labels = np.load(os.path.join(cache_dir_path, _labels_file_name))
+
+    def __len__(self):
+        return self.num_samples
+
+    def __getitem__(self, index):
+        shard_index, shard_pos = divmod(index, self.shard_size)
+        return self.shards[shard_index][shard_pos], self.labels[index]
+
+    def get_batches(self, batch_size):
+        """
+        Iterate over the cache by batches.
+
+        Parameters:
+        ----------
+        batch_size : int
+            Batch size.
+
+        Returns
+        -------
+        generator of tuple of (np.array, np.array)
+            Batches of uint8 images (NHWC) and labels.
+        """
+        for begin in range(0, self.num_samples, batch_size):
+            end = min(begin + batch_size, self.num_samples)
+            first_shard, first_pos = divmod(begin, self.shard_size)
+            last_shard, last_pos = divmod(end - 1, self.shard_size)
+            if first_shard == last_shard:
+                data = self.shards[first_shard][first_pos:(last_pos + 1)]
+            else:
+                data = np.concatenate(
+                    [self.shards[first_shard][first_pos:]] +
+                    self.shards[(first_shard + 1):last_shard] +
+                    [self.shards[last_shard][:(last_pos + 1)]])
+            yield data, self.labels[begin:end]
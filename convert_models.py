@@ -6,6 +6,7 @@ import numpy as np
 import mxnet as mx
 
 from common.logger_utils import initialize_logging
+from common.mmap_weights import is_mmap_weights_file
 
 
 def parse_args():
@@ -40,7 +41,7 @@ def parse_args():
         '--dst-params',
         type=str,
         default='',
-        help='destination model parameter file path')
+        help='destination model parameter file path (the memory-mappable format is used for .mmap extension)')
     parser.add_argument(
         '--remove-module',
         action='store_true',
@@ -259,6 +260,27 @@ def prepare_dst_model(dst_fwk,
     return dst_params, dst_param_keys, dst_net
 
 
+def save_gl_params(dst_net,
+                   dst_params_file_path):
+    if is_mmap_weights_file(dst_params_file_path):
+        from gluon.utils import save_mmap_params
+        save_mmap_params(dst_net, dst_params_file_path)
+    else:
+        dst_net.save_parameters(dst_params_file_path)
+
+
+def save_pt_params(dst_params,
+                   dst_params_file_path):
+    if is_mmap_weights_file(dst_params_file_path):
+        from pytorch.utils import save_mmap_state_dict
+        save_mmap_state_dict(dst_params, dst_params_file_path)
+    else:
+        import torch
+        torch.save(
+            obj=dst_params,
+            f=dst_params_file_path)
+
+
 def convert_mx2gl(dst_net,
                   dst_params_file_path,
                   dst_params,
@@ -369,7 +391,7 @@ def convert_mx2gl(dst_net,
             print('param={}'.format(param))
             param.initialize(ctx=ctx)
 
-        dst_net.save_parameters(dst_params_file_path)
+        save_gl_params(dst_net, dst_params_file_path)
 
         return
 
@@ -461,7 +483,7 @@ def convert_mx2gl(dst_net,
         print('param={}'.format(param))
         param.initialize(ctx=ctx)
 
-    dst_net.save_parameters(dst_params_file_path)
+    save_gl_params(dst_net, dst_params_file_path)
 
 
 def convert_gl2ch(dst_net,
@@ -599,7 +621,7 @@ def convert_gl2gl(dst_net,
                 'dst_key.suff != src_key.suff, src_key={}, dst_key={}, src_shape={}, dst_shape={}'.format(
                     src_key, dst_key, src_params[src_key].shape, dst_params[dst_key].shape))
         dst_params[dst_key]._load_init(src_params[src_key]._data[0], ctx)
-    dst_net.save_parameters(dst_params_file_path)
+    save_gl_params(dst_net, dst_params_file_path)
 
 
 def convert_gl2ke(dst_net,
@@ -811,9 +833,7 @@ def convert_pt2pt(dst_params_file_path,
                     src_key, dst_key, tuple(src_params[src_key].size()), tuple(dst_params[dst_key].size()))
             assert (dst_key.split('.')[-1] == src_key.split('.')[-1])
             dst_params[dst_key] = torch.from_numpy(src_params[src_key].numpy())
-    torch.save(
-        obj=dst_params,
-        f=dst_params_file_path)
+    save_pt_params(dst_params, dst_params_file_path)
 
 
 def convert_gl2pt(dst_params_file_path,
@@ -825,9 +845,7 @@ def convert_gl2pt(dst_params_file_path,
     for i, (src_key, dst_key) in enumerate(zip(src_param_keys, dst_param_keys)):
         assert (tuple(dst_params[dst_key].size()) == src_params[src_key].shape)
         dst_params[dst_key] = torch.from_numpy(src_params[src_key]._data[0].asnumpy())
-    torch.save(
-        obj=dst_params,
-        f=dst_params_file_path)
+    save_pt_params(dst_params, dst_params_file_path)
 
 
 def convert_pt2gl(dst_net,
@@ -842,7 +860,7 @@ def convert_pt2gl(dst_net,
             "src_key={}, dst_key={}, src_shape={}, dst_shape={}".format(
                 src_key, dst_key, tuple(src_params[src_key].size()), dst_params[dst_key].shape)
         dst_params[dst_key]._load_init(mx.nd.array(src_params[src_key].numpy(), ctx), ctx)
-    dst_net.save_parameters(dst_params_file_path)
+    save_gl_params(dst_net, dst_params_file_path)
 
 
 def convert_tf2tf(dst_params_file_path,
@@ -940,7 +958,7 @@ def convert_tf2gl(dst_net,
                 src_key, dst_key, dst_weight.shape, dst_params[dst_key].shape)
         dst_params[dst_key]._load_init(mx.nd.array(dst_weight, ctx), ctx)
 
-    dst_net.save_parameters(dst_params_file_path)
+    save_gl_params(dst_net, dst_params_file_path)
 
 
 def main():
@@ -1,3 +1,4 @@
+import os
 import math
 import argparse
 import time
@@ -11,11 +12,12 @@ from chainercv.utils import apply_to_iterator
 from chainercv.utils import ProgressHook
 
 from common.logger_utils import initialize_logging
+from common.multi_model_eval import parse_model_specs, group_prepared_models, write_errors_csv
 from chainer_.top_k_accuracy import top_k_accuracy
 from chainer_.utils import prepare_model
 from chainer_.imagenet1k import add_dataset_parser_arguments
 from chainer_.imagenet1k import get_val_data_iterator
-from chainer_.imagenet1k import ImagenetPredictor
+from chainer_.imagenet1k import ImagenetPredictor, ImagenetMultiPredictor
 
 
 def parse_args():
@@ -28,8 +30,22 @@ def parse_args():
     parser.add_argument(
         '--model',
         type=str,
-        required=True,
         help='type of model to use. see model_provider for options.')
+    parser.add_argument(
+        '--models',
+        type=str,
+        default='',
+        help='list of models for batched evaluation (each item is `name` or `name:resize_inv_factor`)')
+    parser.add_argument(
+        '--models-per-pass',
+        type=int,
+        default=8,
+        help='maximal number of simultaneously loaded models (and models evaluated on a single pass over the data)')
+    parser.add_argument(
+        '--errors-csv',
+        type=str,
+        default='errors.csv',
+        help='filename of CSV with per-model errors (for batched evaluation)')
     parser.add_argument(
         '--use-pretrained',
         action='store_true',
@@ -81,6 +97,7 @@ def parse_args():
         default='cupy-cuda92, chainer, chainercv',
         help='list of pip packages for logging')
     args = parser.parse_args()
+    assert (args.model or args.models)
     return args
 
 
@@ -141,6 +158,69 @@ def test(net,
         time.time() - tic))
 
 
+def test_multi(args,
+               num_gpus):
+    def prepare_net(model_name):
+        return prepare_model(
+            model_name=model_name,
+            use_pretrained=True,
+            pretrained_model_file_path="")
+
+    def get_in_size(net):
+        return net.in_size if hasattr(net, 'in_size') else (args.input_size, args.input_size)
+
+    model_specs = parse_model_specs(
+        models=args.models,
+        default_resize_inv_factor=args.resize_inv_factor)
+    groups = group_prepared_models(
+        model_specs=model_specs,
+        prepare_net=prepare_net,
+        get_in_size=get_in_size,
+        max_group_size=args.models_per_pass)
+
+    val_iterator, val_dataset_len = get_val_data_iterator(
+        data_dir=args.data_dir,
+        batch_size=args.batch_size,
+        num_workers=args.num_workers,
+        num_classes=args.num_classes)
+
+    rows = []
+    for input_image_size, resize_inv_factor, model_names, nets in groups:
+        logging.info('Evaluating models {} (input size: {}, resize inverse factor: {})'.format(
+            model_names, input_image_size, resize_inv_factor))
+        tic = time.time()
+        predictor = ImagenetMultiPredictor(
+            base_models=nets,
+            scale_size=int(math.ceil(float(input_image_size[0]) / resize_inv_factor)),
+            crop_size=input_image_size)
+        if num_gpus > 0:
+            predictor.to_gpu()
+
+        val_iterator.reset()
+        top1_counts = np.zeros((len(model_names),))
+        top5_counts = np.zeros((len(model_names),))
+        for batch in val_iterator:
+            imgs, labels = zip(*batch)
+            t = np.array(labels)
+            for i, y in enumerate(predictor.predict(imgs)):
+                top1_counts[i] += float(F.accuracy(y=y, t=t).data) * len(t)
+                top5_counts[i] += float(top_k_accuracy(y=y, t=t, k=5).data) * len(t)
+        logging.info('Time cost: {:.4f} sec'.format(
+            time.time() - tic))
+
+        for model_name, top1_count, top5_count in zip(model_names, top1_counts, top5_counts):
+            err_top1_val = 1.0 - top1_count / val_dataset_len
+            err_top5_val = 1.0 - top5_count / val_dataset_len
+            logging.info('Test ({}): err-top1={top1:.4f}\terr-top5={top5:.4f}'.format(
+                model_name, top1=err_top1_val, top5=err_top5_val))
+            rows.append((model_name, input_image_size, resize_inv_factor, err_top1_val, err_top5_val))
+        del predictor, nets
+
+    write_errors_csv(
+        file_path=os.path.join(args.save_dir, args.errors_csv),
+        rows=rows)
+
+
 def main():
     args = parse_args()
 
@@ -157,6 +237,12 @@ def main():
     if num_gpus > 0:
         cuda.get_device(0).use()
 
+    if args.models:
+        test_multi(
+            args=args,
+            num_gpus=num_gpus)
+        return
+
     net = prepare_model(
         model_name=args.model,
         use_pretrained=args.use_pretrained,
@@ -1,3 +1,4 @@
+import os
 import argparse
 import time
 import logging
@@ -5,8 +6,10 @@ import logging
 import mxnet as mx
 
 from common.logger_utils import initialize_logging
-from gluon.utils import prepare_mx_context, prepare_model, calc_net_weight_count, validate
+from common.multi_model_eval import parse_model_specs, group_prepared_models, write_errors_csv
+from gluon.utils import prepare_mx_context, prepare_model, calc_net_weight_count, validate, validate_multi
 from gluon.model_stats import measure_model
+from gluon.quantization import load_calib_batches, quantize_model, export_quantized_model, calc_net_throughput
 from gluon.imagenet1k import add_dataset_parser_arguments
 from gluon.imagenet1k import get_batch_fn
 from gluon.imagenet1k import get_val_data_source
@@ -22,8 +25,22 @@ def parse_args():
     parser.add_argument(
         '--model',
         type=str,
-        required=True,
         help='type of model to use. see model_provider for options.')
+    parser.add_argument(
+        '--models',
+        type=str,
+        default='',
+        help='list of models for batched evaluation (each item is `name` or `name:resize_inv_factor`)')
+    parser.add_argument(
+        '--models-per-pass',
+        type=int,
+        default=8,
+        help='maximal number of simultaneously loaded models (and models evaluated on a single pass over the data)')
+    parser.add_argument(
+        '--errors-csv',
+        type=str,
+        default='errors.csv',
+        help='filename of CSV with per-model errors (for batched evaluation)')
     parser.add_argument(
         '--use-pretrained',
         action='store_true',
@@ -48,6 +65,30 @@ def parse_args():
         dest='calc_flops_only',
         action='store_true',
         help='calculate FLOPs without quality estimation')
+    parser.add_argument(
+        '--fuse-bn',
+        dest='fuse_bn',
+        action='store_true',
+        help='fold BatchNorm layers into convolutions for inference')
+    parser.add_argument(
+        '--int8',
+        action='store_true',
+        help='quantize the model into int8 (on CPU) and compare it with the float32 one')
+    parser.add_argument(
+        '--num-calib-batches',
+        type=int,
+        default=10,
+        help='number of validation batches for int8 calibration and throughput measurement')
+    parser.add_argument(
+        '--int8-export-prefix',
+        type=str,
+        default='',
+        help='path prefix for exporting the int8 model (if not empty)')
+    parser.add_argument(
+        '--symbol-cache-dir',
+        type=str,
+        default='',
+        help='directory of exported (pre-hybridized) models for fast startup (disabled if empty)')
 
     parser.add_argument(
         '--num-gpus',
@@ -90,6 +131,7 @@ def parse_args():
         default='mxnet-cu92',
         help='list of pip packages for logging')
     args = parser.parse_args()
+    assert (args.model or args.models)
     return args
 
 
@@ -143,6 +185,119 @@ def test(net,
             macs=num_macs, macs_m=num_macs / 1e6))
 
 
+def test_int8(net,
+              val_data,
+              batch_fn,
+              data_source_needs_reset,
+              dtype,
+              ctx,
+              num_calib_batches,
+              export_file_path_prefix=""):
+    calib_batches = load_calib_batches(
+        val_data=val_data,
+        batch_fn=batch_fn,
+        data_source_needs_reset=data_source_needs_reset,
+        num_batches=num_calib_batches,
+        dtype=dtype,
+        ctx=ctx[0])
+
+    results = []
+    for precision in ('fp32', 'int8'):
+        if precision == 'int8':
+            tic = time.time()
+            net = quantize_model(
+                net=net,
+                calib_batches=calib_batches,
+                ctx=ctx[0])
+            logging.info('Quantization time cost: {:.4f} sec'.format(
+                time.time() - tic))
+        err_top1_val, err_top5_val = validate(
+            acc_top1=mx.metric.Accuracy(),
+            acc_top5=mx.metric.TopKAccuracy(5),
+            net=net,
+            val_data=val_data,
+            batch_fn=batch_fn,
+            data_source_needs_reset=data_source_needs_reset,
+            dtype=dtype,
+            ctx=ctx)
+        speed = calc_net_throughput(
+            net=net,
+            batches=calib_batches)
+        logging.info('Test ({}): err-top1={top1:.4f}\terr-top5={top5:.4f}\tspeed={speed:.2f} samples/sec'.format(
+            precision, top1=err_top1_val, top5=err_top5_val, speed=speed))
+        results.append((err_top1_val, err_top5_val, speed))
+    logging.info('Int8 vs fp32: err-top1 delta={top1:+.4f}\terr-top5 delta={top5:+.4f}\tspeedup={speedup:.2f}x'.format(
+        top1=(results[1][0] - results[0][0]),
+        top5=(results[1][1] - results[0][1]),
+        speedup=(results[1][2] / results[0][2])))
+
+    if export_file_path_prefix:
+        export_quantized_model(
+            qnet=net,
+            file_path_prefix=export_file_path_prefix)
+
+
+def test_multi(args,
+               ctx,
+               batch_size):
+    def prepare_net(model_name):
+        return prepare_model(
+            model_name=model_name,
+            use_pretrained=True,
+            pretrained_model_file_path="",
+            dtype=args.dtype,
+            tune_layers="",
+            classes=args.num_classes,
+            in_channels=args.in_channels,
+            fuse_bn=args.fuse_bn,
+            ctx=ctx,
+            symbol_cache_dir=args.symbol_cache_dir,
+            input_image_size=(args.input_size, args.input_size))
+
+    def get_in_size(net):
+        return net.in_size if hasattr(net, 'in_size') else (args.input_size, args.input_size)
+
+    model_specs = parse_model_specs(
+        models=args.models,
+        default_resize_inv_factor=args.resize_inv_factor)
+    groups = group_prepared_models(
+        model_specs=model_specs,
+        prepare_net=prepare_net,
+        get_in_size=get_in_size,
+        max_group_size=args.models_per_pass)
+    batch_fn = get_batch_fn(dataset_args=args)
+
+    rows = []
+    for input_image_size, resize_inv_factor, model_names, nets in groups:
+        logging.info('Evaluating models {} (input size: {}, resize inverse factor: {})'.format(
+            model_names, input_image_size, resize_inv_factor))
+        val_data = get_val_data_source(
+            dataset_args=args,
+            batch_size=batch_size,
+            num_workers=args.num_workers,
+            input_image_size=input_image_size,
+            resize_inv_factor=resize_inv_factor)
+        tic = time.time()
+        errs = validate_multi(
+            nets=nets,
+            val_data=val_data,
+            batch_fn=batch_fn,
+            data_source_needs_reset=args.use_rec,
+            dtype=args.dtype,
+            ctx=ctx)
+        logging.info('Time cost: {:.4f} sec'.format(
+            time.time() - tic))
+        for model_name, (err_top1_val, err_top5_val) in zip(model_names, errs):
+            logging.info('Test ({}): err-top1={top1:.4f}\terr-top5={top5:.4f}'.format(
+                model_name, top1=err_top1_val, top5=err_top5_val))
+            rows.append((model_name, input_image_size, resize_inv_factor, err_top1_val, err_top5_val))
+        del nets
+
+    write_errors_csv(
+        file_path=os.path.join(args.save_dir, args.errors_csv),
+        rows=rows)
+
+
 def main():
     args = parse_args()
 
@@ -157,6 +312,13 @@ def main():
         num_gpus=args.num_gpus,
         batch_size=args.batch_size)
 
+    if args.models:
+        test_multi(
+            args=args,
+            ctx=ctx,
+            batch_size=batch_size)
+        return
+
     net = prepare_model(
         model_name=args.model,
         use_pretrained=args.use_pretrained,
@@ -166,7 +328,10 @@ def main():
         classes=args.num_classes,
         in_channels=args.in_channels,
         do_hybridize=(not args.calc_flops),
-        ctx=ctx)
+        fuse_bn=args.fuse_bn,
+        ctx=ctx,
+        symbol_cache_dir=(args.symbol_cache_dir if not args.int8 else ''),
+        input_image_size=(args.input_size, args.input_size))
     input_image_size = net.in_size if hasattr(net, 'in_size') else (args.input_size, args.input_size)
 
     val_data = get_val_data_source(
@@ -178,6 +343,18 @@ def main():
     batch_fn = get_batch_fn(dataset_args=args)
 
     assert (args.use_pretrained or args.resume.strip() or args.calc_flops_only)
+    if args.int8:
+        assert (args.num_gpus == 0) and (args.dtype == 'float32')
+        test_int8(
+            net=net,
+            val_data=val_data,
+            batch_fn=batch_fn,
+            data_source_needs_reset=args.use_rec,
+            dtype=args.dtype,
+            ctx=ctx,
+            num_calib_batches=args.num_calib_batches,
+            export_file_path_prefix=args.int8_export_prefix)
+        return
     test(
         net=net,
         val_data=val_data,
@@ -1,10 +1,13 @@
+import os
 import argparse
 import time
 import logging
 
+import numpy as np
 import keras
 
 from common.logger_utils import initialize_logging
+from common.multi_model_eval import parse_model_specs, group_prepared_models, write_errors_csv
 from keras_.utils import prepare_ke_context, prepare_model, get_data_rec, get_data_generator, backend_agnostic_compile
 
 
@@ -36,8 +39,22 @@ def parse_args():
     parser.add_argument(
         '--model',
         type=str,
-        required=True,
         help='type of model to use. see model_provider for options.')
+    parser.add_argument(
+        '--models',
+        type=str,
+        default='',
+        help='list of models for batched evaluation (each item is `name` or `name:resize_inv_factor`)')
+    parser.add_argument(
+        '--models-per-pass',
+        type=int,
+        default=8,
+        help='maximal number of simultaneously loaded models (and models evaluated on a single pass over the data)')
+    parser.add_argument(
+        '--errors-csv',
+        type=str,
+        default='errors.csv',
+        help='filename of CSV with per-model errors (for batched evaluation)')
     parser.add_argument(
         '--use-pretrained',
         action='store_true',
@@ -105,6 +122,7 @@ def parse_args():
         default='keras, keras-mxnet, keras-applications, keras-preprocessing',
         help='list of pip packages for logging')
     args = parser.parse_args()
+    assert (args.model or args.models)
     return args
 
 
@@ -151,6 +169,73 @@ def test(net,
         time.time() - tic))
 
 
+def test_multi(args,
+               batch_size):
+    def prepare_net(model_name):
+        return prepare_model(
+            model_name=model_name,
+            use_pretrained=True,
+            pretrained_model_file_path="")
+
+    def get_in_size(net):
+        return net.in_size if hasattr(net, 'in_size') else (args.input_size, args.input_size)
+
+    keras.backend.set_learning_phase(0)
+
+    model_specs = parse_model_specs(
+        models=args.models,
+        default_resize_inv_factor=args.resize_inv_factor)
+    groups = group_prepared_models(
+        model_specs=model_specs,
+        prepare_net=prepare_net,
+        get_in_size=get_in_size,
+        max_group_size=args.models_per_pass)
+
+    rows = []
+    for input_image_size, resize_inv_factor, model_names, nets in groups:
+        logging.info('Evaluating models {} (input size: {}, resize inverse factor: {})'.format(
+            model_names, input_image_size, resize_inv_factor))
+        _, val_data = get_data_rec(
+            rec_train=args.rec_train,
+            rec_train_idx=args.rec_train_idx,
+            rec_val=args.rec_val,
+            rec_val_idx=args.rec_val_idx,
+            batch_size=batch_size,
+            num_workers=args.num_workers,
+            input_image_size=input_image_size,
+            resize_inv_factor=resize_inv_factor)
+
+        tic = time.time()
+        top1_counts = np.zeros((len(nets),))
+        top5_counts = np.zeros((len(nets),))
+        val_size = 0
+        for db in val_data:
+            num_valid = batch_size - db.pad
+            data = db.data[0].asnumpy()[:num_valid]
+            if keras.backend.image_data_format() == 'channels_last':
+                data = data.transpose((0, 2, 3, 1))
+            labels = db.label[0].asnumpy()[:num_valid].astype(np.int64)
+            for i, net in enumerate(nets):
+                top5_pred = np.argsort(-net.predict_on_batch(data), axis=1)[:, :5]
+                top1_counts[i] += (top5_pred[:, 0] == labels).sum()
+                top5_counts[i] += (top5_pred == labels[:, np.newaxis]).any(axis=1).sum()
+            val_size += num_valid
+        logging.info('Time cost: {:.4f} sec'.format(
+            time.time() - tic))
+
+        for model_name, top1_count, top5_count in zip(model_names, top1_counts, top5_counts):
+            err_top1_val = 1.0 - top1_count / val_size
+            err_top5_val = 1.0 - top5_count / val_size
+            logging.info('Test ({}): err-top1={top1:.4f}\terr-top5={top5:.4f}'.format(
+                model_name, top1=err_top1_val, top5=err_top5_val))
+            rows.append((model_name, input_image_size, resize_inv_factor, err_top1_val, err_top5_val))
+        del nets
+
+    write_errors_csv(
+        file_path=os.path.join(args.save_dir, args.errors_csv),
+        rows=rows)
+
+
 def main():
     args = parse_args()
 
@@ -165,6 +250,12 @@ def main():
         num_gpus=args.num_gpus,
         batch_size=args.batch_size)
 
+    if args.models:
+        test_multi(
+            args=args,
+            batch_size=batch_size)
+        return
+
     net = prepare_model(
         model_name=args.model,
         use_pretrained=args.use_pretrained,
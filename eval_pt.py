@@ -1,11 +1,14 @@
+import os
 import argparse
 import time
 import logging
 
 from common.logger_utils import initialize_logging
 from pytorch.model_stats import measure_model
+from pytorch.quantization import load_calib_batches, quantize_model, export_quantized_model, calc_net_throughput
 from pytorch.imagenet1k import add_dataset_parser_arguments, get_val_data_loader
-from pytorch.utils import prepare_pt_context, prepare_model, calc_net_weight_count, validate, AverageMeter
+from common.multi_model_eval import parse_model_specs, group_prepared_models, write_errors_csv
+from pytorch.utils import prepare_pt_context, prepare_model, calc_net_weight_count, validate, validate_multi, AverageMeter
 
 
 def parse_args():
@@ -18,8 +21,22 @@ def parse_args():
     parser.add_argument(
         '--model',
         type=str,
-        required=True,
         help='type of model to use. see model_provider for options.')
+    parser.add_argument(
+        '--models',
+        type=str,
+        default='',
+        help='list of models for batched evaluation (each item is `name` or `name:resize_inv_factor`)')
+    parser.add_argument(
+        '--models-per-pass',
+        type=int,
+        default=8,
+        help='maximal number of simultaneously loaded models (and models evaluated on a single pass over the data)')
+    parser.add_argument(
+        '--errors-csv',
+        type=str,
+        default='errors.csv',
+        help='filename of CSV with per-model errors (for batched evaluation)')
     parser.add_argument(
         '--use-pretrained',
         action='store_true',
@@ -39,10 +56,38 @@ def parse_args():
         dest='calc_flops_only',
         action='store_true',
         help='calculate FLOPs without quality estimation')
+    parser.add_argument(
+        '--fuse-bn',
+        dest='fuse_bn',
+        action='store_true',
+        help='fold BatchNorm layers into convolutions for inference')
+    parser.add_argument(
+        '--int8',
+        action='store_true',
+        help='quantize the model into int8 (on CPU) and compare it with the float32 one')
+    parser.add_argument(
+        '--num-calib-batches',
+        type=int,
+        default=10,
+        help='number of validation batches for int8 calibration and throughput measurement')
+    parser.add_argument(
+        '--int8-export-path',
+        type=str,
+        default='',
+        help='path for exporting the int8 model as TorchScript (if not empty)')
     parser.add_argument(
         '--remove-module',
         action='store_true',
         help='enable if stored model has module')
+    parser.add_argument(
+        '--jit',
+        action='store_true',
+        help='run the model as a TorchScript module (traced and verified against eager mode)')
+    parser.add_argument(
+        '--jit-cache-dir',
+        type=str,
+        default='',
+        help='directory of cached TorchScript modules (disabled if empty)')
 
     parser.add_argument(
         '--num-gpus',
@@ -85,6 +130,7 @@ def parse_args():
         default='',
         help='list of pip packages for logging')
     args = parser.parse_args()
+    assert (args.model or args.models)
     return args
 
 
@@ -132,6 +178,103 @@ def test(net,
             macs=num_macs, macs_m=num_macs / 1e6))
 
 
+def test_int8(net,
+              val_data,
+              num_calib_batches,
+              export_file_path=""):
+    calib_batches = load_calib_batches(
+        val_data=val_data,
+        num_batches=num_calib_batches)
+
+    results = []
+    for precision in ('fp32', 'int8'):
+        if precision == 'int8':
+            tic = time.time()
+            net = quantize_model(
+                net=net,
+                calib_batches=calib_batches)
+            logging.info('Quantization time cost: {:.4f} sec'.format(
+                time.time() - tic))
+        err_top1_val, err_top5_val = validate(
+            acc_top1=AverageMeter(),
+            acc_top5=AverageMeter(),
+            net=net,
+            val_data=val_data,
+            use_cuda=False)
+        speed = calc_net_throughput(
+            net=net,
+            batches=calib_batches)
+        logging.info('Test ({}): err-top1={top1:.4f}\terr-top5={top5:.4f}\tspeed={speed:.2f} samples/sec'.format(
+            precision, top1=err_top1_val, top5=err_top5_val, speed=speed))
+        results.append((err_top1_val, err_top5_val, speed))
+    logging.info('Int8 vs fp32: err-top1 delta={top1:+.4f}\terr-top5 delta={top5:+.4f}\tspeedup={speedup:.2f}x'.format(
+        top1=(results[1][0] - results[0][0]),
+        top5=(results[1][1] - results[0][1]),
+        speedup=(results[1][2] / results[0][2])))
+
+    if export_file_path:
+        export_quantized_model(
+            qnet=net,
+            example_batch=calib_batches[0],
+            file_path=export_file_path)
+
+
+def test_multi(args,
+               use_cuda,
+               batch_size):
+    def prepare_net(model_name):
+        return prepare_model(
+            model_name=model_name,
+            use_pretrained=True,
+            pretrained_model_file_path="",
+            use_cuda=use_cuda,
+            fuse_bn=args.fuse_bn,
+            jit=args.jit,
+            jit_cache_dir=args.jit_cache_dir,
+            input_image_size=(args.input_size, args.input_size))
+
+    def get_in_size(net):
+        return net.in_size if hasattr(net, 'in_size') else (args.input_size, args.input_size)
+
+    model_specs = parse_model_specs(
+        models=args.models,
+        default_resize_inv_factor=args.resize_inv_factor)
+    groups = group_prepared_models(
+        model_specs=model_specs,
+        prepare_net=prepare_net,
+        get_in_size=get_in_size,
+        max_group_size=args.models_per_pass)
+
+    rows = []
+    for input_image_size, resize_inv_factor, model_names, nets in groups:
+        logging.info('Evaluating models {} (input size: {}, resize inverse factor: {})'.format(
+            model_names, input_image_size, resize_inv_factor))
+        val_data = get_val_data_loader(
+            data_dir=args.data_dir,
+            batch_size=batch_size,
+            num_workers=args.num_workers,
+            input_image_size=input_image_size[0],
+            resize_inv_factor=resize_inv_factor,
+            use_cv_resize=args.use_cv_resize,
+            cache_dir=args.val_cache_dir)
+        tic = time.time()
+        errs = validate_multi(
+            nets=nets,
+            val_data=val_data,
+            use_cuda=use_cuda)
+        logging.info('Time cost: {:.4f} sec'.format(
+            time.time() - tic))
+        for model_name, (err_top1_val, err_top5_val) in zip(model_names, errs):
+            logging.info('Test ({}): err-top1={top1:.4f}\terr-top5={top5:.4f}'.format(
+                model_name, top1=err_top1_val, top5=err_top5_val))
+            rows.append((model_name, input_image_size, resize_inv_factor, err_top1_val, err_top5_val))
+        del nets
+
+    write_errors_csv(
+        file_path=os.path.join(args.save_dir, args.errors_csv),
+        rows=rows)
+
+
 def main():
     args = parse_args()
 
@@ -146,12 +289,23 @@ def main():
         num_gpus=args.num_gpus,
         batch_size=args.batch_size)
 
+    if args.models:
+        test_multi(
+            args=args,
+            use_cuda=use_cuda,
+            batch_size=batch_size)
+        return
+
     net = prepare_model(
         model_name=args.model,
         use_pretrained=args.use_pretrained,
         pretrained_model_file_path=args.resume.strip(),
         use_cuda=use_cuda,
-        remove_module=args.remove_module)
+        remove_module=args.remove_module,
+        fuse_bn=args.fuse_bn,
+        jit=(args.jit and not (args.calc_flops or args.int8)),
+        jit_cache_dir=args.jit_cache_dir,
+        input_image_size=(args.input_size, args.input_size))
     if hasattr(net, 'module'):
         input_image_size = net.module.in_size[0] if hasattr(net.module, 'in_size') else args.input_size
     else:
@@ -163,9 +317,18 @@ def main():
         num_workers=args.num_workers,
         input_image_size=input_image_size,
         resize_inv_factor=args.resize_inv_factor,
-        use_cv_resize=args.use_cv_resize)
+        use_cv_resize=args.use_cv_resize,
+        cache_dir=args.val_cache_dir)
 
     assert (args.use_pretrained or args.resume.strip() or args.calc_flops_only)
+    if args.int8:
+        assert (not use_cuda)
+        test_int8(
+            net=net,
+            val_data=val_data,
+            num_calib_batches=args.num_calib_batches,
+            export_file_path=args.int8_export_path)
+        return
     test(
         net=net,
         val_data=val_data,
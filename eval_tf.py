@@ -1,13 +1,15 @@
+import os
 import argparse
 import tqdm
 import time
 import logging
 
-from tensorpack.predict import PredictConfig, FeedfreePredictor
+from tensorpack.predict import PredictConfig, FeedfreePredictor, OfflinePredictor
 from tensorpack.utils.stats import RatioCounter
 from tensorpack.input_source import QueueInput, StagingInput
 
 from common.logger_utils import initialize_logging
+from common.multi_model_eval import parse_model_specs, group_prepared_models, write_errors_csv
 from tensorflow_.utils_tp import prepare_tf_context, prepare_model, get_data, calc_flops
 
 
@@ -29,8 +31,22 @@ def parse_args():
     parser.add_argument(
         '--model',
         type=str,
-        required=True,
         help='type of model to use. see model_provider for options')
+    parser.add_argument(
+        '--models',
+        type=str,
+        default='',
+        help='list of models for batched evaluation (each item is `name` or `name:resize_inv_factor`)')
+    parser.add_argument(
+        '--models-per-pass',
+        type=int,
+        default=8,
+        help='maximal number of simultaneously loaded models (and models evaluated on a single pass over the data)')
+    parser.add_argument(
+        '--errors-csv',
+        type=str,
+        default='errors.csv',
+        help='filename of CSV with per-model errors (for batched evaluation)')
     parser.add_argument(
         '--use-pretrained',
         action='store_true',
@@ -98,6 +114,7 @@ def parse_args():
         default='tensorflow-gpu, tensorpack',
         help='list of pip packages for logging')
     args = parser.parse_args()
+    assert (args.model or args.models)
     return args
 
 
@@ -146,6 +163,68 @@ def test(net,
         calc_flops(model=net)
 
 
+def test_multi(args,
+               batch_size):
+    def prepare_net(model_name):
+        return prepare_model(
+            model_name=model_name,
+            use_pretrained=True,
+            pretrained_model_file_path="",
+            data_format=args.data_format)
+
+    def get_in_size(net_with_inputs_desc):
+        net, _ = net_with_inputs_desc
+        return net.image_size, net.image_size
+
+    model_specs = parse_model_specs(
+        models=args.models,
+        default_resize_inv_factor=args.resize_inv_factor)
+    groups = group_prepared_models(
+        model_specs=model_specs,
+        prepare_net=prepare_net,
+        get_in_size=get_in_size,
+        max_group_size=args.models_per_pass)
+
+    rows = []
+    for input_image_size, resize_inv_factor, model_names, nets in groups:
+        logging.info('Evaluating models {} (input size: {}, resize inverse factor: {})'.format(
+            model_names, input_image_size, resize_inv_factor))
+        preds = [OfflinePredictor(PredictConfig(
+            model=net,
+            session_init=inputs_desc,
+            input_names=['input', 'label'],
+            output_names=['wrong-top1', 'wrong-top5'])) for net, inputs_desc in nets]
+        del nets
+        val_dataflow = get_data(
+            is_train=False,
+            batch_size=batch_size,
+            data_dir_path=args.data_dir,
+            input_image_size=input_image_size[0],
+            resize_inv_factor=resize_inv_factor)
+
+        tic = time.time()
+        err_top1_list = [RatioCounter() for _ in preds]
+        err_top5_list = [RatioCounter() for _ in preds]
+        val_dataflow.reset_state()
+        for images, labels in tqdm.tqdm(val_dataflow.get_data(), total=val_dataflow.size()):
+            for pred, err_top1, err_top5 in zip(preds, err_top1_list, err_top5_list):
+                err_top1_val, err_top5_val = pred(images, labels)
+                err_top1.feed(err_top1_val.sum(), err_top1_val.shape[0])
+                err_top5.feed(err_top5_val.sum(), err_top5_val.shape[0])
+        logging.info('Time cost: {:.4f} sec'.format(
+            time.time() - tic))
+
+        for model_name, err_top1, err_top5 in zip(model_names, err_top1_list, err_top5_list):
+            logging.info('Test ({}): err-top1={top1:.4f}\terr-top5={top5:.4f}'.format(
+                model_name, top1=err_top1.ratio, top5=err_top5.ratio))
+            rows.append((model_name, input_image_size, resize_inv_factor, err_top1.ratio, err_top5.ratio))
+        del preds
+
+    write_errors_csv(
+        file_path=os.path.join(args.save_dir, args.errors_csv),
+        rows=rows)
+
+
 def main():
     args = parse_args()
 
@@ -160,6 +239,12 @@ def main():
         num_gpus=args.num_gpus,
         batch_size=args.batch_size)
 
+    if args.models:
+        test_multi(
+            args=args,
+            batch_size=batch_size)
+        return
+
     net, inputs_desc = prepare_model(
         model_name=args.model,
         use_pretrained=args.use_pretrained,
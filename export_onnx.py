@@ -0,0 +1,388 @@
+"""
+    Export of models from Gluon and PyTorch zoos into ONNX (with dynamic batch size), verification of ONNX Runtime
+    outputs against the native forward, and benchmark of ONNX Runtime CPU throughput. Results (including export
+    failures) are written into a CSV table.
+"""
+
+import os
+import csv
+import time
+import shutil
+import logging
+import argparse
+import tempfile
+import numpy as np
+import onnxruntime as ort
+
+from common.logger_utils import initialize_logging
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description='Export models into ONNX, verify and benchmark them on ONNX Runtime (CPU)',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    parser.add_argument(
+        '--frameworks',
+        type=str,
+        default='gluon,pytorch',
+        help='list of source frameworks (gluon and/or pytorch)')
+    parser.add_argument(
+        '--models',
+        type=str,
+        default='',
+        help='list of models (all models of the zoo if empty)')
+    parser.add_argument(
+        '--use-pretrained',
+        action='store_true',
+        help='use pretrained weights (random ones are used otherwise)')
+    parser.add_argument(
+        '--input-size',
+        type=int,
+        default=224,
+        help='size of the input for model (if model has no `in_size` attribute)')
+    parser.add_argument(
+        '--opset',
+        type=int,
+        default=11,
+        help='ONNX opset version')
+    parser.add_argument(
+        '--rtol',
+        type=float,
+        default=1e-3,
+        help='relative tolerance for verification')
+    parser.add_argument(
+        '--atol',
+        type=float,
+        default=1e-4,
+        help='absolute tolerance for verification')
+    parser.add_argument(
+        '--batch-size',
+        type=int,
+        default=8,
+        help='batch size for benchmark')
+    parser.add_argument(
+        '--num-warmup-steps',
+        type=int,
+        default=2,
+        help='number of warm-up steps for benchmark')
+    parser.add_argument(
+        '--num-steps',
+        type=int,
+        default=10,
+        help='number of measured steps for benchmark')
+    parser.add_argument(
+        '--num-threads',
+        type=int,
+        default=0,
+        help='number of ONNX Runtime intra-op threads (0 means default)')
+    parser.add_argument(
+        '--onnx-dir',
+        type=str,
+        default='',
+        help='directory for exported ONNX files (they are removed if empty)')
+    parser.add_argument(
+        '--report-csv',
+        type=str,
+        default='onnx_report.csv',
+        help='filename of CSV with per-model results')
+
+    parser.add_argument(
+        '--save-dir',
+        type=str,
+        default='',
+        help='directory of saved log-files')
+    parser.add_argument(
+        '--logging-file-name',
+        type=str,
+        default='export_onnx.log',
+        help='filename of log')
+    parser.add_argument(
+        '--log-packages',
+        type=str,
+        default='mxnet, torch, onnx, onnxruntime',
+        help='list of python packages for logging')
+    parser.add_argument(
+        '--log-pip-packages',
+        type=str,
+        default='mxnet-cu92',
+        help='list of pip packages for logging')
+    args = parser.parse_args()
+    return args
+
+
+def get_model_names(framework):
+    if framework == 'gluon':
+        from gluon.gluoncv2.model_provider import _models
+    elif framework == 'pytorch':
+        from pytorch.pytorchcv.model_provider import _models
+    else:
+        raise Exception('Unsupported framework: {}'.format(framework))
+    return sorted(_models.keys())
+
+
+def get_input_shape(net,
+                    default_input_size):
+    in_channels = net.in_channels if hasattr(net, 'in_channels') else 3
+    in_size = net.in_size if hasattr(net, 'in_size') else (default_input_size, default_input_size)
+    return (in_channels,) + tuple(in_size)
+
+
+def export_gluon_model(model_name,
+                       onnx_file_path,
+                       use_pretrained,
+                       default_input_size,
+                       opset):
+    """
+    Export a Gluon model into ONNX.
+
+    Parameters:
+    ----------
+    model_name : str
+        Name of the model.
+    onnx_file_path : str
+        Path to the ONNX file.
+    use_pretrained : bool
+        Whether to use pretrained weights.
+    default_input_size : int
+        Size of the input for model (if model has no `in_size` attribute).
+    opset : int
+        ONNX opset version.
+
+    Returns
+    -------
+    tuple of (function, tuple of int)
+        Native forward function (for NumPy arrays) and the input shape (without the batch dimension).
+    """
+    import mxnet as mx
+    from gluon.gluoncv2.model_provider import get_model
+    net = get_model(model_name, pretrained=use_pretrained)
+    if not use_pretrained:
+        net.initialize(mx.init.MSRAPrelu())
+    net.hybridize()
+    input_shape = get_input_shape(net, default_input_size)
+    mx.nd.waitall()
+    net(mx.nd.random.normal(shape=((1,) + input_shape)))
+    mx.nd.waitall()
+
+    file_prefix = os.path.splitext(onnx_file_path)[0]
+    net.export(file_prefix, epoch=0)
+    sym_file_path = file_prefix + '-symbol.json'
+    params_file_path = file_prefix + '-0000.params'
+    try:
+        if hasattr(mx, 'onnx'):
+            mx.onnx.export_model(
+                sym=sym_file_path,
+                params=params_file_path,
+                in_shapes=[(1,) + input_shape],
+                in_types=[np.float32],
+                onnx_file_path=onnx_file_path,
+                dynamic=True,
+                dynamic_input_shapes=[(None,) + input_shape],
+                opset_version=opset)
+        else:
+            # Old exporter doesn't support dynamic shapes, so the batch size is fixed:
+            mx.contrib.onnx.export_model(
+                sym=sym_file_path,
+                params=params_file_path,
+                input_shape=[(1,) + input_shape],
+                input_type=np.float32,
+                onnx_file_path=onnx_file_path)
+    finally:
+        for file_path in (sym_file_path, params_file_path):
+            if os.path.exists(file_path):
+                os.remove(file_path)
+
+    def forward(x):
+        y = net(mx.nd.array(x))
+        return [y_i.asnumpy() for y_i in (y if isinstance(y, (list, tuple)) else [y])]
+
+    return forward, input_shape
+
+
+def export_pytorch_model(model_name,
+                         onnx_file_path,
+                         use_pretrained,
+                         default_input_size,
+                         opset):
+    """
+    Export a PyTorch model into ONNX.
+
+    Parameters:
+    ----------
+    model_name : str
+        Name of the model.
+    onnx_file_path : str
+        Path to the ONNX file.
+    use_pretrained : bool
+        Whether to use pretrained weights.
+    default_input_size : int
+        Size of the input for model (if model has no `in_size` attribute).
+    opset : int
+        ONNX opset version.
+
+    Returns
+    -------
+    tuple of (function, tuple of int)
+        Native forward function (for NumPy arrays) and the input shape (without the batch dimension).
+    """
+    import torch
+    from pytorch.pytorchcv.model_provider import get_model
+    net = get_model(model_name, pretrained=use_pretrained)
+    net.eval()
+    input_shape = get_input_shape(net, default_input_size)
+    torch.onnx.export(
+        net,
+        torch.randn((1,) + input_shape),
+        onnx_file_path,
+        input_names=['data'],
+        output_names=['output'],
+        dynamic_axes={'data': {0: 'batch'}, 'output': {0: 'batch'}},
+        opset_version=opset)
+
+    def forward(x):
+        with torch.no_grad():
+            y = net(torch.from_numpy(x))
+        return [y_i.numpy() for y_i in (y if isinstance(y, (list, tuple)) else [y])]
+
+    return forward, input_shape
+
+
+def check_model(args,
+                framework,
+                model_name,
+                onnx_dir_path):
+    """
+    Export, verify and benchmark a model.
+
+    Parameters:
+    ----------
+    args : ArgumentParser
+        Main script arguments.
+    framework : str
+        Source framework.
+    model_name : str
+        Name of the model.
+    onnx_dir_path : str
+        Directory for ONNX files.
+
+    Returns
+    -------
+    tuple of (str, float or None, float or None, str)
+        Status, maximal absolute difference of outputs, throughput (samples/sec) and message.
+    """
+    onnx_file_path = os.path.join(onnx_dir_path, '{}_{}.onnx'.format(framework, model_name))
+    export_model = export_gluon_model if framework == 'gluon' else export_pytorch_model
+    try:
+        forward, input_shape = export_model(
+            model_name=model_name,
+            onnx_file_path=onnx_file_path,
+            use_pretrained=args.use_pretrained,
+            default_input_size=args.input_size,
+            opset=args.opset)
+    except Exception as e:
+        return 'export_failed', None, None, '{}: {}'.format(type(e).__name__, str(e).strip().split('\n')[0][:200])
+
+    try:
+        sess_options = ort.SessionOptions()
+        if args.num_threads > 0:
+            sess_options.intra_op_num_threads = args.num_threads
+        sess = ort.InferenceSession(onnx_file_path, sess_options, providers=['CPUExecutionProvider'])
+        input_name = sess.get_inputs()[0].name
+        dynamic_batch = not isinstance(sess.get_inputs()[0].shape[0], int)
+
+        x = np.random.normal(size=((2 if dynamic_batch else 1,) + input_shape)).astype(np.float32)
+        y_native = forward(x)
+        y_onnx = sess.run(None, {input_name: x})
+    except Exception as e:
+        return 'runtime_failed', None, None, '{}: {}'.format(type(e).__name__, str(e).strip().split('\n')[0][:200])
+
+    message = '' if dynamic_batch else 'static batch'
+    if (len(y_native) != len(y_onnx)) or any([a.shape != b.shape for a, b in zip(y_native, y_onnx)]):
+        return 'mismatch', None, None, 'output shapes: {} vs {}'.format(
+            [a.shape for a in y_native], [b.shape for b in y_onnx])
+    max_abs_diff = max([float(np.abs(a - b).max()) for a, b in zip(y_native, y_onnx)])
+    if not all([np.allclose(b, a, rtol=args.rtol, atol=args.atol) for a, b in zip(y_native, y_onnx)]):
+        return 'mismatch', max_abs_diff, None, message
+
+    batch_size = args.batch_size if dynamic_batch else 1
+    x = np.random.normal(size=((batch_size,) + input_shape)).astype(np.float32)
+    for _ in range(args.num_warmup_steps):
+        sess.run(None, {input_name: x})
+    tic = time.time()
+    for _ in range(args.num_steps):
+        sess.run(None, {input_name: x})
+    throughput = batch_size * args.num_steps / (time.time() - tic)
+
+    if not args.onnx_dir:
+        os.remove(onnx_file_path)
+    return 'ok', max_abs_diff, throughput, message
+
+
+def write_report_csv(file_path,
+                     rows):
+    """
+    Write per-model results into a CSV file.
+
+    Parameters:
+    ----------
+    file_path : str
+        Path to the CSV file.
+    rows : list of tuple of (str, str, str, float or None, float or None, str)
+        Framework, model name, status, maximal absolute difference, throughput and message for each model.
+    """
+    file_dir_path = os.path.dirname(file_path)
+    if file_dir_path and not os.path.exists(file_dir_path):
+        os.makedirs(file_dir_path)
+    with open(file_path, 'w') as f:
+        writer = csv.writer(f)
+        writer.writerow(['framework', 'model', 'status', 'max_abs_diff', 'ort_cpu_samples_per_sec', 'message'])
+        for framework, model_name, status, max_abs_diff, throughput, message in rows:
+            writer.writerow([
+                framework,
+                model_name,
+                status,
+                ('{:.3e}'.format(max_abs_diff) if max_abs_diff is not None else ''),
+                ('{:.2f}'.format(throughput) if throughput is not None else ''),
+                message])
+
+
+def main():
+    args = parse_args()
+
+    initialize_logging(
+        logging_dir_path=args.save_dir,
+        logging_file_name=args.logging_file_name,
+        script_args=args,
+        log_packages=args.log_packages,
+        log_pip_packages=args.log_pip_packages)
+
+    onnx_dir_path = args.onnx_dir if args.onnx_dir else tempfile.mkdtemp()
+    if not os.path.exists(onnx_dir_path):
+        os.makedirs(onnx_dir_path)
+
+    rows = []
+    try:
+        for framework in [s.strip() for s in args.frameworks.split(',')]:
+            model_names = [s.strip() for s in args.models.split(',')] if args.models else get_model_names(framework)
+            for model_name in model_names:
+                status, max_abs_diff, throughput, message = check_model(
+                    args=args,
+                    framework=framework,
+                    model_name=model_name,
+                    onnx_dir_path=onnx_dir_path)
+                logging.info('{} ({}): {}\tmax-abs-diff={}\tthroughput={}\t{}'.format(
+                    model_name, framework, status, max_abs_diff, throughput, message))
+                rows.append((framework, model_name, status, max_abs_diff, throughput, message))
+    finally:
+        if not args.onnx_dir:
+            shutil.rmtree(onnx_dir_path, ignore_errors=True)
+
+    write_report_csv(
+        file_path=os.path.join(args.save_dir, args.report_csv),
+        rows=rows)
+    for status in ['ok', 'mismatch', 'runtime_failed', 'export_failed']:
+        logging.info('{}: {} models'.format(status, len([row for row in rows if row[2] == status])))
+
+
+if __name__ == '__main__':
+    main()
@@ -12,6 +12,7 @@ from mxnet import gluon
 from mxnet.gluon import Block
 from mxnet.gluon.data.vision import transforms
 from mxnet.gluon.utils import download, check_sha1
+from .shm_prefetcher import SharedMemoryPrefetcher, PrefetchedBatch
 
 
 def add_dataset_parser_arguments(parser,
@@ -56,6 +57,10 @@ def add_dataset_parser_arguments(parser,
         type=int,
         default=3,
         help='number of input channels')
+    parser.add_argument(
+        '--shm-prefetch',
+        action='store_true',
+        help='load training batches via shared memory and stage next batches on devices')
 
 
 class CIFAR100Fine(gluon.data.vision.CIFAR100):
@@ -165,6 +170,8 @@ class RandomCrop(Block):
 
 
 def batch_fn(batch, ctx):
+    if isinstance(batch, PrefetchedBatch):
+        return batch.data, batch.label
     data = gluon.utils.split_and_load(batch[0], ctx_list=ctx, batch_axis=0)
     label = gluon.utils.split_and_load(batch[1], ctx_list=ctx, batch_axis=0)
     return data, label
@@ -184,7 +191,8 @@ def get_num_training_samples(dataset_name):
 def get_train_data_source(dataset_name,
                           dataset_dir,
                           batch_size,
-                          num_workers):
+                          num_workers,
+                          prefetch_ctx=None):
     jitter_param = 0.4
     lighting_param = 0.1
     mean_rgb = (0.4914, 0.4822, 0.4465)
@@ -217,6 +225,13 @@ def get_train_data_source(dataset_name,
         root=dataset_dir,
         train=True)
 
+    if prefetch_ctx is not None:
+        return SharedMemoryPrefetcher(
+            dataset=dataset.transform_first(fn=transform_train),
+            batch_size=batch_size,
+            ctx=prefetch_ctx,
+            num_workers=num_workers,
+            shuffle=True)
     return gluon.data.DataLoader(
         dataset=dataset.transform_first(fn=transform_train),
         batch_size=batch_size,
@@ -6,7 +6,7 @@
 __all__ = ['IRevNet', 'irevnet301']
 
 import os
-from mxnet import cpu
+from mxnet import cpu, autograd
 from mxnet.gluon import nn, HybridBlock
 from .common import conv3x3, pre_conv3x3_block, DualPathSequential
 
@@ -414,6 +414,66 @@ class IRevNet(HybridBlock):
         x, _ = self.features.inverse(out_bij)
         return x
 
+    def forward_backward(self, x, loss_func, label):
+        """
+        Run forward and backward passes in the memory-saving mode. Activations of invertible units aren't stored during
+        forward pass, but are reconstructed by the inverse of each unit during backward pass (starting from the output
+        of the last unit). So the memory footprint doesn't depend on the number of units, at the cost of one additional
+        forward pass through the units. Gradients of parameters are written (or added) as by `loss.backward()`.
+
+        Parameters:
+        ----------
+        x : NDArray
+            Input data.
+        loss_func : Loss
+            Loss function.
+        label : NDArray
+            Labels.
+
+        Returns
+        -------
+        tuple of 2 NDArray
+            Output of the network and loss value.
+        """
+        blocks = list(self.features._children.values())
+        units = [unit for stage in blocks[2:-3] for unit in stage._children.values()]
+
+        with autograd.pause(train_mode=True):
+            x1, x2 = blocks[1](blocks[0](x), None)
+            for unit in units:
+                x1, x2 = unit(x1, x2)
+
+        # Moving statistics of BatchNorm layers are updated again by reconstruction and recomputation of units:
+        stat_params = [p for unit in units for p in unit.collect_params(".*running_mean|.*running_var").values()]
+        stat_values = [p.data(x.context).copy() for p in stat_params]
+
+        x1.attach_grad()
+        x2.attach_grad()
+        with autograd.record():
+            y, _ = blocks[-3](x1, x2)
+            y = blocks[-1](blocks[-2](y))
+            y = self.output(y)
+            loss = loss_func(y, label)
+        loss.backward()
+
+        y1_grad, y2_grad = x1.grad, x2.grad
+        for unit in reversed(units):
+            with autograd.pause(train_mode=True):
+                x1, x2 = unit.inverse(x1, x2)
+            x1.attach_grad()
+            x2.attach_grad()
+            with autograd.record():
+                y1, y2 = unit(x1, x2)
+                # An output of a unit can be its input itself, so outputs are multiplied by head gradients:
+                proxy = (y1 * y1_grad).sum() + (y2 * y2_grad).sum()
+            proxy.backward()
+            y1_grad, y2_grad = x1.grad, x2.grad
+
+        for p, value in zip(stat_params, stat_values):
+            value.copyto(p.data(x.context))
+
+        return y, loss
+
 
 def get_irevnet(blocks,
                 model_name=None,
@@ -525,6 +585,19 @@ def _test():
 
         assert ((np.max(np.abs(x.asnumpy() - x_.asnumpy())) < 1e-4) or (np.max(np.abs(y.asnumpy()) > 1e10)))
 
+        loss_func = mx.gluon.loss.SoftmaxCrossEntropyLoss()
+        label = mx.nd.array([0, 1], ctx=ctx)
+        with mx.autograd.record():
+            loss = loss_func(net(x), label)
+        loss.backward()
+        grads = {k: v.grad().copy() for k, v in net.collect_params().items() if v.grad_req != "null"}
+        _, loss_ = net.forward_backward(x, loss_func, label)
+        assert (np.max(np.abs(loss.asnumpy() - loss_.asnumpy())) < 1e-4)
+        for k, v in net.collect_params().items():
+            if k in grads:
+                grad = grads[k].asnumpy()
+                assert (np.max(np.abs(grad - v.grad().asnumpy())) <= 1e-3 * max(1.0, np.max(np.abs(grad))))
+
 
 if __name__ == "__main__":
     _test()
@@ -7,10 +7,14 @@ __all__ = ['add_dataset_parser_arguments', 'get_batch_fn', 'get_train_data_sourc
 
 import os
 import math
+import numpy as np
 import mxnet as mx
 from mxnet import gluon
 from mxnet.gluon.data.vision import transforms
 from mxnet.gluon.data.vision import ImageFolderDataset
+from common.val_crop_cache import ValCropCache, get_val_crop_cache_dir_path
+from common.val_crop_cache import is_val_crop_cache_ready, write_val_crop_cache
+from .shm_prefetcher import SharedMemoryPrefetcher, PrefetchedBatch
 
 
 num_training_samples = 1281167
@@ -46,6 +50,15 @@ def add_dataset_parser_arguments(parser):
         '--use-rec',
         action='store_true',
         help='use image record iter for ImageNet-1K data input')
+    parser.add_argument(
+        '--val-cache-dir',
+        type=str,
+        default='',
+        help='directory of preprocessed validation image cache (disabled if empty)')
+    parser.add_argument(
+        '--shm-prefetch',
+        action='store_true',
+        help='load training batches via shared memory and stage next batches on devices (not for image record iter)')
 
     parser.add_argument(
         '--input-size',
@@ -104,6 +117,8 @@ def get_batch_fn(dataset_args):
         return batch_fn
     else:
         def batch_fn(batch, ctx):
+            if isinstance(batch, PrefetchedBatch):
+                return batch.data, batch.label
             data = gluon.utils.split_and_load(batch[0], ctx_list=ctx, batch_axis=0)
             label = gluon.utils.split_and_load(batch[1], ctx_list=ctx, batch_axis=0)
             return data, label
@@ -118,7 +133,9 @@ def get_train_data_rec(rec_train,
                        mean_rgb,
                        std_rgb,
                        jitter_param,
-                       lighting_param):
+                       lighting_param,
+                       num_parts=1,
+                       part_index=0):
     assert isinstance(data_shape, tuple) and len(data_shape) == 3
     return mx.io.ImageRecordIter(
         path_imgrec=rec_train,
@@ -126,6 +143,8 @@ def get_train_data_rec(rec_train,
         preprocess_threads=num_workers,
         shuffle=True,
         batch_size=batch_size,
+        num_parts=num_parts,
+        part_index=part_index,
 
         data_shape=data_shape,
         mean_r=mean_rgb[0],
@@ -179,7 +198,9 @@ def get_train_data_loader(data_dir,
                           mean_rgb,
                           std_rgb,
                           jitter_param,
-                          lighting_param):
+                          lighting_param,
+                          sampler=None,
+                          prefetch_ctx=None):
     transform_train = transforms.Compose([
         transforms.RandomResizedCrop(input_image_size),
         transforms.RandomFlipLeftRight(),
@@ -193,12 +214,24 @@ def get_train_data_loader(data_dir,
             mean=mean_rgb,
             std=std_rgb)
     ])
+    dataset = ImageNet(
+        root=data_dir,
+        train=True).transform_first(fn=transform_train)
+    if sampler is not None:
+        sampler.set_length(len(dataset))
+    if prefetch_ctx is not None:
+        return SharedMemoryPrefetcher(
+            dataset=dataset,
+            batch_size=batch_size,
+            ctx=prefetch_ctx,
+            num_workers=num_workers,
+            sampler=sampler,
+            shuffle=(sampler is None))
     return gluon.data.DataLoader(
-        dataset=ImageNet(
-            root=data_dir,
-            train=True).transform_first(fn=transform_train),
+        dataset=dataset,
         batch_size=batch_size,
-        shuffle=True,
+        shuffle=(sampler is None),
+        sampler=sampler,
         last_batch='discard',
         num_workers=num_workers)
 
@@ -227,14 +260,93 @@ def get_val_data_loader(data_dir,
         num_workers=num_workers)
 
 
+class ValCropCacheLoader(object):
+    """
+    Validation data loader, which streams preprocessed images from the crop cache.
+
+    Parameters:
+    ----------
+    cache : ValCropCache
+        Crop cache.
+    batch_size : int
+        Batch size.
+    mean_rgb : tuple of 3 float
+        Mean values for normalization.
+    std_rgb : tuple of 3 float
+        Standard deviation values for normalization.
+    """
+    def __init__(self,
+                 cache,
+                 batch_size,
+                 mean_rgb,
+                 std_rgb):
+        super(ValCropCacheLoader, self).__init__()
+        self.cache = cache
+        self.batch_size = batch_size
+        self.mean = mx.nd.array(mean_rgb).reshape((1, 3, 1, 1))
+        self.std = mx.nd.array(std_rgb).reshape((1, 3, 1, 1))
+
+    def __len__(self):
+        return (len(self.cache) + self.batch_size - 1) // self.batch_size
+
+    def __iter__(self):
+        for data, label in self.cache.get_batches(self.batch_size):
+            data = mx.nd.array(data, dtype=np.uint8).transpose((0, 3, 1, 2)).astype(np.float32) / 255
+            data = mx.nd.broadcast_div(mx.nd.broadcast_sub(data, self.mean), self.std)
+            yield data, mx.nd.array(label, dtype=np.int32)
+
+
+def get_val_data_cache_loader(data_dir,
+                              cache_dir,
+                              batch_size,
+                              num_workers,
+                              input_image_size,
+                              resize_value,
+                              mean_rgb,
+                              std_rgb):
+    cache_dir_path = get_val_crop_cache_dir_path(
+        cache_dir_path=cache_dir,
+        tag='gl',
+        input_image_size=input_image_size,
+        resize_value=resize_value)
+    if not is_val_crop_cache_ready(cache_dir_path):
+        transform_crop = transforms.Compose([
+            transforms.Resize(resize_value, keep_ratio=True),
+            transforms.CenterCrop(input_image_size)
+        ])
+        dataset = ImageNet(
+            root=data_dir,
+            train=False)
+        crop_data = gluon.data.DataLoader(
+            dataset=dataset.transform_first(fn=transform_crop),
+            batch_size=batch_size,
+            shuffle=False,
+            num_workers=num_workers)
+        write_val_crop_cache(
+            cache_dir_path=cache_dir_path,
+            batches=((data.asnumpy(), label.asnumpy()) for data, label in crop_data),
+            num_samples=len(dataset))
+    return ValCropCacheLoader(
+        cache=ValCropCache(cache_dir_path),
+        batch_size=batch_size,
+        mean_rgb=mean_rgb,
+        std_rgb=std_rgb)
+
+
 def get_train_data_source(dataset_args,
                           batch_size,
                           num_workers,
-                          input_image_size=(224, 224)):
+                          input_image_size=(224, 224),
+                          sampler=None,
+                          num_parts=1,
+                          part_index=0,
+                          prefetch_ctx=None):
     jitter_param = 0.4
     lighting_param = 0.1
 
     if dataset_args.use_rec:
+        assert (sampler is None), 'Sampler is not supported by ImageRecordIter'
+        assert (prefetch_ctx is None), 'Shared memory prefetching is not supported by ImageRecordIter'
         if isinstance(input_image_size, int):
             input_image_size = (input_image_size, input_image_size)
         data_shape = (3,) + input_image_size
@@ -250,8 +362,11 @@ def get_train_data_source(dataset_args,
             mean_rgb=mean_rgb,
             std_rgb=std_rgb,
             jitter_param=jitter_param,
-            lighting_param=lighting_param)
+            lighting_param=lighting_param,
+            num_parts=num_parts,
+            part_index=part_index)
     else:
+        assert (num_parts == 1) or (sampler is not None), 'Data loader is sharded only by a sampler'
         mean_rgb = (0.485, 0.456, 0.406)
         std_rgb = (0.229, 0.224, 0.225)
 
@@ -263,7 +378,9 @@ def get_train_data_source(dataset_args,
             mean_rgb=mean_rgb,
             std_rgb=std_rgb,
             jitter_param=jitter_param,
-            lighting_param=lighting_param)
+            lighting_param=lighting_param,
+            sampler=sampler,
+            prefetch_ctx=prefetch_ctx)
 
 
 def get_val_data_source(dataset_args,
@@ -294,6 +411,17 @@ def get_val_data_source(dataset_args,
         mean_rgb = (0.485, 0.456, 0.406)
         std_rgb = (0.229, 0.224, 0.225)
 
+        if dataset_args.val_cache_dir:
+            return get_val_data_cache_loader(
+                data_dir=dataset_args.data_dir,
+                cache_dir=dataset_args.val_cache_dir,
+                batch_size=batch_size,
+                num_workers=num_workers,
+                input_image_size=input_image_size,
+                resize_value=resize_value,
+                mean_rgb=mean_rgb,
+                std_rgb=std_rgb)
+
         return get_val_data_loader(
             data_dir=dataset_args.data_dir,
             batch_size=batch_size,
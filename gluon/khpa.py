@@ -16,6 +16,7 @@ from mxnet.gluon.data import Dataset
 from imgaug import augmenters as iaa
 from imgaug import parameters as iap
 from .weighted_random_sampler import WeightedRandomSampler
+from .shm_prefetcher import SharedMemoryPrefetcher, PrefetchedBatch
 
 
 def add_dataset_parser_arguments(parser):
@@ -47,6 +48,10 @@ def add_dataset_parser_arguments(parser):
         '--gen-stats',
         action='store_true',
         help='whether generate a file with the dataset statistics')
+    parser.add_argument(
+        '--shm-prefetch',
+        action='store_true',
+        help='load training batches via shared memory and stage next batches on devices')
 
     parser.add_argument(
         '--input-size',
@@ -524,6 +529,8 @@ class KHPAValTransform(object):
 
 def get_batch_fn():
     def batch_fn(batch, ctx):
+        if isinstance(batch, PrefetchedBatch):
+            return batch.data, batch.label
         data = gluon.utils.split_and_load(batch[0], ctx_list=ctx, batch_axis=0)
         label = gluon.utils.split_and_load(batch[1], ctx_list=ctx, batch_axis=0)
         # weight = gluon.utils.split_and_load(batch[2].astype(np.float32, copy=False), ctx_list=ctx, batch_axis=0)
@@ -539,7 +546,8 @@ def get_train_data_loader(data_dir_path,
                           generate_stats,
                           batch_size,
                           num_workers,
-                          model_input_image_size):
+                          model_input_image_size,
+                          prefetch_ctx=None):
     dataset = KHPA(
         root=data_dir_path,
         split_file_path=split_file_path,
@@ -552,6 +560,13 @@ def get_train_data_loader(data_dir_path,
     sampler = WeightedRandomSampler(
         length=len(dataset),
         weights=dataset.sample_weights)
+    if prefetch_ctx is not None:
+        return SharedMemoryPrefetcher(
+            dataset=dataset,
+            batch_size=batch_size,
+            ctx=prefetch_ctx,
+            num_workers=num_workers,
+            sampler=sampler)
     return gluon.data.DataLoader(
         dataset=dataset,
         batch_size=batch_size,
@@ -590,7 +605,8 @@ def get_val_data_loader(data_dir_path,
 def get_train_data_source(dataset_args,
                           batch_size,
                           num_workers,
-                          input_image_size=(224, 224)):
+                          input_image_size=(224, 224),
+                          prefetch_ctx=None):
     return get_train_data_loader(
         data_dir_path=dataset_args.data_path,
         split_file_path=dataset_args.split_file,
@@ -600,7 +616,8 @@ def get_train_data_source(dataset_args,
         generate_stats=dataset_args.gen_stats,
         batch_size=batch_size,
         num_workers=num_workers,
-        model_input_image_size=input_image_size)
+        model_input_image_size=input_image_size,
+        prefetch_ctx=prefetch_ctx)
 
 
 def get_val_data_source(dataset_args,
@@ -1,3 +1,4 @@
+import json
 import logging
 import numpy as np
 import mxnet as mx
@@ -7,7 +8,7 @@ from .gluoncv2.models.common import ReLU6, ChannelShuffle, ChannelShuffle2, PReL
 from .gluoncv2.models.fishnet import InterpolationBlock, ChannelSqueeze
 from .gluoncv2.models.irevnet import IRevDownscale, IRevSplitBlock, IRevMergeBlock
 
-__all__ = ['measure_model']
+__all__ = ['measure_model', 'analyze_model', 'LayerStats', 'profile_model_memory']
 
 
 def calc_block_num_params2(net):
@@ -29,6 +30,141 @@ def calc_block_num_params(block):
     return weight_count
 
 
+def calc_block_flops(block,
+                     x_shapes,
+                     y_shape):
+    """
+    Calculate FLOPs and MACs for a leaf block from the shapes of its inputs and output.
+
+    Parameters:
+    ----------
+    block : HybridBlock
+        Leaf block.
+    x_shapes : list of tuple of int
+        Shapes of the inputs.
+    y_shape : tuple of int
+        Shape of the (first) output.
+
+    Returns
+    -------
+    tuple of 2 int
+        Numbers of FLOPs and MACs.
+    """
+    x_size = int(np.prod(x_shapes[0]))
+    if isinstance(block, nn.Dense):
+        in_units = int(np.prod(x_shapes[0][1:])) if block._flatten else x_shapes[0][-1]
+        out_units = block._units
+        extra_num_macs = in_units * out_units
+        if block.bias is None:
+            extra_num_flops = (2 * in_units - 1) * out_units
+        else:
+            extra_num_flops = 2 * in_units * out_units
+    elif isinstance(block, nn.Activation):
+        if block._act_type == "relu":
+            extra_num_flops = x_size
+            extra_num_macs = 0
+        elif block._act_type == "sigmoid":
+            extra_num_flops = 4 * x_size
+            extra_num_macs = 0
+        else:
+            raise TypeError('Unknown activation type: {}'.format(block._act_type))
+    elif isinstance(block, nn.LeakyReLU):
+        extra_num_flops = 2 * x_size
+        extra_num_macs = 0
+    elif isinstance(block, ReLU6):
+        extra_num_flops = x_size
+        extra_num_macs = 0
+    elif isinstance(block, PReLU2):
+        extra_num_flops = 3 * x_size
+        extra_num_macs = 0
+    elif isinstance(block, nn.Conv2D):
+        x_h = x_shapes[0][2]
+        x_w = x_shapes[0][3]
+        kernel_size = block._kwargs["kernel"]
+        strides = block._kwargs["stride"]
+        dilation = block._kwargs["dilate"]
+        padding = block._kwargs["pad"]
+        groups = block._kwargs["num_group"]
+        in_channels = x_shapes[0][1]
+        out_channels = block._channels
+        y_h = (x_h + 2 * padding[0] - dilation[0] * (kernel_size[0] - 1) - 1) // strides[0] + 1
+        y_w = (x_w + 2 * padding[1] - dilation[1] * (kernel_size[1] - 1) - 1) // strides[1] + 1
+        assert (out_channels == y_shape[1])
+        assert (y_h == y_shape[2])
+        assert (y_w == y_shape[3])
+        kernel_total_size = kernel_size[0] * kernel_size[1]
+        y_size = y_h * y_w
+        extra_num_macs = kernel_total_size * in_channels * y_size * out_channels // groups
+        if block.bias is None:
+            extra_num_flops = (2 * kernel_total_size * y_size - 1) * in_channels * out_channels // groups
+        else:
+            extra_num_flops = 2 * kernel_total_size * in_channels * y_size * out_channels // groups
+    elif isinstance(block, nn.BatchNorm):
+        extra_num_flops = 4 * x_size
+        extra_num_macs = 0
+    elif isinstance(block, nn.InstanceNorm):
+        extra_num_flops = 4 * x_size
+        extra_num_macs = 0
+    elif type(block) in [nn.MaxPool2D, nn.AvgPool2D, nn.GlobalAvgPool2D, nn.GlobalMaxPool2D]:
+        assert (x_shapes[0][1] == y_shape[1])
+        pool_size = block._kwargs["kernel"]
+        y_h = y_shape[2]
+        y_w = y_shape[3]
+        channels = x_shapes[0][1]
+        y_size = y_h * y_w
+        pool_total_size = pool_size[0] * pool_size[1]
+        extra_num_flops = channels * y_size * pool_total_size
+        extra_num_macs = 0
+    elif isinstance(block, nn.Dropout):
+        extra_num_flops = 0
+        extra_num_macs = 0
+    elif type(block) in [nn.Flatten]:
+        extra_num_flops = 0
+        extra_num_macs = 0
+    elif isinstance(block, nn.HybridSequential):
+        assert (len(block._children) == 0)
+        extra_num_flops = 0
+        extra_num_macs = 0
+    elif type(block) in [ChannelShuffle, ChannelShuffle2]:
+        extra_num_flops = x_size
+        extra_num_macs = 0
+    elif isinstance(block, Identity):
+        extra_num_flops = 0
+        extra_num_macs = 0
+    elif isinstance(block, InterpolationBlock):
+        extra_num_flops = x_size
+        extra_num_macs = 0
+    elif isinstance(block, ChannelSqueeze):
+        extra_num_flops = x_size
+        extra_num_macs = 0
+    elif isinstance(block, IRevDownscale):
+        extra_num_flops = 5 * x_size
+        extra_num_macs = 0
+    elif isinstance(block, IRevSplitBlock):
+        extra_num_flops = x_size
+        extra_num_macs = 0
+    elif isinstance(block, IRevMergeBlock):
+        extra_num_flops = x_size
+        extra_num_macs = 0
+    else:
+        raise TypeError('Unknown layer type: {}'.format(type(block)))
+    return extra_num_flops, extra_num_macs
+
+
+def register_forward_hooks(a_block,
+                           hook):
+    if len(a_block._children) > 0:
+        assert (calc_block_num_params(a_block) == 0)
+        children_handles = []
+        for child_block in a_block._children.values():
+            child_handles = register_forward_hooks(child_block, hook)
+            children_handles += child_handles
+        return children_handles
+    else:
+        handle = a_block.register_forward_hook(hook)
+        return [handle]
+
+
 def measure_model(model,
                   in_channels,
                   in_size,
@@ -61,103 +197,11 @@ def measure_model(model,
             assert (len(x) == 1)
         assert (x[0].shape[0] == 1)
         assert (len(block._children) == 0)
-        if isinstance(block, nn.Dense):
-            in_units = block._in_units
-            out_units = block._units
-            extra_num_macs = in_units * out_units
-            if block.bias is None:
-                extra_num_flops = (2 * in_units - 1) * out_units
-            else:
-                extra_num_flops = 2 * in_units * out_units
-        elif isinstance(block, nn.Activation):
-            if block._act_type == "relu":
-                extra_num_flops = x[0].size
-                extra_num_macs = 0
-            elif block._act_type == "sigmoid":
-                extra_num_flops = 4 * x[0].size
-                extra_num_macs = 0
-            else:
-                raise TypeError('Unknown activation type: {}'.format(block._act_type))
-        elif isinstance(block, nn.LeakyReLU):
-            extra_num_flops = 2 * x[0].size
-            extra_num_macs = 0
-        elif isinstance(block, ReLU6):
-            extra_num_flops = x[0].size
-            extra_num_macs = 0
-        elif isinstance(block, PReLU2):
-            extra_num_flops = 3 * x[0].size
-            extra_num_macs = 0
-        elif isinstance(block, nn.Conv2D):
-            x_h = x[0].shape[2]
-            x_w = x[0].shape[3]
-            kernel_size = block._kwargs["kernel"]
-            strides = block._kwargs["stride"]
-            dilation = block._kwargs["dilate"]
-            padding = block._kwargs["pad"]
-            groups = block._kwargs["num_group"]
-            in_channels = block._in_channels
-            out_channels = block._channels
-            y_h = (x_h + 2 * padding[0] - dilation[0] * (kernel_size[0] - 1) - 1) // strides[0] + 1
-            y_w = (x_w + 2 * padding[1] - dilation[1] * (kernel_size[1] - 1) - 1) // strides[1] + 1
-            assert (out_channels == y.shape[1])
-            assert (y_h == y.shape[2])
-            assert (y_w == y.shape[3])
-            kernel_total_size = kernel_size[0] * kernel_size[1]
-            y_size = y_h * y_w
-            extra_num_macs = kernel_total_size * in_channels * y_size * out_channels // groups
-            if block.bias is None:
-                extra_num_flops = (2 * kernel_total_size * y_size - 1) * in_channels * out_channels // groups
-            else:
-                extra_num_flops = 2 * kernel_total_size * in_channels * y_size * out_channels // groups
-        elif isinstance(block, nn.BatchNorm):
-            extra_num_flops = 4 * x[0].size
-            extra_num_macs = 0
-        elif isinstance(block, nn.InstanceNorm):
-            extra_num_flops = 4 * x[0].size
-            extra_num_macs = 0
-        elif type(block) in [nn.MaxPool2D, nn.AvgPool2D, nn.GlobalAvgPool2D, nn.GlobalMaxPool2D]:
-            assert (x[0].shape[1] == y.shape[1])
-            pool_size = block._kwargs["kernel"]
-            y_h = y.shape[2]
-            y_w = y.shape[3]
-            channels = x[0].shape[1]
-            y_size = y_h * y_w
-            pool_total_size = pool_size[0] * pool_size[1]
-            extra_num_flops = channels * y_size * pool_total_size
-            extra_num_macs = 0
-        elif isinstance(block, nn.Dropout):
-            extra_num_flops = 0
-            extra_num_macs = 0
-        elif type(block) in [nn.Flatten]:
-            extra_num_flops = 0
-            extra_num_macs = 0
-        elif isinstance(block, nn.HybridSequential):
-            assert (len(block._children) == 0)
-            extra_num_flops = 0
-            extra_num_macs = 0
-        elif type(block) in [ChannelShuffle, ChannelShuffle2]:
-            extra_num_flops = x[0].size
-            extra_num_macs = 0
-        elif isinstance(block, Identity):
-            extra_num_flops = 0
-            extra_num_macs = 0
-        elif isinstance(block, InterpolationBlock):
-            extra_num_flops = x[0].size
-            extra_num_macs = 0
-        elif isinstance(block, ChannelSqueeze):
-            extra_num_flops = x[0].size
-            extra_num_macs = 0
-        elif isinstance(block, IRevDownscale):
-            extra_num_flops = 5 * x[0].size
-            extra_num_macs = 0
-        elif isinstance(block, IRevSplitBlock):
-            extra_num_flops = x[0].size
-            extra_num_macs = 0
-        elif isinstance(block, IRevMergeBlock):
-            extra_num_flops = x[0].size
-            extra_num_macs = 0
-        else:
-            raise TypeError('Unknown layer type: {}'.format(type(block)))
+        y0 = y[0] if isinstance(y, (list, tuple)) else y
+        extra_num_flops, extra_num_macs = calc_block_flops(
+            block=block,
+            x_shapes=[xi.shape for xi in x if xi is not None],
+            y_shape=y0.shape)
 
         global num_flops
         global num_macs
@@ -169,19 +213,7 @@ def measure_model(model,
             names[block.name] = 1
             num_params += calc_block_num_params(block)
 
-    def register_forward_hooks(a_block):
-        if len(a_block._children) > 0:
-            assert (calc_block_num_params(a_block) == 0)
-            children_handles = []
-            for child_block in a_block._children.values():
-                child_handles = register_forward_hooks(child_block)
-                children_handles += child_handles
-            return children_handles
-        else:
-            handle = a_block.register_forward_hook(call_hook)
-            return [handle]
-
-    hook_handles = register_forward_hooks(model)
+    hook_handles = register_forward_hooks(model, call_hook)
 
     x = mx.nd.zeros((1, in_channels, in_size[0], in_size[1]), ctx=ctx)
     model(x)
@@ -195,3 +227,304 @@ def measure_model(model,
     [h.detach() for h in hook_handles]
 
     return num_flops, num_macs, num_params1
+
+
+class LayerStats(object):
+    """
+    Statistics of a leaf block.
+
+    Parameters:
+    ----------
+    name : str
+        Block name.
+    type_name : str
+        Block type name.
+    in_shapes : list of tuple of int
+        Shapes of the inputs.
+    out_shapes : list of tuple of int
+        Shapes of the outputs.
+    num_params : int
+        Number of trainable parameters.
+    num_flops : int or None
+        Number of FLOPs (None for unknown block types).
+    num_macs : int or None
+        Number of MACs (None for unknown block types).
+    """
+    def __init__(self,
+                 name,
+                 type_name,
+                 in_shapes,
+                 out_shapes,
+                 num_params,
+                 num_flops,
+                 num_macs):
+        self.name = name
+        self.type_name = type_name
+        self.in_shapes = in_shapes
+        self.out_shapes = out_shapes
+        self.num_params = num_params
+        self.num_flops = num_flops
+        self.num_macs = num_macs
+
+    @property
+    def num_activations(self):
+        return int(sum([np.prod(shape) for shape in self.out_shapes]))
+
+
+def analyze_model(model,
+                  in_channels,
+                  in_size,
+                  dtype_size=4):
+    """
+    Calculate model statistics by shape propagation: the model is applied to a symbolic input and shapes of all leaf
+    block inputs/outputs are inferred at once, without running a forward pass. The model may be uninitialized.
+
+    Parameters:
+    ----------
+    model : HybridBlock
+        Tested model.
+    in_channels : int
+        Number of input channels.
+    in_size : tuple of two ints
+        Spatial size of the expected input image.
+    dtype_size : int, default 4
+        Size of a tensor element in bytes (for activation memory).
+
+    Returns
+    -------
+    num_flops : int
+        Number of FLOPs (for known block types).
+    num_macs : int
+        Number of MACs (for known block types).
+    num_params : int
+        Number of trainable parameters.
+    activation_memory : int
+        Total size of leaf block outputs in bytes.
+    layers : list of LayerStats
+        Per-layer statistics (in the execution order).
+    """
+    calls = []
+
+    def call_hook(block, x, y):
+        y = list(y) if isinstance(y, (list, tuple)) else [y]
+        calls.append((block, list(x), [yi for yi in y if yi is not None]))
+
+    hook_handles = register_forward_hooks(model, call_hook)
+    try:
+        data = mx.sym.var('data')
+        model(data)
+    finally:
+        [h.detach() for h in hook_handles]
+
+    syms = []
+    for _, x, y in calls:
+        syms += x + y
+    sym_indices = []
+    pos = 0
+    for sym in syms:
+        num_outputs = len(sym.list_outputs())
+        sym_indices.append(pos)
+        pos += num_outputs
+    group = mx.sym.Group(syms)
+    arg_shapes, out_shapes, aux_shapes = group.infer_shape(data=(1, in_channels, in_size[0], in_size[1]))
+    if out_shapes is None:
+        raise ValueError('Shapes cannot be inferred for the model')
+    param_shapes = dict(zip(group.list_arguments(), arg_shapes))
+    param_shapes.update(zip(group.list_auxiliary_states(), aux_shapes))
+
+    def get_num_params(params):
+        return int(sum([np.prod(param_shapes[param.name]) for param in params.values()
+                        if param._differentiable and (param.name in param_shapes)]))
+
+    layers = []
+    names = {}
+    num_flops = 0
+    num_macs = 0
+    k = 0
+    for block, x, y in calls:
+        x_shapes = [out_shapes[sym_indices[k + i]] for i in range(len(x))]
+        k += len(x)
+        y_shapes = [out_shapes[sym_indices[k + i]] for i in range(len(y))]
+        k += len(y)
+        try:
+            extra_num_flops, extra_num_macs = calc_block_flops(
+                block=block,
+                x_shapes=x_shapes,
+                y_shape=y_shapes[0])
+            num_flops += extra_num_flops
+            num_macs += extra_num_macs
+        except TypeError as e:
+            logging.warning('{} (block {} is skipped)'.format(e, block.name))
+            extra_num_flops = None
+            extra_num_macs = None
+        extra_num_params = 0
+        if block.name not in names:
+            names[block.name] = 1
+            extra_num_params = get_num_params(block.params)
+        layers.append(LayerStats(
+            name=block.name,
+            type_name=type(block).__name__,
+            in_shapes=x_shapes,
+            out_shapes=y_shapes,
+            num_params=extra_num_params,
+            num_flops=extra_num_flops,
+            num_macs=extra_num_macs))
+
+    num_params = get_num_params(model.collect_params())
+    activation_memory = dtype_size * sum([layer.num_activations for layer in layers])
+    return num_flops, num_macs, num_params, activation_memory, layers
+
+
+_view_ops = ['Reshape', 'reshape', 'Flatten', 'flatten', 'expand_dims', 'squeeze', 'reshape_like', 'identity',
+             '_copy', 'BlockGrad', 'stop_gradient']
+
+
+def get_block_prefixes(block,
+                       prefixes=None):
+    if prefixes is None:
+        prefixes = []
+    prefixes.append((block.prefix, block.name))
+    for child_block in block._children.values():
+        get_block_prefixes(child_block, prefixes)
+    return prefixes
+
+
+def profile_model_memory(model,
+                         in_channels,
+                         in_size,
+                         batch_size=1,
+                         train=False,
+                         dtype_size=4):
+    """
+    Calculate the peak size of live activation tensors by simulating execution of the symbolic graph of the model.
+    In the eval mode, a tensor is released after its last consumer. In the train mode, all forward tensors are kept
+    for the backward pass, and gradients are released as soon as the backward pass of their producer is done (parameter
+    gradients are allocated at the beginning of the backward pass). Views (reshapes) don't allocate memory. Parameters
+    aren't counted.
+
+    Parameters:
+    ----------
+    model : HybridBlock
+        Tested model.
+    in_channels : int
+        Number of input channels.
+    in_size : tuple of two ints
+        Spatial size of the expected input image.
+    batch_size : int, default 1
+        Batch size.
+    train : bool, default False
+        Whether to simulate the train mode (forward and backward passes).
+    dtype_size : int, default 4
+        Size of a tensor element in bytes.
+
+    Returns
+    -------
+    peak_bytes : int
+        Peak size of live tensors in bytes.
+    peak_layer : str
+        Name of the block, which is executed at the peak (with `backward:` prefix for the backward pass).
+    """
+    data = mx.sym.var('data')
+    out = model(data)
+    if isinstance(out, (list, tuple)):
+        out = mx.sym.Group(list(out))
+    graph = json.loads(out.tojson())
+    nodes = graph['nodes']
+    internals = out.get_internals()
+    arg_shapes, out_shapes, _ = internals.infer_shape(data=(batch_size, in_channels, in_size[0], in_size[1]))
+    if out_shapes is None:
+        raise ValueError('Shapes cannot be inferred for the model')
+    arg_shapes = dict(zip(internals.list_arguments(), arg_shapes))
+    param_grad_bytes = dtype_size * sum([int(np.prod(arg_shapes[param.name]))
+                                         for param in model.collect_params().values()
+                                         if param._differentiable and (param.name in arg_shapes)])
+
+    # Sizes of node outputs (in bytes):
+    entry_bytes = {}
+    output_names = internals.list_outputs()
+    k = 0
+    for i, node in enumerate(nodes):
+        j = 0
+        while (k < len(output_names)) and ((output_names[k] == node['name']) or
+                                           output_names[k].startswith(node['name'] + '_output')):
+            entry_bytes[(i, j)] = dtype_size * int(np.prod(out_shapes[k]))
+            k += 1
+            j += 1
+
+    # Views share memory with their inputs:
+    base = {}
+    for i, node in enumerate(nodes):
+        if node['op'] in _view_ops:
+            input_entry = (node['inputs'][0][0], node['inputs'][0][1])
+            base[(i, 0)] = base.get(input_entry, input_entry)
+
+    def get_base(entry):
+        return base.get(entry, entry)
+
+    def is_activation(entry):
+        node = nodes[entry[0]]
+        return ((node['op'] != 'null') or (node['name'] == 'data')) and (entry not in base) and (entry in entry_bytes)
+
+    head_entries = set([get_base((h[0], h[1])) for h in graph['heads']])
+    num_consumers = {}
+    for node in nodes:
+        for input_entry in node['inputs']:
+            entry = get_base((input_entry[0], input_entry[1]))
+            num_consumers[entry] = num_consumers.get(entry, 0) + 1
+
+    block_prefixes = sorted(get_block_prefixes(model), key=lambda x: len(x[0]), reverse=True)
+
+    def get_layer_name(node_name):
+        for prefix, name in block_prefixes:
+            if node_name.startswith(prefix):
+                return name
+        return node_name
+
+    node_entries = {}
+    for entry in entry_bytes.keys():
+        if is_activation(entry):
+            node_entries.setdefault(entry[0], []).append(entry)
+
+    state = {'live_bytes': 0, 'peak_bytes': 0, 'peak_layer': ''}
+
+    def allocate(nbytes, layer_name):
+        state['live_bytes'] += nbytes
+        if state['live_bytes'] > state['peak_bytes']:
+            state['peak_bytes'] = state['live_bytes']
+            state['peak_layer'] = layer_name
+
+    # Forward pass:
+    for i, node in enumerate(nodes):
+        if (node['op'] == 'null') and (node['name'] != 'data'):
+            continue
+        layer_name = get_layer_name(node['name'])
+        allocate(sum([entry_bytes[e] for e in node_entries.get(i, [])]), layer_name)
+        if not train:
+            for input_entry in node['inputs']:
+                entry = get_base((input_entry[0], input_entry[1]))
+                num_consumers[entry] -= 1
+                if (num_consumers[entry] == 0) and is_activation(entry) and (entry not in head_entries):
+                    state['live_bytes'] -= entry_bytes[entry]
+
+    # Backward pass:
+    if train:
+        allocate(param_grad_bytes, 'backward')
+        grad_entries = set()
+        for entry in head_entries:
+            grad_entries.add(entry)
+            allocate(entry_bytes[entry], 'backward:' + get_layer_name(nodes[entry[0]]['name']))
+        for i in reversed(range(len(nodes))):
+            node = nodes[i]
+            if node['op'] == 'null':
+                continue
+            layer_name = 'backward:' + get_layer_name(node['name'])
+            for input_entry in node['inputs']:
+                entry = get_base((input_entry[0], input_entry[1]))
+                if is_activation(entry) and (nodes[entry[0]]['op'] != 'null') and (entry not in grad_entries):
+                    grad_entries.add(entry)
+                    allocate(entry_bytes[entry], layer_name)
+            for entry in node_entries.get(i, []):
+                state['live_bytes'] -= entry_bytes[entry]
+                if entry in grad_entries:
+                    state['live_bytes'] -= entry_bytes[entry]
+    return state['peak_bytes'], state['peak_layer']
@@ -0,0 +1,128 @@
+"""
+    Post-training int8 quantization of models (on CPU) with calibration of activation ranges on validation data.
+"""
+
+__all__ = ['load_calib_batches', 'quantize_model', 'export_quantized_model', 'calc_net_throughput']
+
+import time
+import logging
+import mxnet as mx
+
+
+def load_calib_batches(val_data,
+                       batch_fn,
+                       data_source_needs_reset,
+                       num_batches,
+                       dtype,
+                       ctx):
+    """
+    Load several first batches of data (without labels) from a validation data source.
+
+    Parameters:
+    ----------
+    val_data : DataLoader or ImageRecordIter
+        Validation data source.
+    batch_fn : function
+        Function for splitting data after extraction from data loader.
+    data_source_needs_reset : bool
+        Whether the data source needs to be reset.
+    num_batches : int
+        Number of batches.
+    dtype : str
+        Base data type for tensors.
+    ctx : Context
+        MXNet context.
+
+    Returns
+    -------
+    list of NDArray
+        Data batches.
+    """
+    if data_source_needs_reset:
+        val_data.reset()
+    batches = []
+    for batch in val_data:
+        if len(batches) >= num_batches:
+            break
+        data_list, _ = batch_fn(batch, [ctx])
+        batches.append(data_list[0].astype(dtype, copy=False))
+    return batches
+
+
+def quantize_model(net,
+                   calib_batches,
+                   ctx=mx.cpu()):
+    """
+    Quantize a model into int8. Activation ranges are calibrated (as min/max values) on the given data batches.
+
+    Parameters:
+    ----------
+    net : HybridBlock
+        Model (in float32).
+    calib_batches : list of NDArray
+        Calibration data batches.
+    ctx : Context, default CPU
+        MXNet context (quantized operators are implemented only for CPU).
+
+    Returns
+    -------
+    SymbolBlock
+        Quantized model.
+    """
+    # Gluon quantization is available only in recent MXNet, so plain evaluation doesn't depend on it:
+    from mxnet.contrib.quantization import quantize_net
+
+    calib_data = mx.io.NDArrayIter(
+        data=mx.nd.concat(*calib_batches, dim=0),
+        batch_size=calib_batches[0].shape[0])
+    return quantize_net(
+        network=net,
+        quantized_dtype='auto',
+        calib_data=calib_data,
+        data_shapes=calib_data.provide_data,
+        calib_mode='naive',
+        num_calib_examples=calib_data.num_data,
+        ctx=ctx,
+        logger=logging)
+
+
+def export_quantized_model(qnet,
+                           file_path_prefix):
+    """
+    Export a quantized model (symbol and parameters).
+
+    Parameters:
+    ----------
+    qnet : SymbolBlock
+        Quantized model.
+    file_path_prefix : str
+        Prefix for paths to the `-symbol.json` and `-0000.params` files.
+    """
+    qnet.export(file_path_prefix)
+    logging.info('Quantized model is exported: {}'.format(file_path_prefix))
+
+
+def calc_net_throughput(net,
+                        batches):
+    """
+    Calculate inference throughput of a model on data batches (without data loading).
+
+    Parameters:
+    ----------
+    net : HybridBlock
+        Model.
+    batches : list of NDArray
+        Data batches.
+
+    Returns
+    -------
+    float
+        Number of images per second.
+    """
+    net(batches[0]).wait_to_read()
+    tic = time.time()
+    for x in batches:
+        net(x)
+    mx.nd.waitall()
+    num_images = sum(x.shape[0] for x in batches)
+    return num_images / (time.time() - tic)
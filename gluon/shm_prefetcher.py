@@ -0,0 +1,233 @@
+"""
+    Data source with worker processes, which write decoded batches into a shared memory ring buffer, and with staging
+    of next batches on devices while the current training step runs.
+"""
+
+__all__ = ['SharedMemoryPrefetcher', 'PrefetchedBatch']
+
+import random
+import ctypes
+import traceback
+import multiprocessing
+from collections import deque
+import numpy as np
+import mxnet as mx
+from mxnet import gluon
+
+
+class PrefetchedBatch(object):
+    """
+    Batch, which is already split and loaded on devices.
+
+    Parameters:
+    ----------
+    fields : list of list of NDArray
+        Batch fields (data, label, ...), each is a list of per-context parts.
+    """
+    def __init__(self, fields):
+        super(PrefetchedBatch, self).__init__()
+        self.fields = fields
+
+    @property
+    def data(self):
+        return self.fields[0]
+
+    @property
+    def label(self):
+        return self.fields[1]
+
+
+def _to_numpy(x):
+    return x.asnumpy() if isinstance(x, mx.nd.NDArray) else np.asarray(x)
+
+
+def _get_slot_views(raw_arrays,
+                    field_specs,
+                    batch_size):
+    return [np.frombuffer(raw_array, dtype=dtype).reshape((batch_size,) + shape)
+            for raw_array, (shape, dtype) in zip(raw_arrays, field_specs)]
+
+
+def _worker_loop(dataset,
+                 slot_raw_arrays,
+                 field_specs,
+                 batch_size,
+                 task_queue,
+                 ready_queue,
+                 seed):
+    random.seed(seed)
+    np.random.seed(seed)
+    mx.random.seed(seed)
+    slots = [_get_slot_views(raw_arrays, field_specs, batch_size) for raw_arrays in slot_raw_arrays]
+    while True:
+        task = task_queue.get()
+        if task is None:
+            break
+        batch_index, slot_index, sample_indices = task
+        try:
+            fields = slots[slot_index]
+            for j, sample_index in enumerate(sample_indices):
+                for field, value in zip(fields, dataset[sample_index]):
+                    field[j] = _to_numpy(value)
+            ready_queue.put((batch_index, slot_index, None))
+        except Exception:
+            ready_queue.put((batch_index, slot_index, traceback.format_exc()))
+
+
+class SharedMemoryPrefetcher(object):
+    """
+    Training data source (a replacement of `gluon.data.DataLoader`). Worker processes decode samples directly into
+    slots of a pre-allocated shared memory ring buffer (so batches aren't pickled), the main process copies a ready
+    slot into a host array and issues asynchronous copies of the next `num_staged` batches to devices. Batches are
+    yielded as `PrefetchedBatch` objects. Partial batches are discarded.
+
+    Parameters:
+    ----------
+    dataset : Dataset
+        Dataset with samples as tuples of arrays (or numbers) with fixed shapes.
+    batch_size : int
+        Batch size (for all contexts).
+    ctx : Context or list of Context
+        Contexts for staging of batches.
+    num_workers : int, default 4
+        Number of worker processes.
+    sampler : Sampler or None, default None
+        Sampler (it's iterated in the main process for each epoch).
+    shuffle : bool, default False
+        Whether to shuffle samples (if there is no sampler).
+    num_slots : int or None, default None
+        Number of slots in the ring buffer (two per worker by default).
+    num_staged : int, default 1
+        Number of next batches, which are staged on devices.
+    """
+    def __init__(self,
+                 dataset,
+                 batch_size,
+                 ctx,
+                 num_workers=4,
+                 sampler=None,
+                 shuffle=False,
+                 num_slots=None,
+                 num_staged=1):
+        super(SharedMemoryPrefetcher, self).__init__()
+        assert (num_staged >= 0)
+        self.workers = []
+        if sampler is None:
+            sampler = gluon.data.RandomSampler(len(dataset)) if shuffle else gluon.data.SequentialSampler(len(dataset))
+        self._dataset = dataset
+        self.batch_size = batch_size
+        self.ctx = [ctx] if isinstance(ctx, mx.Context) else ctx
+        self.num_workers = max(1, num_workers)
+        self.batch_sampler = gluon.data.BatchSampler(
+            sampler=sampler,
+            batch_size=batch_size,
+            last_batch='discard')
+        self.num_slots = num_slots if num_slots is not None else 2 * self.num_workers
+        self.num_staged = num_staged
+        self.host_ctx = mx.cpu_pinned() if any([c.device_type == 'gpu' for c in self.ctx]) else mx.cpu()
+
+        self.field_specs = None
+        self.slots = None
+        self.task_queue = None
+        self.ready_queue = None
+
+    def __len__(self):
+        return len(self.batch_sampler)
+
+    def __iter__(self):
+        if not self.workers:
+            self._start_workers()
+
+        batch_iter = iter(self.batch_sampler)
+        free_slots = deque(range(self.num_slots))
+        ready = {}
+        staged = deque()
+        state = {'num_dispatched': 0, 'num_received': 0, 'exhausted': False}
+
+        def dispatch():
+            while free_slots and not state['exhausted']:
+                sample_indices = next(batch_iter, None)
+                if sample_indices is None:
+                    state['exhausted'] = True
+                    break
+                self.task_queue.put((state['num_dispatched'], free_slots.popleft(), sample_indices))
+                state['num_dispatched'] += 1
+
+        def receive():
+            batch_index, slot_index, error = self.ready_queue.get()
+            state['num_received'] += 1
+            if error is not None:
+                free_slots.append(slot_index)
+                raise RuntimeError('Error in a data worker:\n{}'.format(error))
+            ready[batch_index] = slot_index
+
+        next_index = 0
+        try:
+            dispatch()
+            while True:
+                while (len(staged) <= self.num_staged) and (next_index < state['num_dispatched']):
+                    while next_index not in ready:
+                        receive()
+                    slot_index = ready.pop(next_index)
+                    staged.append(self._stage(self.slots[slot_index]))
+                    free_slots.append(slot_index)
+                    next_index += 1
+                    dispatch()
+                if not staged:
+                    break
+                yield staged.popleft()
+        finally:
+            # Slots of an interrupted epoch are released only after workers have finished writing into them:
+            while state['num_received'] < state['num_dispatched']:
+                self.ready_queue.get()
+                state['num_received'] += 1
+
+    def close(self):
+        """
+        Stop worker processes.
+        """
+        for _ in self.workers:
+            self.task_queue.put(None)
+        for worker in self.workers:
+            worker.join()
+        self.workers = []
+
+    def __del__(self):
+        self.close()
+
+    def _stage(self, slot):
+        """
+        Copy a slot into host arrays (synchronously, so the slot can be reused) and start copying to devices.
+        """
+        fields = []
+        for field in slot:
+            host_array = mx.nd.array(field, ctx=self.host_ctx, dtype=field.dtype)
+            fields.append(gluon.utils.split_and_load(host_array, ctx_list=self.ctx, batch_axis=0))
+        return PrefetchedBatch(fields)
+
+    def _start_workers(self):
+        sample = self._dataset[0]
+        self.field_specs = []
+        for value in sample:
+            value = _to_numpy(value)
+            self.field_specs.append((value.shape, value.dtype))
+
+        slot_raw_arrays = []
+        for _ in range(self.num_slots):
+            slot_raw_arrays.append([multiprocessing.RawArray(ctypes.c_byte, self.batch_size * int(np.prod(shape)) *
+                                                             dtype.itemsize)
+                                    for shape, dtype in self.field_specs])
+        self.slots = [_get_slot_views(raw_arrays, self.field_specs, self.batch_size)
+                      for raw_arrays in slot_raw_arrays]
+
+        self.task_queue = multiprocessing.Queue()
+        self.ready_queue = multiprocessing.Queue()
+        base_seed = np.random.randint(2 ** 30)
+        for i in range(self.num_workers):
+            worker = multiprocessing.Process(
+                target=_worker_loop,
+                args=(self._dataset, slot_raw_arrays, self.field_specs, self.batch_size, self.task_queue,
+                      self.ready_queue, base_seed + i))
+            worker.daemon = True
+            worker.start()
+            self.workers.append(worker)
@@ -0,0 +1,150 @@
+"""
+    On-disk cache of exported (pre-hybridized) models for inference. A model is stored as a symbol and parameters, so
+    it's loaded as a `SymbolBlock` without building the Python block tree and tracing the graph.
+"""
+
+__all__ = ['get_weights_sha1', 'get_symbol_cache_file_prefix', 'is_symbol_cache_ready', 'load_symbol_cache',
+           'save_symbol_cache']
+
+import os
+import json
+import logging
+import mxnet as mx
+from .gluoncv2.models.model_store import get_model_name_suffix_data
+from common.file_utils import replace_file
+from common.model_cache_key import get_weights_sha1 as get_store_weights_sha1, calc_cache_key_hash
+
+_meta_file_suffix = '-meta.json'
+
+
+def get_weights_sha1(model_name,
+                     use_pretrained,
+                     pretrained_model_file_path):
+    """
+    Get SHA-1 hash of model weights (the model store of this framework is used for pretrained weights).
+
+    Parameters:
+    ----------
+    model_name : str
+        Name of the model.
+    use_pretrained : bool
+        Whether the pretrained weights from the model store are used.
+    pretrained_model_file_path : str
+        Path to the file with weights (or empty string).
+
+    Returns
+    -------
+    str or None
+        SHA-1 hash (None for randomly initialized weights).
+    """
+    return get_store_weights_sha1(
+        model_name=model_name,
+        use_pretrained=use_pretrained,
+        pretrained_model_file_path=pretrained_model_file_path,
+        get_model_name_suffix_data=get_model_name_suffix_data)
+
+
+def get_symbol_cache_file_prefix(cache_dir_path,
+                                 model_name,
+                                 dtype,
+                                 input_shape,
+                                 weights_sha1,
+                                 **kwargs):
+    """
+    Get the path prefix of cached model files.
+
+    Parameters:
+    ----------
+    cache_dir_path : str
+        Directory for cached models.
+    model_name : str
+        Name of the model.
+    dtype : str
+        Data type of the model.
+    input_shape : tuple of int
+        Shape of the input (without the batch dimension), which is used if the model has no `in_size` attribute.
+    weights_sha1 : str
+        SHA-1 hash of model weights.
+
+    Returns
+    -------
+    str
+        Path prefix.
+    """
+    key_hash = calc_cache_key_hash(
+        key=[model_name, str(dtype), str(tuple(input_shape)), weights_sha1],
+        **kwargs)
+    return os.path.join(cache_dir_path, '{}-{}'.format(model_name, key_hash))
+
+
+def is_symbol_cache_ready(file_prefix):
+    return os.path.exists(file_prefix + _meta_file_suffix)
+
+
+def load_symbol_cache(file_prefix,
+                      ctx=mx.cpu()):
+    """
+    Load a cached model.
+
+    Parameters:
+    ----------
+    file_prefix : str
+        Path prefix of cached model files.
+    ctx : Context or list of Context, default CPU
+        The context in which to load the parameters.
+
+    Returns
+    -------
+    SymbolBlock
+        Model (with the same `in_size` attribute as the original one has).
+    """
+    with open(file_prefix + _meta_file_suffix, 'r') as f:
+        meta = json.load(f)
+    net = mx.gluon.SymbolBlock.imports(
+        symbol_file=(file_prefix + '-symbol.json'),
+        input_names=['data'],
+        param_file=(file_prefix + '-0000.params'),
+        ctx=ctx)
+    if meta['in_size'] is not None:
+        net.in_size = tuple(meta['in_size'])
+    return net
+
+
+def save_symbol_cache(net,
+                      file_prefix,
+                      dtype,
+                      input_shape,
+                      ctx=mx.cpu()):
+    """
+    Export a hybridized model into the cache.
+
+    Parameters:
+    ----------
+    net : HybridBlock
+        Model (hybridized and initialized).
+    file_prefix : str
+        Path prefix of cached model files.
+    dtype : str
+        Data type of the model.
+    input_shape : tuple of int
+        Shape of the input (without the batch dimension), which is used if the model has no `in_size` attribute.
+    ctx : Context or list of Context, default CPU
+        Context of model parameters.
+    """
+    cache_dir_path = os.path.dirname(file_prefix)
+    if cache_dir_path and not os.path.exists(cache_dir_path):
+        os.makedirs(cache_dir_path)
+    in_size = tuple(net.in_size) if hasattr(net, 'in_size') else None
+    if in_size is not None:
+        input_shape = tuple(input_shape[:-2]) + in_size
+    ctx0 = ctx[0] if isinstance(ctx, (list, tuple)) else ctx
+    x = mx.nd.zeros((1,) + tuple(input_shape), ctx=ctx0, dtype=dtype)
+    net(x).wait_to_read()
+    net.export(file_prefix, epoch=0)
+    # The meta file is written last, so it marks a complete cache entry:
+    with open(file_prefix + _meta_file_suffix + '.tmp', 'w') as f:
+        json.dump({'in_size': in_size}, f)
+    replace_file(
+        src_file_path=(file_prefix + _meta_file_suffix + '.tmp'),
+        dst_file_path=(file_prefix + _meta_file_suffix))
+    logging.info('Model is exported into the symbol cache: {}'.format(file_prefix))
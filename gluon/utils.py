@@ -1,9 +1,18 @@
 import os
 import re
 import logging
+import resource
 import numpy as np
 import mxnet as mx
+from mxnet.gluon import nn
+from mxnet.gluon.contrib.nn import Identity
+from collections import OrderedDict
+from common.mmap_weights import is_mmap_weights_file, save_mmap_weights, load_mmap_weights
+from common.bn_folding import fold_bn_into_prev_conv, fold_bn_into_next_conv
+from common.channel_folding import get_channel_shuffle_permutation, densify_gathered_dense
 from .gluoncv2.model_provider import get_model
+from .symbol_cache import get_weights_sha1, get_symbol_cache_file_prefix, is_symbol_cache_ready, load_symbol_cache,\
+    save_symbol_cache
 
 
 def prepare_mx_context(num_gpus,
@@ -13,6 +22,551 @@ def prepare_mx_context(num_gpus,
     return ctx, batch_size
 
 
+def prepare_mx_kvstore(kvstore,
+                       num_gpus,
+                       batch_size):
+    """
+    Prepare a key-value store (or Horovod) for data-parallel training and the context of the current worker. For
+    distributed key-value stores a worker uses all local GPUs, for Horovod a worker uses a single GPU.
+
+    Parameters:
+    ----------
+    kvstore : str
+        Type of key-value store ('local', 'device', 'dist_sync', 'dist_device_sync') or 'horovod'.
+    num_gpus : int
+        Number of GPUs to use.
+    batch_size : int
+        Batch size per device.
+
+    Returns
+    -------
+    tuple of (str or KVStore), int, int, list of Context, int
+        Key-value store for Trainer, rank of the worker, number of workers, context and batch size of the worker.
+    """
+    if kvstore == 'horovod':
+        import horovod.mxnet as hvd
+        hvd.init()
+        ctx = [mx.gpu(hvd.local_rank())] if num_gpus > 0 else [mx.cpu()]
+        return kvstore, hvd.rank(), hvd.size(), ctx, batch_size
+    ctx, batch_size = prepare_mx_context(
+        num_gpus=num_gpus,
+        batch_size=batch_size)
+    if kvstore.startswith('dist'):
+        kv = mx.kvstore.create(kvstore)
+        return kv, kv.rank, kv.num_workers, ctx, batch_size
+    return kvstore, 0, 1, ctx, batch_size
+
+
+def get_mx_memory_usage(ctx):
+    """
+    Get memory usage of a device. For GPU it's the memory held by MXNet (the pooled allocator keeps the peak), for CPU
+    it's the peak resident memory of the process.
+
+    Parameters:
+    ----------
+    ctx : Context
+        MXNet context.
+
+    Returns
+    -------
+    int
+        Memory usage in bytes.
+    """
+    if ctx.device_type == 'gpu':
+        free_memory, total_memory = mx.context.gpu_memory_info(ctx.device_id)
+        return total_memory - free_memory
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class FlatGradBuffer(object):
+    """
+    Flat gradient buffer. Gradients of all trainable parameters (for each context and data type) become views of a
+    single contiguous array, so gradient reset, norm calculation and scaling are single batched operations instead of
+    Python loops over parameters.
+
+    Parameters:
+    ----------
+    params : ParameterDict
+        Parameters of a network.
+    """
+    def __init__(self, params):
+        super(FlatGradBuffer, self).__init__()
+        self.params = [p for p in params.values() if p.grad_req != 'null']
+        self.buffers = None
+
+    def attach(self):
+        """
+        Replace gradients of parameters by views of flat buffers (only once, parameters should be already initialized).
+        Current values of gradients are kept.
+        """
+        if self.buffers is not None:
+            return
+        ctx_list = self.params[0].list_ctx()
+        dtypes = sorted(set(np.dtype(p.dtype).name for p in self.params))
+        self.buffers = []
+        for dtype in dtypes:
+            group = [p for p in self.params if np.dtype(p.dtype).name == dtype]
+            sizes = [int(np.prod(p.shape)) for p in group]
+            ctx_buffers = []
+            for j, ctx in enumerate(ctx_list):
+                buffer = mx.nd.zeros((sum(sizes),), ctx=ctx, dtype=dtype)
+                offset = 0
+                for p, size in zip(group, sizes):
+                    grad_view = buffer[offset:(offset + size)].reshape(p.shape)
+                    grad_view[:] = p.list_grad()[j]
+                    p._grad[j] = grad_view
+                    offset += size
+                ctx_buffers.append(buffer)
+            self.buffers.append(ctx_buffers)
+        for p in self.params:
+            mx.autograd.mark_variables(p.list_data(), p.list_grad(), p.grad_req)
+
+    def zero_grad(self):
+        """
+        Reset gradients on all contexts.
+        """
+        for ctx_buffers in self.buffers:
+            for buffer in ctx_buffers:
+                buffer[:] = 0
+
+    def clip_global_norm(self,
+                         max_norm,
+                         scale=1.0):
+        """
+        Scale gradients and clip them by the global norm, without synchronization with the host. Gradients should be
+        already reduced across contexts (`Trainer.allreduce_grads`). Non-finite gradients stay non-finite.
+
+        Parameters:
+        ----------
+        max_norm : float
+            Maximal global norm of (scaled) gradients.
+        scale : float, default 1.0
+            Scale factor of gradients (e.g. reciprocal of a loss scale).
+        """
+        sum_sq = sum([mx.nd.square(ctx_buffers[0].norm().astype(np.float32)) for ctx_buffers in self.buffers])
+        norm = mx.nd.sqrt(sum_sq) * scale
+        factor = scale * mx.nd.minimum(max_norm / (norm + 1e-8), 1.0)
+        for ctx_buffers in self.buffers:
+            for buffer in ctx_buffers:
+                mx.nd.broadcast_mul(
+                    buffer,
+                    factor.as_in_context(buffer.context).astype(buffer.dtype, copy=False),
+                    out=buffer)
+
+
+class DeviceMetricAccumulator(object):
+    """
+    Running training metrics (loss, top-1 and top-5 accuracy), which are accumulated on devices without synchronization
+    with the host. Values are read back only by `get`, so the engine can pipeline training steps.
+    """
+    def __init__(self):
+        super(DeviceMetricAccumulator, self).__init__()
+        self.reset()
+
+    def reset(self):
+        self.sums = OrderedDict()
+        self.host_sums = np.zeros((3,), np.float64)
+        self.num_batches = 0
+        self.num_samples = 0
+
+    def update(self,
+               labels,
+               preds,
+               losses):
+        """
+        Update metrics by a batch (asynchronously).
+
+        Parameters:
+        ----------
+        labels : list of NDArray
+            Class labels (per context).
+        preds : list of NDArray
+            Predicted scores (per context).
+        losses : list of NDArray
+            Loss values (per context).
+        """
+        for label, pred, loss in zip(labels, preds, losses):
+            ctx = pred.context
+            if ctx not in self.sums:
+                self.sums[ctx] = mx.nd.zeros((3,), ctx=ctx, dtype=np.float32)
+            top5_inds = mx.nd.topk(pred, axis=1, k=min(5, pred.shape[1]))
+            correct = mx.nd.broadcast_equal(top5_inds, label.reshape((-1, 1)).astype(top5_inds.dtype, copy=False))
+            self.sums[ctx] += mx.nd.concat(
+                loss.mean().astype(np.float32, copy=False) / len(losses),
+                correct[:, 0].sum(),
+                correct.sum(),
+                dim=0)
+            self.num_samples += label.shape[0]
+        self.num_batches += 1
+
+    def get(self):
+        """
+        Get metric values (with synchronization).
+
+        Returns
+        -------
+        tuple of 3 float
+            Mean loss, top-1 accuracy and top-5 accuracy.
+        """
+        sums = self.get_state()[0]
+        return (sums[0] / max(1, self.num_batches), sums[1] / max(1, self.num_samples),
+                sums[2] / max(1, self.num_samples))
+
+    def get_state(self):
+        """
+        Get the state of accumulators (with synchronization).
+
+        Returns
+        -------
+        tuple of (np.array, int, int)
+            Sums of loss, top-1 and top-5 hits, number of batches and number of samples.
+        """
+        sums = self.host_sums.copy()
+        for ctx_sums in self.sums.values():
+            sums += ctx_sums.asnumpy()
+        return sums, self.num_batches, self.num_samples
+
+    def set_state(self, state):
+        """
+        Restore the state of accumulators.
+
+        Parameters:
+        ----------
+        state : tuple of (np.array, int, int)
+            State from `get_state`.
+        """
+        self.reset()
+        self.host_sums = np.array(state[0], np.float64)
+        self.num_batches = state[1]
+        self.num_samples = state[2]
+
+
+def save_mmap_params(net,
+                     file_path):
+    """
+    Save parameters of a network into a memory-mappable weight file.
+
+    Parameters:
+    ----------
+    net : HybridBlock
+        Network.
+    file_path : str
+        Path to the file.
+    """
+    arrays = OrderedDict()
+    for name, param in net._collect_params_with_prefix().items():
+        arrays[name] = param._reduce().asnumpy()
+    save_mmap_weights(file_path, arrays)
+
+
+def load_mmap_params(net,
+                     file_path,
+                     ctx=mx.cpu()):
+    """
+    Load parameters of a network from a memory-mappable weight file. On a single CPU context parameters are not copied,
+    but refer directly to the mapped file.
+
+    Parameters:
+    ----------
+    net : HybridBlock
+        Network.
+    file_path : str
+        Path to the file.
+    ctx : Context or list of Context, default CPU
+        The context(s) in which to load the parameters.
+    """
+    if isinstance(ctx, mx.Context):
+        ctx = [ctx]
+    zero_copy = (len(ctx) == 1) and (ctx[0].device_type == 'cpu')
+    arrays = load_mmap_weights(file_path)
+    params = net._collect_params_with_prefix()
+    for name in params.keys():
+        if name not in arrays:
+            raise ValueError('Parameter {} is missing in file {}'.format(name, file_path))
+    for name, array in arrays.items():
+        if name not in params:
+            raise ValueError('Parameter {} from file {} is not present in the network'.format(name, file_path))
+        param = params[name]
+        if zero_copy and (np.dtype(param.dtype) == array.dtype):
+            data = mx.nd.from_numpy(array, zero_copy=True)
+            param._load_init(data, ctx)
+            param._data = [data]
+            if param._grad is not None:
+                mx.autograd.mark_variables(param._data, param._grad, param.grad_req)
+        else:
+            param._load_init(mx.nd.array(array, ctx=ctx[0], dtype=array.dtype), ctx, cast_dtype=True)
+
+
+def _get_bn_arrays(bn):
+    return {
+        'gamma': (None if bn._kwargs['fix_gamma'] else bn.gamma._reduce().asnumpy()),
+        'beta': bn.beta._reduce().asnumpy(),
+        'running_mean': bn.running_mean._reduce().asnumpy(),
+        'running_var': bn.running_var._reduce().asnumpy(),
+        'eps': bn._kwargs['eps']}
+
+
+def _set_conv_weight_bias(conv,
+                          weight,
+                          bias):
+    conv.weight.set_data(mx.nd.array(weight, dtype=weight.dtype))
+    if conv.bias is None:
+        conv.bias = conv.params.get(
+            'bias',
+            shape=bias.shape,
+            dtype=conv.weight.dtype,
+            init='zeros',
+            allow_deferred_init=True)
+        conv.bias.initialize(ctx=conv.weight.list_ctx())
+        conv._kwargs['no_bias'] = False
+    conv.bias.set_data(mx.nd.array(bias, dtype=bias.dtype))
+
+
+def _replace_child(block,
+                   name,
+                   child):
+    # Block doesn't allow to change the type of a child block by assignment:
+    del block.__dict__[name]
+    setattr(block, name, child)
+
+
+def fuse_for_inference(net):
+    """
+    Fold inference-mode Batch normalization layers of convolution blocks into the convolutions. BatchNorm of `ConvBlock`
+    is folded into the convolution after which it is applied (including grouped and depthwise ones). BatchNorm of
+    `PreConvBlock` is folded into the convolution only if the block is neither activated nor returns the
+    pre-activation, and the convolution has no padding. Folded BatchNorm layers are replaced by `Identity`. The network
+    should be initialized, and it shouldn't be run in hybridized mode before folding.
+
+    Parameters:
+    ----------
+    net : HybridBlock
+        Network.
+
+    Returns
+    -------
+    int
+        Number of folded BatchNorm layers.
+    """
+    from .gluoncv2.models.common import ConvBlock, PreConvBlock
+    blocks = []
+    net.apply(blocks.append)
+    fused_count = 0
+    for block in blocks:
+        if not (isinstance(block, (ConvBlock, PreConvBlock)) and isinstance(block.bn, nn.BatchNorm) and
+                (block.bn._kwargs['axis'] == 1)):
+            continue
+        conv = block.conv
+        weight = conv.weight._reduce().asnumpy()
+        bias = None if conv.bias is None else conv.bias._reduce().asnumpy()
+        if isinstance(block, ConvBlock):
+            weight, bias = fold_bn_into_prev_conv(
+                weight=weight,
+                bias=bias,
+                **_get_bn_arrays(block.bn))
+        else:
+            if block.activate or block.return_preact or any(conv._kwargs['pad']):
+                continue
+            weight, bias = fold_bn_into_next_conv(
+                weight=weight,
+                bias=bias,
+                groups=conv._kwargs['num_group'],
+                **_get_bn_arrays(block.bn))
+        _set_conv_weight_bias(conv, weight, bias)
+        _replace_child(block, 'bn', Identity())
+        fused_count += 1
+    return fused_count
+
+
+def compact_condensenet(net):
+    """
+    Compact CondenseNet for inference. In each unit the BatchNorm of the simple convolution block is folded into the
+    grouped convolution of the complex convolution block, through the inverse of the channel shuffle between them, so
+    the convolution keeps its groups (and MACs). The channel gather and the shuffle themselves are kept, since the
+    gather reads the concatenation of features, which is shared by all next units with different indices, and the
+    shuffle mixes groups of both grouped convolutions. The feature gather of the classifier is folded into its weight.
+    The network should be initialized, and it shouldn't be run in hybridized mode before compaction.
+
+    Parameters:
+    ----------
+    net : CondenseNet
+        Network.
+
+    Returns
+    -------
+    int
+        Number of compacted blocks.
+    """
+    from .gluoncv2.models.condensenet import CondenseNet, CondenseUnit, CondenseDense
+    assert isinstance(net, CondenseNet)
+    blocks = []
+    net.apply(blocks.append)
+    compacted_count = 0
+    for block in blocks:
+        if not isinstance(block, CondenseUnit):
+            continue
+        conv = block.conv1.conv
+        weight = conv.weight._reduce().asnumpy()
+        # Channel `c` of the shuffle output is channel `perm[c]` of the convolution output:
+        perm = get_channel_shuffle_permutation(weight.shape[0], conv._kwargs['num_group'])
+        bn_arrays = _get_bn_arrays(block.conv2.bn)
+        for name in ['gamma', 'beta', 'running_mean', 'running_var']:
+            if bn_arrays[name] is not None:
+                bn_arrays[name] = bn_arrays[name][np.argsort(perm)]
+        weight, bias = fold_bn_into_prev_conv(
+            weight=weight,
+            bias=None,
+            **bn_arrays)
+        _set_conv_weight_bias(conv, weight, bias)
+        _replace_child(block.conv2, 'bn', Identity())
+        compacted_count += 1
+
+    for name, block in list(net.output._children.items()):
+        if not isinstance(block, CondenseDense):
+            continue
+        in_units = net.features[-2].bn.running_mean.shape[0]
+        dense = block.dense
+        weight = densify_gathered_dense(
+            weight=dense.weight._reduce().asnumpy(),
+            index=block.index.data().asnumpy().astype(np.int64),
+            in_units=in_units)
+        compact_dense = nn.Dense(
+            units=weight.shape[0],
+            in_units=in_units)
+        compact_dense.initialize(ctx=dense.weight.list_ctx())
+        compact_dense.weight.set_data(mx.nd.array(weight, dtype=weight.dtype))
+        compact_dense.bias.set_data(dense.bias._reduce())
+        net.output._children[name] = compact_dense
+        compacted_count += 1
+    return compacted_count
+
+
+def _get_shuffle_permutation(shuffle,
+                             channels):
+    from .gluoncv2.models.common import ChannelShuffle2
+    if isinstance(shuffle, ChannelShuffle2):
+        return get_channel_shuffle_permutation(channels, shuffle.channels_per_group)
+    return get_channel_shuffle_permutation(channels, shuffle.groups)
+
+
+def _is_per_channel(block,
+                    channels):
+    return all([param.shape[0] == channels for param in block.collect_params().values()])
+
+
+def _permute_channels(block,
+                      perm):
+    for param in block.collect_params().values():
+        data = param._reduce().asnumpy()
+        param.set_data(mx.nd.array(data[perm], dtype=data.dtype))
+
+
+def _permute_conv_inputs(conv,
+                         perm):
+    weight = conv.weight._reduce().asnumpy()
+    conv.weight.set_data(mx.nd.array(weight[:, perm], dtype=weight.dtype))
+
+
+def _get_sequential_leaves(block):
+    if not isinstance(block, nn.HybridSequential):
+        return [block]
+    return [leaf for child in block._children.values() for leaf in _get_sequential_leaves(child)]
+
+
+def _get_shuffle_consumers(block):
+    """
+    Get layers, which consume the output of a channel shuffle applied just before the block: per-channel layers and
+    dense (ungrouped) convolutions, which are applied to the block input (directly or after per-channel layers).
+
+    Parameters:
+    ----------
+    block : HybridBlock
+        Block.
+
+    Returns
+    -------
+    tuple of (list of HybridBlock, list of Conv2D) or None
+        Per-channel layers and convolutions (None if the block input is consumed by other layers).
+    """
+    from .gluoncv2.models.common import ConvBlock
+    from .gluoncv2.models.shufflenetv2 import ShuffleUnit as ShuffleNetV2Unit
+    from .gluoncv2.models.shufflenetv2b import ShuffleUnit as ShuffleNetV2bUnit
+    if isinstance(block, ShuffleNetV2Unit) and block.downsample:
+        per_channel_blocks = [block.dw_conv4, block.dw_bn4]
+        convs = [block.expand_conv5, block.compress_conv1]
+    elif isinstance(block, ShuffleNetV2bUnit) and block.downsample:
+        per_channel_blocks = [block.shortcut_dconv]
+        convs = [block.shortcut_conv.conv, block.conv1.conv]
+    elif isinstance(block, ConvBlock):
+        per_channel_blocks = []
+        convs = [block.conv]
+    else:
+        return None
+    channels = convs[0].weight.shape[1]
+    if not (all([(conv._kwargs['num_group'] == 1) and (conv.weight.shape[1] == channels) for conv in convs]) and
+            all([_is_per_channel(per_channel_block, channels) for per_channel_block in per_channel_blocks])):
+        return None
+    return per_channel_blocks, convs
+
+
+def fold_channel_shuffles(net):
+    """
+    Fold channel shuffle layers (`ChannelShuffle` and `ChannelShuffle2`) into adjacent convolutions for inference. A
+    shuffle is folded into the output channel order of the previous convolution (and its BatchNorm), if it's an
+    ungrouped one (ShuffleNet and MENet units), or into the input channel order of the next ungrouped convolutions
+    (and intermediate per-channel layers), if the shuffle output is consumed only by them (ShuffleNetV2 units, which are
+    followed by a downsampling unit or by the final block). Folded shuffles are replaced by `Identity`. The rest (e.g.
+    shuffles between grouped convolutions or before a channel split) are kept. The network should be initialized, and
+    it shouldn't be run in hybridized mode before folding.
+
+    Parameters:
+    ----------
+    net : HybridBlock
+        Network.
+
+    Returns
+    -------
+    int
+        Number of folded shuffle layers.
+    """
+    from .gluoncv2.models.common import ChannelShuffle, ChannelShuffle2
+    from .gluoncv2.models.shufflenet import ShuffleUnit as ShuffleNetUnit
+    from .gluoncv2.models.menet import MEUnit
+    from .gluoncv2.models.shufflenetv2 import ShuffleUnit as ShuffleNetV2Unit
+    from .gluoncv2.models.shufflenetv2b import ShuffleUnit as ShuffleNetV2bUnit
+    blocks = []
+    net.apply(blocks.append)
+    folded_count = 0
+    for block in blocks:
+        if not (isinstance(block, (ShuffleNetUnit, MEUnit)) and isinstance(block.c_shuffle, ChannelShuffle) and
+                (block.compress_conv1._kwargs['num_group'] == 1)):
+            continue
+        perm = _get_shuffle_permutation(block.c_shuffle, block.compress_conv1.weight.shape[0])
+        _permute_channels(block.compress_conv1, perm)
+        _permute_channels(block.compress_bn1, perm)
+        _replace_child(block, 'c_shuffle', Identity())
+        folded_count += 1
+
+    if hasattr(net, 'features'):
+        units = _get_sequential_leaves(net.features)
+        for unit, next_unit in zip(units[:-1], units[1:]):
+            if not (isinstance(unit, (ShuffleNetV2Unit, ShuffleNetV2bUnit)) and
+                    isinstance(unit.c_shuffle, (ChannelShuffle, ChannelShuffle2))):
+                continue
+            consumers = _get_shuffle_consumers(next_unit)
+            if consumers is None:
+                continue
+            per_channel_blocks, convs = consumers
+            inv_perm = np.argsort(_get_shuffle_permutation(unit.c_shuffle, convs[0].weight.shape[1]))
+            for per_channel_block in per_channel_blocks:
+                _permute_channels(per_channel_block, inv_perm)
+            for conv in convs:
+                _permute_conv_inputs(conv, inv_perm)
+            _replace_child(unit, 'c_shuffle', Identity())
+            folded_count += 1
+    return folded_count
+
+
 def prepare_model(model_name,
                   use_pretrained,
                   pretrained_model_file_path,
@@ -21,7 +575,36 @@ def prepare_model(model_name,
                   classes=None,
                   in_channels=None,
                   do_hybridize=True,
-                  ctx=mx.cpu()):
+                  fuse_bn=False,
+                  ctx=mx.cpu(),
+                  symbol_cache_dir='',
+                  input_image_size=(224, 224)):
+    symbol_cache_file_prefix = None
+    if symbol_cache_dir and do_hybridize and not tune_layers:
+        weights_sha1 = get_weights_sha1(
+            model_name=model_name,
+            use_pretrained=use_pretrained,
+            pretrained_model_file_path=pretrained_model_file_path)
+        if weights_sha1 is not None:
+            input_shape = (in_channels if in_channels is not None else 3,) + tuple(input_image_size)
+            symbol_cache_file_prefix = get_symbol_cache_file_prefix(
+                cache_dir_path=symbol_cache_dir,
+                model_name=model_name,
+                dtype=dtype,
+                input_shape=input_shape,
+                weights_sha1=weights_sha1,
+                classes=classes,
+                fuse_bn=fuse_bn)
+            if is_symbol_cache_ready(symbol_cache_file_prefix):
+                logging.info('Loading model from the symbol cache: {}'.format(symbol_cache_file_prefix))
+                net = load_symbol_cache(
+                    file_prefix=symbol_cache_file_prefix,
+                    ctx=ctx)
+                net.hybridize(
+                    static_alloc=True,
+                    static_shape=True)
+                return net
+
     kwargs = {'ctx': ctx,
               'pretrained': use_pretrained}
     if classes is not None:
@@ -31,7 +614,8 @@ def prepare_model(model_name,
 
     net = get_model(model_name, **kwargs)
 
-    if pretrained_model_file_path:
+    use_mmap = pretrained_model_file_path and is_mmap_weights_file(pretrained_model_file_path)
+    if pretrained_model_file_path and not use_mmap:
         assert (os.path.isfile(pretrained_model_file_path))
         logging.info('Loading model: {}'.format(pretrained_model_file_path))
         net.load_parameters(
@@ -40,6 +624,14 @@ def prepare_model(model_name,
 
     net.cast(dtype)
 
+    if use_mmap:
+        assert (os.path.isfile(pretrained_model_file_path))
+        logging.info('Mapping model: {}'.format(pretrained_model_file_path))
+        load_mmap_params(
+            net=net,
+            file_path=pretrained_model_file_path,
+            ctx=ctx)
+
     if do_hybridize:
         net.hybridize(
             static_alloc=True,
@@ -65,6 +657,18 @@ def prepare_model(model_name,
                 continue
             param.initialize(mx.init.MSRAPrelu(), ctx=ctx)
 
+    if fuse_bn:
+        fused_count = fuse_for_inference(net)
+        logging.info('Folded {} BatchNorm layers into convolutions'.format(fused_count))
+
+    if (symbol_cache_file_prefix is not None) and isinstance(net, mx.gluon.HybridBlock):
+        save_symbol_cache(
+            net=net,
+            file_prefix=symbol_cache_file_prefix,
+            dtype=dtype,
+            input_shape=input_shape,
+            ctx=ctx)
+
     return net
 
 
@@ -100,6 +704,50 @@ def validate(acc_top1,
     return 1.0 - top1, 1.0 - top5
 
 
+def validate_multi(nets,
+                   val_data,
+                   batch_fn,
+                   data_source_needs_reset,
+                   dtype,
+                   ctx):
+    """
+    Validate several models (with the same input size) on a single pass over the data source.
+
+    Parameters:
+    ----------
+    nets : list of HybridBlock
+        Models.
+    val_data : DataLoader or ImageRecordIter
+        Validation data source.
+    batch_fn : function
+        Function for splitting data after extraction from data loader.
+    data_source_needs_reset : bool
+        Whether the data source needs to be reset.
+    dtype : str
+        Base data type for tensors.
+    ctx : list of Context
+        MXNet context.
+
+    Returns
+    -------
+    list of tuple of 2 float
+        Top-1 and top-5 errors for each model.
+    """
+    if data_source_needs_reset:
+        val_data.reset()
+    acc_top1_list = [mx.metric.Accuracy() for _ in nets]
+    acc_top5_list = [mx.metric.TopKAccuracy(5) for _ in nets]
+    for batch in val_data:
+        data_list, labels_list = batch_fn(batch, ctx)
+        data_list = [X.astype(dtype, copy=False) for X in data_list]
+        for net, acc_top1, acc_top5 in zip(nets, acc_top1_list, acc_top5_list):
+            outputs_list = [net(X) for X in data_list]
+            acc_top1.update(labels_list, outputs_list)
+            acc_top5.update(labels_list, outputs_list)
+    return [(1.0 - acc_top1.get()[1], 1.0 - acc_top5.get()[1])
+            for acc_top1, acc_top5 in zip(acc_top1_list, acc_top5_list)]
+
+
 def validate1(accuracy_metric,
               net,
               val_data,
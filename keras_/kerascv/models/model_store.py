@@ -2,12 +2,13 @@
     Model store which provides pretrained models.
 """
 
-__all__ = ['get_model_file', 'load_model', 'download_model']
+__all__ = ['get_model_file', 'prefetch', 'load_model', 'download_model']
 
 import os
 import zipfile
 import logging
 import hashlib
+import threading
 import warnings
 import numpy as np
 import h5py
@@ -129,6 +130,11 @@ _model_sha1 = {name: (error, checksum, repo_release_tag) for name, error, checks
 imgclsmob_repo_url = 'https://github.com/osmr/imgclsmob'
 
 
+# Locks of model files, which serialize concurrent requests of the same model (e.g. from several `prefetch` calls):
+_file_locks = {}
+_file_locks_lock = threading.Lock()
+
+
 def get_model_name_suffix_data(model_name):
     if model_name not in _model_sha1:
         raise ValueError("Pretrained model for {name} is not available.".format(name=model_name))
@@ -136,6 +142,20 @@ def get_model_name_suffix_data(model_name):
     return error, sha1_hash, repo_release_tag
 
 
+def _makedirs(dir_path):
+    # The directory can be created concurrently by another download thread:
+    try:
+        os.makedirs(dir_path)
+    except OSError:
+        if not os.path.isdir(dir_path):
+            raise
+
+
+def _get_file_lock(file_path):
+    with _file_locks_lock:
+        return _file_locks.setdefault(os.path.abspath(file_path), threading.Lock())
+
+
 def get_model_file(model_name,
                    local_model_store_dir_path=os.path.join('~', '.keras', 'models')):
     """
@@ -162,33 +182,70 @@ def get_model_file(model_name,
         short_sha1=short_sha1)
     local_model_store_dir_path = os.path.expanduser(local_model_store_dir_path)
     file_path = os.path.join(local_model_store_dir_path, file_name)
-    if os.path.exists(file_path):
-        if _check_sha1(file_path, sha1_hash):
+    with _get_file_lock(file_path):
+        if os.path.exists(file_path):
+            if _check_cached_sha1(file_path, sha1_hash):
+                return file_path
+            else:
+                logging.warning("Mismatch in the content of model file detected. Downloading again.")
+        else:
+            logging.info("Model file not found. Downloading to {}.".format(file_path))
+
+        _makedirs(local_model_store_dir_path)
+
+        zip_file_path = file_path + ".zip"
+        _download(
+            url="{repo_url}/releases/download/{repo_release_tag}/{file_name}.zip".format(
+                repo_url=imgclsmob_repo_url,
+                repo_release_tag=repo_release_tag,
+                file_name=file_name),
+            path=zip_file_path,
+            overwrite=True)
+        with zipfile.ZipFile(zip_file_path) as zf:
+            zf.extractall(local_model_store_dir_path)
+        os.remove(zip_file_path)
+
+        if _check_cached_sha1(file_path, sha1_hash):
             return file_path
         else:
-            logging.warning("Mismatch in the content of model file detected. Downloading again.")
-    else:
-        logging.info("Model file not found. Downloading to {}.".format(file_path))
-
-    if not os.path.exists(local_model_store_dir_path):
-        os.makedirs(local_model_store_dir_path)
-
-    zip_file_path = file_path + ".zip"
-    _download(
-        url="{repo_url}/releases/download/{repo_release_tag}/{file_name}.zip".format(
-            repo_url=imgclsmob_repo_url,
-            repo_release_tag=repo_release_tag,
-            file_name=file_name),
-        path=zip_file_path,
-        overwrite=True)
-    with zipfile.ZipFile(zip_file_path) as zf:
-        zf.extractall(local_model_store_dir_path)
-    os.remove(zip_file_path)
-
-    if _check_sha1(file_path, sha1_hash):
-        return file_path
-    else:
-        raise ValueError("Downloaded file has different hash. Please try again.")
+            raise ValueError("Downloaded file has different hash. Please try again.")
+
+
+def prefetch(model_names,
+             workers=4,
+             local_model_store_dir_path=os.path.join('~', '.keras', 'models')):
+    """
+    Return locations for several pretrained models, downloading the missing ones concurrently. Interrupted downloads
+    are resumed.
+
+    Parameters
+    ----------
+    model_names : list of str
+        Names of the models.
+    workers : int, default 4
+        Number of concurrent downloads.
+    local_model_store_dir_path : str, default $KERAS_HOME/models
+        Location for keeping the model parameters.
+
+    Returns
+    -------
+    list of str
+        Paths to the requested pretrained model files.
+    """
+    from multiprocessing.pool import ThreadPool
+    # Each model is downloaded once, even if it's requested several times:
+    unique_model_names = sorted(set(model_names), key=model_names.index)
+    pool = ThreadPool(processes=max(1, min(workers, len(unique_model_names))))
+    try:
+        file_paths = dict(zip(unique_model_names, pool.map(
+            lambda model_name: get_model_file(
+                model_name=model_name,
+                local_model_store_dir_path=local_model_store_dir_path),
+            unique_model_names)))
+    finally:
+        pool.close()
+        pool.join()
+    return [file_paths[model_name] for model_name in model_names]
 
 
 def _download(url, path=None, overwrite=False, sha1_hash=None, retries=5, verify_ssl=True):
@@ -242,20 +299,27 @@ def _download(url, path=None, overwrite=False, sha1_hash=None, retries=5, verify
 
     if overwrite or not os.path.exists(fname) or (sha1_hash and not _check_sha1(fname, sha1_hash)):
         dirname = os.path.dirname(os.path.abspath(os.path.expanduser(fname)))
-        if not os.path.exists(dirname):
-            os.makedirs(dirname)
+        _makedirs(dirname)
+        part_fname = fname + '.part'
         while retries + 1 > 0:
             # Disable pyling too broad Exception
             # pylint: disable=W0703
             try:
-                print("Downloading {} from {}...".format(fname, url))
-                r = requests.get(url, stream=True, verify=verify_ssl)
-                if r.status_code != 200:
-                    raise RuntimeError("Failed downloading url {}".format(url))
-                with open(fname, "wb") as f:
-                    for chunk in r.iter_content(chunk_size=1024):
-                        if chunk:  # filter out keep-alive new chunks
-                            f.write(chunk)
+                print('Downloading {} from {}...'.format(fname, url))
+                part_size = os.path.getsize(part_fname) if os.path.exists(part_fname) else 0
+                headers = {'Range': 'bytes={}-'.format(part_size)} if part_size > 0 else None
+                r = requests.get(url, stream=True, verify=verify_ssl, headers=headers)
+                # The status 416 means that the partial file from the previous attempt is already complete:
+                if r.status_code != 416:
+                    if r.status_code not in (200, 206):
+                        raise RuntimeError("Failed downloading url {}".format(url))
+                    with open(part_fname, 'ab' if r.status_code == 206 else 'wb') as f:
+                        for chunk in r.iter_content(chunk_size=1048576):
+                            if chunk:  # filter out keep-alive new chunks
+                                f.write(chunk)
+                if os.path.exists(fname):
+                    os.remove(fname)
+                os.rename(part_fname, fname)
                 if sha1_hash and not _check_sha1(fname, sha1_hash):
                     raise UserWarning("File {} is downloaded but the content hash does not match."
                                       " The repo may be outdated or download may be incomplete. "
@@ -299,6 +363,38 @@ def _check_sha1(filename, sha1_hash):
     return sha1.hexdigest() == sha1_hash
 
 
+def _check_cached_sha1(file_path, sha1_hash):
+    """
+    Check whether the sha1 hash of the file content matches the expected hash. The content is hashed only if the file
+    size or modification time differ from the ones saved in the sidecar stamp file, which is rewritten after each
+    successful check.
+
+    Parameters
+    ----------
+    file_path : str
+        Path to the file.
+    sha1_hash : str
+        Expected sha1 hash in hexadecimal digits.
+
+    Returns
+    -------
+    bool
+        Whether the file content matches the expected hash.
+    """
+    stamp_file_path = file_path + '.sha1'
+    file_stat = os.stat(file_path)
+    stamp = '{}\t{}\t{:.6f}'.format(sha1_hash, file_stat.st_size, file_stat.st_mtime)
+    if os.path.exists(stamp_file_path):
+        with open(stamp_file_path, 'r') as f:
+            if f.read() == stamp:
+                return True
+    if not _check_sha1(file_path, sha1_hash):
+        return False
+    with open(stamp_file_path, 'w') as f:
+        f.write(stamp)
+    return True
+
+
 def _preprocess_weights_for_loading(layer,
                                     weights):
     """
@@ -6,6 +6,8 @@ import torch.utils.data
 import torchvision.transforms as transforms
 import torchvision.datasets as datasets
 
+from common.shard_sampler import ShardSampler
+
 __all__ = ['add_dataset_parser_arguments', 'get_train_data_loader', 'get_val_data_loader']
 
 
@@ -56,7 +58,8 @@ def add_dataset_parser_arguments(parser,
 def get_train_data_loader(dataset_name,
                           dataset_dir,
                           batch_size,
-                          num_workers):
+                          num_workers,
+                          use_distributed=False):
     mean_rgb = (0.4914, 0.4822, 0.4465)
     std_rgb = (0.2023, 0.1994, 0.2010)
     jitter_param = 0.4
@@ -98,7 +101,8 @@ def get_train_data_loader(dataset_name,
     train_loader = torch.utils.data.DataLoader(
         dataset=dataset,
         batch_size=batch_size,
-        shuffle=True,
+        shuffle=(not use_distributed),
+        sampler=(torch.utils.data.distributed.DistributedSampler(dataset) if use_distributed else None),
         num_workers=num_workers,
         pin_memory=True)
 
@@ -108,7 +112,8 @@ def get_train_data_loader(dataset_name,
 def get_val_data_loader(dataset_name,
                         dataset_dir,
                         batch_size,
-                        num_workers):
+                        num_workers,
+                        use_distributed=False):
     mean_rgb = (0.4914, 0.4822, 0.4465)
     std_rgb = (0.2023, 0.1994, 0.2010)
 
@@ -144,6 +149,10 @@ def get_val_data_loader(dataset_name,
         dataset=dataset,
         batch_size=batch_size,
         shuffle=False,
+        sampler=(ShardSampler(
+            length=len(dataset),
+            num_parts=torch.distributed.get_world_size(),
+            part_index=torch.distributed.get_rank()) if use_distributed else None),
         num_workers=num_workers,
         pin_memory=True)
 
@@ -8,6 +8,10 @@ import torch.utils.data
 import torchvision.transforms as transforms
 import torchvision.datasets as datasets
 
+from common.val_crop_cache import ValCropCache, get_val_crop_cache_dir_path
+from common.val_crop_cache import is_val_crop_cache_ready, write_val_crop_cache
+from common.shard_sampler import ShardSampler
+
 __all__ = ['add_dataset_parser_arguments', 'get_train_data_loader', 'get_val_data_loader']
 
 
@@ -44,6 +48,11 @@ def add_dataset_parser_arguments(parser):
         '--use-cv-resize',
         action='store_true',
         help='use OpenCV resize preprocessing')
+    parser.add_argument(
+        '--val-cache-dir',
+        type=str,
+        default='',
+        help='directory of preprocessed validation image cache (disabled if empty)')
 
 
 def cv_loader(path):
@@ -115,7 +124,9 @@ class CvResize(object):
 def get_train_data_loader(data_dir,
                           batch_size,
                           num_workers,
-                          input_image_size=224):
+                          input_image_size=224,
+                          sampler=None,
+                          use_distributed=False):
     mean_rgb = (0.485, 0.456, 0.406)
     std_rgb = (0.229, 0.224, 0.225)
     jitter_param = 0.4
@@ -132,30 +143,126 @@ def get_train_data_loader(data_dir,
             mean=mean_rgb,
             std=std_rgb)])
 
+    dataset = datasets.ImageFolder(
+        root=os.path.join(data_dir, 'train'),
+        transform=transform_train)
+    if sampler is not None:
+        sampler.set_length(len(dataset))
+    if use_distributed:
+        assert (sampler is None)
+        sampler = torch.utils.data.distributed.DistributedSampler(dataset)
     train_loader = torch.utils.data.DataLoader(
-        dataset=datasets.ImageFolder(
-            root=os.path.join(data_dir, 'train'),
-            transform=transform_train),
+        dataset=dataset,
         batch_size=batch_size,
-        shuffle=True,
+        shuffle=(sampler is None),
+        sampler=sampler,
         num_workers=num_workers,
         pin_memory=True)
 
     return train_loader
 
 
+class ValCropCacheLoader(object):
+    """
+    Validation data loader, which streams preprocessed images from the crop cache.
+
+    Parameters:
+    ----------
+    cache : ValCropCache
+        Crop cache.
+    batch_size : int
+        Batch size.
+    mean_rgb : tuple of 3 float
+        Mean values for normalization.
+    std_rgb : tuple of 3 float
+        Standard deviation values for normalization.
+    """
+    def __init__(self,
+                 cache,
+                 batch_size,
+                 mean_rgb,
+                 std_rgb):
+        super(ValCropCacheLoader, self).__init__()
+        self.cache = cache
+        self.batch_size = batch_size
+        self.mean = torch.tensor(mean_rgb).view(1, 3, 1, 1)
+        self.std = torch.tensor(std_rgb).view(1, 3, 1, 1)
+
+    def __len__(self):
+        return (len(self.cache) + self.batch_size - 1) // self.batch_size
+
+    def __iter__(self):
+        for data, label in self.cache.get_batches(self.batch_size):
+            data = torch.from_numpy(np.ascontiguousarray(data)).permute(0, 3, 1, 2).float().div(255)
+            data = data.sub_(self.mean).div_(self.std)
+            yield data, torch.from_numpy(label.astype(np.int64))
+
+
+def get_val_data_cache_loader(data_dir,
+                              cache_dir,
+                              batch_size,
+                              num_workers,
+                              input_image_size,
+                              resize_value,
+                              use_cv_resize,
+                              mean_rgb,
+                              std_rgb):
+    cache_dir_path = get_val_crop_cache_dir_path(
+        cache_dir_path=cache_dir,
+        tag=('pt_cv' if use_cv_resize else 'pt'),
+        input_image_size=(input_image_size, input_image_size),
+        resize_value=resize_value)
+    if not is_val_crop_cache_ready(cache_dir_path):
+        transform_crop = transforms.Compose([
+            CvResize(resize_value) if use_cv_resize else transforms.Resize(resize_value),
+            transforms.CenterCrop(input_image_size),
+            np.asarray])
+        dataset = datasets.ImageFolder(
+            root=os.path.join(data_dir, 'val'),
+            transform=transform_crop)
+        crop_loader = torch.utils.data.DataLoader(
+            dataset=dataset,
+            batch_size=batch_size,
+            shuffle=False,
+            num_workers=num_workers)
+        write_val_crop_cache(
+            cache_dir_path=cache_dir_path,
+            batches=((data.numpy(), target.numpy()) for data, target in crop_loader),
+            num_samples=len(dataset))
+    return ValCropCacheLoader(
+        cache=ValCropCache(cache_dir_path),
+        batch_size=batch_size,
+        mean_rgb=mean_rgb,
+        std_rgb=std_rgb)
+
+
 def get_val_data_loader(data_dir,
                         batch_size,
                         num_workers,
                         input_image_size=224,
                         resize_inv_factor=0.875,
-                        use_cv_resize=False):
+                        use_cv_resize=False,
+                        cache_dir='',
+                        use_distributed=False):
     assert (resize_inv_factor > 0.0)
+    assert not (cache_dir and use_distributed)
     resize_value = int(math.ceil(float(input_image_size) / resize_inv_factor))
 
     mean_rgb = (0.485, 0.456, 0.406)
     std_rgb = (0.229, 0.224, 0.225)
 
+    if cache_dir:
+        return get_val_data_cache_loader(
+            data_dir=data_dir,
+            cache_dir=cache_dir,
+            batch_size=batch_size,
+            num_workers=num_workers,
+            input_image_size=input_image_size,
+            resize_value=resize_value,
+            use_cv_resize=use_cv_resize,
+            mean_rgb=mean_rgb,
+            std_rgb=std_rgb)
+
     transform_test = transforms.Compose([
         CvResize(resize_value) if use_cv_resize else transforms.Resize(resize_value),
         transforms.CenterCrop(input_image_size),
@@ -172,6 +279,10 @@ def get_val_data_loader(data_dir,
         dataset=dataset,
         batch_size=batch_size,
         shuffle=False,
+        sampler=(ShardSampler(
+            length=len(dataset),
+            num_parts=torch.distributed.get_world_size(),
+            part_index=torch.distributed.get_rank()) if use_distributed else None),
         num_workers=num_workers,
         pin_memory=True)
 
@@ -0,0 +1,159 @@
+"""
+    TorchScript compilation of models for inference, with verification against eager mode and with an on-disk cache of
+    serialized modules.
+"""
+
+__all__ = ['get_weights_sha1', 'get_jit_cache_file_path', 'load_jit_cache', 'trace_model']
+
+import os
+import json
+import logging
+import torch
+from .pytorchcv.models.model_store import get_model_name_suffix_data
+from common.file_utils import replace_file
+from common.model_cache_key import get_weights_sha1 as get_store_weights_sha1, calc_cache_key_hash
+
+_meta_file_name = 'meta.json'
+
+
+def get_weights_sha1(model_name,
+                     use_pretrained,
+                     pretrained_model_file_path):
+    """
+    Get SHA-1 hash of model weights (the model store of this framework is used for pretrained weights).
+
+    Parameters:
+    ----------
+    model_name : str
+        Name of the model.
+    use_pretrained : bool
+        Whether the pretrained weights from the model store are used.
+    pretrained_model_file_path : str
+        Path to the file with weights (or empty string).
+
+    Returns
+    -------
+    str or None
+        SHA-1 hash (None for randomly initialized weights).
+    """
+    return get_store_weights_sha1(
+        model_name=model_name,
+        use_pretrained=use_pretrained,
+        pretrained_model_file_path=pretrained_model_file_path,
+        get_model_name_suffix_data=get_model_name_suffix_data)
+
+
+def get_jit_cache_file_path(cache_dir_path,
+                            model_name,
+                            weights_sha1,
+                            **kwargs):
+    """
+    Get the path to the cached serialized module.
+
+    Parameters:
+    ----------
+    cache_dir_path : str
+        Directory for cached modules.
+    model_name : str
+        Name of the model.
+    weights_sha1 : str
+        SHA-1 hash of model weights.
+
+    Returns
+    -------
+    str
+        File path.
+    """
+    key_hash = calc_cache_key_hash(
+        key=[model_name, weights_sha1, torch.__version__],
+        **kwargs)
+    return os.path.join(cache_dir_path, '{}-{}.pt'.format(model_name, key_hash))
+
+
+def load_jit_cache(file_path,
+                   use_cuda):
+    """
+    Load a cached serialized module.
+
+    Parameters:
+    ----------
+    file_path : str
+        Path to the file.
+    use_cuda : bool
+        Whether to load the module on GPU.
+
+    Returns
+    -------
+    ScriptModule
+        Module (with the same `in_size` attribute as the original model has).
+    """
+    extra_files = {_meta_file_name: ''}
+    net = torch.jit.load(
+        file_path,
+        map_location=('cuda' if use_cuda else 'cpu'),
+        _extra_files=extra_files)
+    meta = json.loads(extra_files[_meta_file_name])
+    if meta['in_size'] is not None:
+        net.in_size = tuple(meta['in_size'])
+    return net
+
+
+def trace_model(net,
+                input_shape,
+                use_cuda,
+                cache_file_path=None,
+                rtol=1e-3,
+                atol=1e-4):
+    """
+    Trace a model (in inference mode) and verify outputs of the traced module against the eager model on a batch of
+    another size (so batch-size specific traces are rejected).
+
+    Parameters:
+    ----------
+    net : Module
+        Model (on the target device).
+    input_shape : tuple of int
+        Shape of the input (without the batch dimension), which is used if the model has no `in_size` attribute.
+    use_cuda : bool
+        Whether the model is on GPU.
+    cache_file_path : str or None, default None
+        Path for saving the traced module.
+    rtol : float, default 1e-3
+        Relative tolerance for verification.
+    atol : float, default 1e-4
+        Absolute tolerance for verification.
+
+    Returns
+    -------
+    ScriptModule or None
+        Traced module (None if verification is failed).
+    """
+    in_size = tuple(net.in_size) if hasattr(net, 'in_size') else None
+    if in_size is not None:
+        input_shape = tuple(input_shape[:-2]) + in_size
+    device = 'cuda' if use_cuda else 'cpu'
+    net.eval()
+    with torch.no_grad():
+        traced_net = torch.jit.trace(net, torch.randn((1,) + tuple(input_shape), device=device))
+        x = torch.randn((2,) + tuple(input_shape), device=device)
+        y_eager = net(x)
+        y_traced = traced_net(x)
+    if not torch.allclose(y_traced, y_eager, rtol=rtol, atol=atol):
+        logging.warning('Traced module is inconsistent with the eager model (max abs diff: {}), it is discarded'.format(
+            (y_traced - y_eager).abs().max().item()))
+        return None
+    if cache_file_path is not None:
+        cache_dir_path = os.path.dirname(cache_file_path)
+        if cache_dir_path and not os.path.exists(cache_dir_path):
+            os.makedirs(cache_dir_path)
+        torch.jit.save(
+            traced_net,
+            cache_file_path + '.tmp',
+            _extra_files={_meta_file_name: json.dumps({'in_size': in_size})})
+        replace_file(
+            src_file_path=(cache_file_path + '.tmp'),
+            dst_file_path=cache_file_path)
+        logging.info('Traced module is saved into the cache: {}'.format(cache_file_path))
+    if in_size is not None:
+        traced_net.in_size = in_size
+    return traced_net
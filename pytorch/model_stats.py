@@ -1,3 +1,5 @@
+import copy
+import weakref
 import logging
 import numpy as np
 import torch
@@ -7,7 +9,7 @@ from .pytorchcv.models.common import ChannelShuffle, ChannelShuffle2, Identity
 from .pytorchcv.models.fishnet import InterpolationBlock, ChannelSqueeze
 from .pytorchcv.models.irevnet import IRevDownscale, IRevSplitBlock, IRevMergeBlock
 
-__all__ = ['measure_model']
+__all__ = ['measure_model', 'analyze_model', 'get_meta_model', 'LayerStats', 'profile_model_memory']
 
 
 def calc_block_num_params2(net):
@@ -28,6 +30,153 @@ def calc_block_num_params(module):
     return weight_count
 
 
+def calc_module_flops(module,
+                      x_shapes,
+                      y_shape):
+    """
+    Calculate FLOPs and MACs for a leaf module from the shapes of its inputs and output.
+
+    Parameters:
+    ----------
+    module : nn.Module
+        Leaf module.
+    x_shapes : list of tuple of int
+        Shapes of the inputs.
+    y_shape : tuple of int
+        Shape of the (first) output.
+
+    Returns
+    -------
+    tuple of 2 int
+        Numbers of FLOPs and MACs.
+    """
+    x_size = int(np.prod(x_shapes[0]))
+    if isinstance(module, nn.Linear):
+        in_units = module.in_features
+        out_units = module.out_features
+        extra_num_macs = in_units * out_units
+        if module.bias is None:
+            extra_num_flops = (2 * in_units - 1) * out_units
+        else:
+            extra_num_flops = 2 * in_units * out_units
+    elif isinstance(module, nn.ReLU):
+        extra_num_flops = x_size
+        extra_num_macs = 0
+    elif isinstance(module, nn.Sigmoid):
+        extra_num_flops = 4 * x_size
+        extra_num_macs = 0
+    elif isinstance(module, nn.LeakyReLU):
+        extra_num_flops = 2 * x_size
+        extra_num_macs = 0
+    elif isinstance(module, nn.ReLU6):
+        extra_num_flops = x_size
+        extra_num_macs = 0
+    elif isinstance(module, nn.PReLU):
+        extra_num_flops = 3 * x_size
+        extra_num_macs = 0
+    elif isinstance(module, nn.Conv2d):
+        x_h = x_shapes[0][2]
+        x_w = x_shapes[0][3]
+        kernel_size = module.kernel_size
+        stride = module.stride
+        dilation = module.dilation
+        padding = module.padding
+        groups = module.groups
+        in_channels = module.in_channels
+        out_channels = module.out_channels
+        y_h = (x_h + 2 * padding[0] - dilation[0] * (kernel_size[0] - 1) - 1) // stride[0] + 1
+        y_w = (x_w + 2 * padding[1] - dilation[1] * (kernel_size[1] - 1) - 1) // stride[1] + 1
+        assert (out_channels == y_shape[1])
+        assert (y_h == y_shape[2])
+        assert (y_w == y_shape[3])
+        kernel_total_size = kernel_size[0] * kernel_size[1]
+        y_size = y_h * y_w
+        extra_num_macs = kernel_total_size * in_channels * y_size * out_channels // groups
+        if module.bias is None:
+            extra_num_flops = (2 * kernel_total_size * y_size - 1) * in_channels * out_channels // groups
+        else:
+            extra_num_flops = 2 * kernel_total_size * in_channels * y_size * out_channels // groups
+    elif isinstance(module, nn.BatchNorm2d):
+        extra_num_flops = 4 * x_size
+        extra_num_macs = 0
+    elif isinstance(module, nn.InstanceNorm2d):
+        extra_num_flops = 4 * x_size
+        extra_num_macs = 0
+    elif isinstance(module, nn.BatchNorm1d):
+        extra_num_flops = 4 * x_size
+        extra_num_macs = 0
+    elif type(module) in [nn.MaxPool2d, nn.AvgPool2d]:
+        assert (x_shapes[0][1] == y_shape[1])
+        kernel_size = module.kernel_size if isinstance(module.kernel_size, tuple) else\
+            (module.kernel_size, module.kernel_size)
+        y_h = y_shape[2]
+        y_w = y_shape[3]
+        channels = x_shapes[0][1]
+        y_size = y_h * y_w
+        pool_total_size = kernel_size[0] * kernel_size[1]
+        extra_num_flops = channels * y_size * pool_total_size
+        extra_num_macs = 0
+    elif type(module) in [nn.AdaptiveAvgPool2d, nn.AdaptiveMaxPool2d]:
+        assert (x_shapes[0][1] == y_shape[1])
+        x_h = x_shapes[0][2]
+        x_w = x_shapes[0][3]
+        y_h = y_shape[2]
+        y_w = y_shape[3]
+        channels = x_shapes[0][1]
+        y_size = y_h * y_w
+        pool_total_size = x_h * x_w
+        extra_num_flops = channels * y_size * pool_total_size
+        extra_num_macs = 0
+    elif isinstance(module, nn.Dropout):
+        extra_num_flops = 0
+        extra_num_macs = 0
+    elif isinstance(module, nn.Sequential):
+        assert (len(module._modules) == 0)
+        extra_num_flops = 0
+        extra_num_macs = 0
+    elif type(module) in [ChannelShuffle, ChannelShuffle2]:
+        extra_num_flops = x_size
+        extra_num_macs = 0
+    elif isinstance(module, nn.ZeroPad2d):
+        extra_num_flops = 0
+        extra_num_macs = 0
+    elif isinstance(module, Identity):
+        extra_num_flops = 0
+        extra_num_macs = 0
+    elif isinstance(module, InterpolationBlock):
+        extra_num_flops = x_size
+        extra_num_macs = 0
+    elif isinstance(module, ChannelSqueeze):
+        extra_num_flops = x_size
+        extra_num_macs = 0
+    elif isinstance(module, IRevDownscale):
+        extra_num_flops = 5 * x_size
+        extra_num_macs = 0
+    elif isinstance(module, IRevSplitBlock):
+        extra_num_flops = x_size
+        extra_num_macs = 0
+    elif isinstance(module, IRevMergeBlock):
+        extra_num_flops = x_size
+        extra_num_macs = 0
+    else:
+        raise TypeError('Unknown layer type: {}'.format(type(module)))
+    return extra_num_flops, extra_num_macs
+
+
+def register_forward_hooks(a_module,
+                           hook):
+    if len(a_module._modules) > 0:
+        assert (calc_block_num_params(a_module) == 0)
+        children_handles = []
+        for child_module in a_module._modules.values():
+            child_handles = register_forward_hooks(child_module, hook)
+            children_handles += child_handles
+        return children_handles
+    else:
+        handle = a_module.register_forward_hook(hook)
+        return [handle]
+
+
 def measure_model(model,
                   in_channels,
                   in_size):
@@ -57,115 +206,11 @@ def measure_model(model,
             assert (len(x) == 1)
         assert (x[0].shape[0] == 1)
         assert (len(module._modules) == 0)
-        if isinstance(module, nn.Linear):
-            in_units = module.in_features
-            out_units = module.out_features
-            extra_num_macs = in_units * out_units
-            if module.bias is None:
-                extra_num_flops = (2 * in_units - 1) * out_units
-            else:
-                extra_num_flops = 2 * in_units * out_units
-        elif isinstance(module, nn.ReLU):
-            extra_num_flops = x[0].numel()
-            extra_num_macs = 0
-        elif isinstance(module, nn.Sigmoid):
-            extra_num_flops = 4 * x[0].numel()
-            extra_num_macs = 0
-        elif isinstance(module, nn.LeakyReLU):
-            extra_num_flops = 2 * x[0].numel()
-            extra_num_macs = 0
-        elif isinstance(module, nn.ReLU6):
-            extra_num_flops = x[0].numel()
-            extra_num_macs = 0
-        elif isinstance(module, nn.PReLU):
-            extra_num_flops = 3 * x[0].numel()
-            extra_num_macs = 0
-        elif isinstance(module, nn.Conv2d):
-            x_h = x[0].shape[2]
-            x_w = x[0].shape[3]
-            kernel_size = module.kernel_size
-            stride = module.stride
-            dilation = module.dilation
-            padding = module.padding
-            groups = module.groups
-            in_channels = module.in_channels
-            out_channels = module.out_channels
-            y_h = (x_h + 2 * padding[0] - dilation[0] * (kernel_size[0] - 1) - 1) // stride[0] + 1
-            y_w = (x_w + 2 * padding[1] - dilation[1] * (kernel_size[1] - 1) - 1) // stride[1] + 1
-            assert (out_channels == y.shape[1])
-            assert (y_h == y.shape[2])
-            assert (y_w == y.shape[3])
-            kernel_total_size = kernel_size[0] * kernel_size[1]
-            y_size = y_h * y_w
-            extra_num_macs = kernel_total_size * in_channels * y_size * out_channels // groups
-            if module.bias is None:
-                extra_num_flops = (2 * kernel_total_size * y_size - 1) * in_channels * out_channels // groups
-            else:
-                extra_num_flops = 2 * kernel_total_size * in_channels * y_size * out_channels // groups
-        elif isinstance(module, nn.BatchNorm2d):
-            extra_num_flops = 4 * x[0].numel()
-            extra_num_macs = 0
-        elif isinstance(module, nn.InstanceNorm2d):
-            extra_num_flops = 4 * x[0].numel()
-            extra_num_macs = 0
-        elif isinstance(module, nn.BatchNorm1d):
-            extra_num_flops = 4 * x[0].numel()
-            extra_num_macs = 0
-        elif type(module) in [nn.MaxPool2d, nn.AvgPool2d]:
-            assert (x[0].shape[1] == y.shape[1])
-            kernel_size = module.kernel_size if isinstance(module.kernel_size, tuple) else\
-                (module.kernel_size, module.kernel_size)
-            y_h = y.shape[2]
-            y_w = y.shape[3]
-            channels = x[0].shape[1]
-            y_size = y_h * y_w
-            pool_total_size = kernel_size[0] * kernel_size[1]
-            extra_num_flops = channels * y_size * pool_total_size
-            extra_num_macs = 0
-        elif type(module) in [nn.AdaptiveAvgPool2d, nn.AdaptiveMaxPool2d]:
-            assert (x[0].shape[1] == y.shape[1])
-            x_h = x[0].shape[2]
-            x_w = x[0].shape[3]
-            y_h = y.shape[2]
-            y_w = y.shape[3]
-            channels = x[0].shape[1]
-            y_size = y_h * y_w
-            pool_total_size = x_h * x_w
-            extra_num_flops = channels * y_size * pool_total_size
-            extra_num_macs = 0
-        elif isinstance(module, nn.Dropout):
-            extra_num_flops = 0
-            extra_num_macs = 0
-        elif isinstance(module, nn.Sequential):
-            assert (len(module._modules) == 0)
-            extra_num_flops = 0
-            extra_num_macs = 0
-        elif type(module) in [ChannelShuffle, ChannelShuffle2]:
-            extra_num_flops = x[0].numel()
-            extra_num_macs = 0
-        elif isinstance(module, nn.ZeroPad2d):
-            extra_num_flops = 0
-            extra_num_macs = 0
-        elif isinstance(module, Identity):
-            extra_num_flops = 0
-            extra_num_macs = 0
-        elif isinstance(module, InterpolationBlock):
-            extra_num_flops = x[0].numel()
-            extra_num_macs = 0
-        elif isinstance(module, ChannelSqueeze):
-            extra_num_flops = x[0].numel()
-            extra_num_macs = 0
-        elif isinstance(module, IRevDownscale):
-            extra_num_flops = 5 * x[0].numel()
-            extra_num_macs = 0
-        elif isinstance(module, IRevSplitBlock):
-            extra_num_flops = x[0].numel()
-            extra_num_macs = 0
-        elif isinstance(module, IRevMergeBlock):
-            extra_num_flops = x[0].numel()
-            extra_num_macs = 0
-        else:
-            raise TypeError('Unknown layer type: {}'.format(type(module)))
+        y0 = y[0] if isinstance(y, (list, tuple)) else y
+        extra_num_flops, extra_num_macs = calc_module_flops(
+            module=module,
+            x_shapes=[tuple(xi.shape) for xi in x if xi is not None],
+            y_shape=tuple(y0.shape))
 
         global num_flops
         global num_macs
@@ -178,19 +223,7 @@ def measure_model(model,
         #     num_params += calc_block_num_params(module)
         num_params += calc_block_num_params(module)
 
-    def register_forward_hooks(a_module):
-        if len(a_module._modules) > 0:
-            assert (calc_block_num_params(a_module) == 0)
-            children_handles = []
-            for child_module in a_module._modules.values():
-                child_handles = register_forward_hooks(child_module)
-                children_handles += child_handles
-            return children_handles
-        else:
-            handle = a_module.register_forward_hook(call_hook)
-            return [handle]
-
-    hook_handles = register_forward_hooks(model)
+    hook_handles = register_forward_hooks(model, call_hook)
 
     x = Variable(torch.zeros(1, in_channels, in_size[0], in_size[1]))
     model.eval()
@@ -205,3 +238,271 @@ def measure_model(model,
     [h.remove() for h in hook_handles]
 
     return num_flops, num_macs, num_params1
+
+
+class LayerStats(object):
+    """
+    Statistics of a leaf module.
+
+    Parameters:
+    ----------
+    name : str
+        Module name.
+    type_name : str
+        Module type name.
+    in_shapes : list of tuple of int
+        Shapes of the inputs.
+    out_shapes : list of tuple of int
+        Shapes of the outputs.
+    num_params : int
+        Number of trainable parameters.
+    num_flops : int or None
+        Number of FLOPs (None for unknown module types).
+    num_macs : int or None
+        Number of MACs (None for unknown module types).
+    """
+    def __init__(self,
+                 name,
+                 type_name,
+                 in_shapes,
+                 out_shapes,
+                 num_params,
+                 num_flops,
+                 num_macs):
+        self.name = name
+        self.type_name = type_name
+        self.in_shapes = in_shapes
+        self.out_shapes = out_shapes
+        self.num_params = num_params
+        self.num_flops = num_flops
+        self.num_macs = num_macs
+
+    @property
+    def num_activations(self):
+        return int(sum([np.prod(shape) for shape in self.out_shapes]))
+
+
+def get_meta_model(model):
+    """
+    Get a copy of the model with all parameters and buffers on the `meta` device (without data).
+
+    Parameters:
+    ----------
+    model : nn.Module
+        Model.
+
+    Returns
+    -------
+    nn.Module
+        Model copy (or the model itself if it is already on the `meta` device).
+    """
+    if not hasattr(torch.Tensor, 'is_meta'):
+        raise RuntimeError('Shape propagation requires PyTorch with `meta` device support (found {})'.format(
+            torch.__version__))
+    if isinstance(model, nn.DataParallel):
+        model = model.module
+    tensors = list(model.parameters()) + list(model.buffers())
+    if all([t.is_meta for t in tensors]):
+        return model
+    memo = {}
+    for param in model.parameters():
+        memo[id(param)] = nn.Parameter(torch.empty_like(param, device='meta'), requires_grad=param.requires_grad)
+    for buffer in model.buffers():
+        memo[id(buffer)] = torch.empty_like(buffer, device='meta')
+    return copy.deepcopy(model, memo)
+
+
+def analyze_model(model,
+                  in_channels,
+                  in_size,
+                  dtype_size=4):
+    """
+    Calculate model statistics by shape propagation: the model is applied to an input on the `meta` device, so only
+    shapes are computed. Models created in the `torch.device('meta')` context are analyzed without a copy.
+
+    Parameters:
+    ----------
+    model : nn.Module
+        Tested model.
+    in_channels : int
+        Number of input channels.
+    in_size : tuple of two ints
+        Spatial size of the expected input image.
+    dtype_size : int, default 4
+        Size of a tensor element in bytes (for activation memory).
+
+    Returns
+    -------
+    num_flops : int
+        Number of FLOPs (for known module types).
+    num_macs : int
+        Number of MACs (for known module types).
+    num_params : int
+        Number of trainable parameters.
+    activation_memory : int
+        Total size of leaf module outputs in bytes.
+    layers : list of LayerStats
+        Per-layer statistics (in the execution order).
+    """
+    model = get_meta_model(model)
+    module_names = {id(module): name for name, module in model.named_modules()}
+    layers = []
+
+    def call_hook(module, x, y):
+        y = list(y) if isinstance(y, (list, tuple)) else [y]
+        x_shapes = [tuple(xi.shape) for xi in x if isinstance(xi, torch.Tensor)]
+        y_shapes = [tuple(yi.shape) for yi in y if isinstance(yi, torch.Tensor)]
+        try:
+            extra_num_flops, extra_num_macs = calc_module_flops(
+                module=module,
+                x_shapes=x_shapes,
+                y_shape=y_shapes[0])
+        except TypeError as e:
+            logging.warning('{} (module {} is skipped)'.format(e, module_names[id(module)]))
+            extra_num_flops = None
+            extra_num_macs = None
+        layers.append(LayerStats(
+            name=module_names[id(module)],
+            type_name=type(module).__name__,
+            in_shapes=x_shapes,
+            out_shapes=y_shapes,
+            num_params=int(calc_block_num_params(module)),
+            num_flops=extra_num_flops,
+            num_macs=extra_num_macs))
+
+    hook_handles = register_forward_hooks(model, call_hook)
+    training = model.training
+    try:
+        model.eval()
+        with torch.no_grad():
+            model(torch.zeros(1, in_channels, in_size[0], in_size[1], device='meta'))
+    finally:
+        [h.remove() for h in hook_handles]
+        model.train(training)
+
+    num_flops = sum([layer.num_flops for layer in layers if layer.num_flops is not None])
+    num_macs = sum([layer.num_macs for layer in layers if layer.num_macs is not None])
+    num_params = int(calc_block_num_params2(model))
+    activation_memory = dtype_size * sum([layer.num_activations for layer in layers])
+    return num_flops, num_macs, num_params, activation_memory, layers
+
+
+def _create_live_tensor_tracker(get_layer_name):
+    """
+    Create a dispatch mode, which tracks the total size of live (non-view) tensors created by operators and its peak
+    value. Dispatch modes are available in PyTorch 2.x only, so they are imported here and not at the module level.
+
+    Parameters:
+    ----------
+    get_layer_name : function
+        Function returning the name of the currently executed layer.
+
+    Returns
+    -------
+    TorchDispatchMode
+        Dispatch mode with `peak_bytes` and `peak_layer` attributes.
+    """
+    try:
+        from torch.utils._python_dispatch import TorchDispatchMode
+    except ImportError:
+        raise RuntimeError('Memory profiling requires PyTorch 2.x (found {})'.format(torch.__version__))
+
+    class LiveTensorTracker(TorchDispatchMode):
+        def __init__(self,
+                     get_layer_name):
+            super(LiveTensorTracker, self).__init__()
+            self.get_layer_name = get_layer_name
+            self.live_bytes = 0
+            self.peak_bytes = 0
+            self.peak_layer = ''
+
+        def _release(self, nbytes):
+            self.live_bytes -= nbytes
+
+        def track(self, tensor):
+            nbytes = tensor.numel() * tensor.element_size()
+            self.live_bytes += nbytes
+            weakref.finalize(tensor, self._release, nbytes)
+            if self.live_bytes > self.peak_bytes:
+                self.peak_bytes = self.live_bytes
+                self.peak_layer = self.get_layer_name()
+
+        def __torch_dispatch__(self, func, types, args=(), kwargs=None):
+            out = func(*args, **(kwargs if kwargs is not None else {}))
+            returns = func._schema.returns
+            outs = out if isinstance(out, (list, tuple)) else [out]
+            for i, out_i in enumerate(outs):
+                is_alias = (i < len(returns)) and (returns[i].alias_info is not None)
+                if isinstance(out_i, torch.Tensor) and not is_alias:
+                    self.track(out_i)
+            return out
+
+    return LiveTensorTracker(get_layer_name)
+
+
+def profile_model_memory(model,
+                         in_channels,
+                         in_size,
+                         batch_size=1,
+                         train=False):
+    """
+    Calculate the peak size of live activation tensors. The model is executed on the `meta` device, and tensors are
+    tracked at the operator level until they are released. In the train mode, the backward pass is included (parameter
+    gradients are counted). Parameters aren't counted.
+
+    Parameters:
+    ----------
+    model : nn.Module
+        Tested model.
+    in_channels : int
+        Number of input channels.
+    in_size : tuple of two ints
+        Spatial size of the expected input image.
+    batch_size : int, default 1
+        Batch size.
+    train : bool, default False
+        Whether to execute the train mode (forward and backward passes).
+
+    Returns
+    -------
+    peak_bytes : int
+        Peak size of live tensors in bytes.
+    peak_layer : str
+        Name of the innermost module, which is executed at the peak (`backward` for the backward pass).
+    """
+    model = get_meta_model(model)
+    module_names = {id(module): name for name, module in model.named_modules()}
+    layer_stack = []
+
+    def get_layer_name():
+        return layer_stack[-1] if layer_stack else 'backward'
+
+    def pre_hook(module, x):
+        layer_stack.append(module_names[id(module)])
+
+    def post_hook(module, x, y):
+        layer_stack.pop()
+
+    hook_handles = []
+    for module in model.modules():
+        hook_handles.append(module.register_forward_pre_hook(pre_hook))
+        hook_handles.append(module.register_forward_hook(post_hook))
+    training = model.training
+    tracker = _create_live_tensor_tracker(get_layer_name)
+    try:
+        model.train(train)
+        with torch.set_grad_enabled(train), tracker:
+            layer_stack.append('input')
+            x = torch.zeros(batch_size, in_channels, in_size[0], in_size[1], device='meta')
+            layer_stack.pop()
+            y = model(x)
+            if train:
+                y = y[0] if isinstance(y, (list, tuple)) else y
+                y.sum().backward()
+            del x, y
+    finally:
+        [h.remove() for h in hook_handles]
+        model.train(training)
+        for param in model.parameters():
+            param.grad = None
+    return tracker.peak_bytes, tracker.peak_layer
@@ -0,0 +1,119 @@
+"""
+    Post-training int8 quantization of models (on CPU) with calibration of activation ranges on validation data.
+"""
+
+__all__ = ['load_calib_batches', 'quantize_model', 'export_quantized_model', 'calc_net_throughput']
+
+import time
+import logging
+import torch
+
+
+def load_calib_batches(val_data,
+                       num_batches):
+    """
+    Load several first batches of data (without labels) from a validation data loader.
+
+    Parameters:
+    ----------
+    val_data : DataLoader
+        Validation data loader.
+    num_batches : int
+        Number of batches.
+
+    Returns
+    -------
+    list of Tensor
+        Data batches.
+    """
+    batches = []
+    for data, _ in val_data:
+        if len(batches) >= num_batches:
+            break
+        batches.append(data)
+    return batches
+
+
+def quantize_model(net,
+                   calib_batches,
+                   backend='fbgemm'):
+    """
+    Quantize a model into int8 (by FX graph mode quantization). Convolutions are fused with BatchNorm and ReLU layers,
+    and activation ranges are calibrated by observers on the given data batches.
+
+    Parameters:
+    ----------
+    net : Module
+        Model (in float32).
+    calib_batches : list of Tensor
+        Calibration data batches.
+    backend : str, default 'fbgemm'
+        Quantized engine ('fbgemm' for x86, 'qnnpack' for ARM).
+
+    Returns
+    -------
+    GraphModule
+        Quantized model.
+    """
+    # FX graph mode quantization is available only in recent PyTorch, so plain evaluation doesn't depend on it:
+    from torch.ao.quantization import get_default_qconfig_mapping
+    from torch.ao.quantization.quantize_fx import prepare_fx, convert_fx
+
+    torch.backends.quantized.engine = backend
+    net.eval()
+    prepared_net = prepare_fx(
+        net,
+        qconfig_mapping=get_default_qconfig_mapping(backend),
+        example_inputs=(calib_batches[0],))
+    with torch.no_grad():
+        for x in calib_batches:
+            prepared_net(x)
+    return convert_fx(prepared_net)
+
+
+def export_quantized_model(qnet,
+                           example_batch,
+                           file_path):
+    """
+    Export a quantized model as a traced TorchScript module.
+
+    Parameters:
+    ----------
+    qnet : Module
+        Quantized model.
+    example_batch : Tensor
+        Example input data batch.
+    file_path : str
+        Path to the file.
+    """
+    with torch.no_grad():
+        traced_qnet = torch.jit.trace(qnet, example_batch)
+    torch.jit.save(traced_qnet, file_path)
+    logging.info('Quantized model is exported: {}'.format(file_path))
+
+
+def calc_net_throughput(net,
+                        batches):
+    """
+    Calculate inference throughput of a model on data batches (without data loading).
+
+    Parameters:
+    ----------
+    net : Module
+        Model.
+    batches : list of Tensor
+        Data batches.
+
+    Returns
+    -------
+    float
+        Number of images per second.
+    """
+    net.eval()
+    with torch.no_grad():
+        net(batches[0])
+        tic = time.time()
+        for x in batches:
+            net(x)
+        num_images = sum(x.size(0) for x in batches)
+        return num_images / (time.time() - tic)
@@ -1,10 +1,18 @@
 import logging
 import os
+import resource
 import numpy as np
+from collections import OrderedDict
 
 import torch.utils.data
+import torch.nn as nn
+import torch.distributed as dist
 
+from common.mmap_weights import is_mmap_weights_file, save_mmap_weights, load_mmap_weights
+from common.bn_folding import fold_bn_into_prev_conv, fold_bn_into_next_conv
+from common.channel_folding import get_channel_shuffle_permutation, densify_gathered_dense
 from .pytorchcv.model_provider import get_model
+from .jit_cache import get_weights_sha1, get_jit_cache_file_path, load_jit_cache, trace_model
 
 
 def prepare_pt_context(num_gpus,
@@ -14,6 +22,483 @@ def prepare_pt_context(num_gpus,
     return use_cuda, batch_size
 
 
+def init_pt_distributed(backend,
+                        use_cuda):
+    """
+    Initialize the default process group for distributed data-parallel training. Process parameters are taken from
+    the environment variables `MASTER_ADDR`, `MASTER_PORT`, `RANK`, `WORLD_SIZE` and `LOCAL_RANK` (as set by
+    `torchrun`). Each process uses a single GPU (or CPU).
+
+    Parameters:
+    ----------
+    backend : str
+        Backend name ('nccl', 'gloo'), empty means 'nccl' for GPUs and 'gloo' for CPU.
+    use_cuda : bool
+        Whether to use CUDA.
+
+    Returns
+    -------
+    tuple of 2 int
+        Rank of the process and number of processes.
+    """
+    if not backend:
+        backend = 'nccl' if use_cuda else 'gloo'
+    dist.init_process_group(backend=backend, init_method='env://')
+    if use_cuda:
+        torch.cuda.set_device(int(os.environ.get('LOCAL_RANK', 0)))
+    return dist.get_rank(), dist.get_world_size()
+
+
+def get_pt_memory_usage(use_cuda):
+    """
+    Get peak memory usage: memory allocated by tensors on the current GPU (since the last reset of peak statistics) or
+    resident memory of the process for CPU.
+
+    Parameters:
+    ----------
+    use_cuda : bool
+        Whether to use CUDA.
+
+    Returns
+    -------
+    int
+        Memory usage in bytes.
+    """
+    if use_cuda:
+        return torch.cuda.max_memory_allocated()
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def reset_pt_memory_usage(use_cuda):
+    """
+    Reset peak statistics of memory allocated by tensors on the current GPU (if supported by the PyTorch version).
+
+    Parameters:
+    ----------
+    use_cuda : bool
+        Whether to use CUDA.
+    """
+    if not use_cuda:
+        return
+    if hasattr(torch.cuda, 'reset_peak_memory_stats'):
+        torch.cuda.reset_peak_memory_stats()
+    elif hasattr(torch.cuda, 'reset_max_memory_allocated'):
+        torch.cuda.reset_max_memory_allocated()
+
+
+class _NullContext(object):
+    """
+    Context which does nothing.
+    """
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+
+def get_autocast_context(use_amp,
+                         use_cuda):
+    """
+    Get a context for the forward pass: `torch.autocast` for AMP (float16 on GPU, bfloat16 on CPU) or a context which
+    does nothing otherwise (so the default path works with PyTorch versions without autocast).
+
+    Parameters:
+    ----------
+    use_amp : bool
+        Whether to use AMP.
+    use_cuda : bool
+        Whether to use CUDA.
+
+    Returns
+    -------
+    object
+        Context manager.
+    """
+    if not use_amp:
+        return _NullContext()
+    return torch.autocast(device_type=('cuda' if use_cuda else 'cpu'))
+
+
+def _fp32_input_pre_hook(module, inputs):
+    module.amp_input_dtype = inputs[0].dtype
+    return (inputs[0].float(),) + tuple(inputs[1:])
+
+
+def _fp32_input_hook(module, inputs, output):
+    return output.to(module.amp_input_dtype)
+
+
+def keep_batchnorm_fp32(net):
+    """
+    Keep BatchNorm layers in float32 under autocast. Autocast runs batch normalization in the type of its input (e.g.
+    bfloat16 on CPU), so the input of each layer is cast to float32 (parameters and running statistics are float32)
+    and the output is cast back to the input type.
+
+    Parameters:
+    ----------
+    net : Module
+        Model.
+
+    Returns
+    -------
+    int
+        Number of BatchNorm layers.
+    """
+    count = 0
+    for module in net.modules():
+        if isinstance(module, nn.modules.batchnorm._BatchNorm):
+            module.register_forward_pre_hook(_fp32_input_pre_hook)
+            module.register_forward_hook(_fp32_input_hook)
+            count += 1
+    return count
+
+
+def all_reduce_meter(meter,
+                     use_cuda):
+    """
+    Sum the statistics of a metric over all processes of the default process group.
+
+    Parameters:
+    ----------
+    meter : AverageMeter
+        Metric.
+    use_cuda : bool
+        Whether to use CUDA (for the communication buffer).
+    """
+    stats = torch.tensor(
+        [float(meter.sum), float(meter.count)],
+        dtype=torch.float64,
+        device=('cuda' if use_cuda else 'cpu'))
+    dist.all_reduce(stats, op=dist.ReduceOp.SUM)
+    meter.sum = stats[0]
+    meter.count = int(stats[1].item())
+    meter.avg = meter.sum / max(1, meter.count)
+
+
+def save_mmap_state_dict(state_dict,
+                         file_path):
+    """
+    Save a model state dictionary into a memory-mappable weight file.
+
+    Parameters:
+    ----------
+    state_dict : dict
+        Model state dictionary.
+    file_path : str
+        Path to the file.
+    """
+    arrays = OrderedDict()
+    for name, tensor in state_dict.items():
+        arrays[name] = tensor.detach().cpu().numpy()
+    save_mmap_weights(file_path, arrays)
+
+
+def load_mmap_state_dict(net,
+                         file_path,
+                         ignore_extra=False,
+                         remove_module=False):
+    """
+    Load a model state dictionary from a memory-mappable weight file. Parameters and buffers are not copied, but are
+    replaced by tensors which refer directly to the mapped file.
+
+    Parameters:
+    ----------
+    net : Module
+        Network.
+    file_path : str
+        Path to the file.
+    ignore_extra : bool, default False
+        Whether to silently ignore tensors from the file that are not present in the network.
+    remove_module : bool, default False
+        Whether to remove the `module.` prefix (of DataParallel) from tensor names.
+    """
+    arrays = load_mmap_weights(file_path)
+    if remove_module:
+        arrays = OrderedDict((k[len('module.'):] if k.startswith('module.') else k, v) for k, v in arrays.items())
+    net_state = net.state_dict()
+    for name in net_state.keys():
+        if name not in arrays:
+            raise ValueError('Tensor {} is missing in file {}'.format(name, file_path))
+    modules = dict(net.named_modules())
+    for name, array in arrays.items():
+        if name not in net_state:
+            if ignore_extra:
+                continue
+            raise ValueError('Tensor {} from file {} is not present in the network'.format(name, file_path))
+        if tuple(net_state[name].size()) != array.shape:
+            raise ValueError('Tensor {} has shape {} in the network and {} in file {}'.format(
+                name, tuple(net_state[name].size()), array.shape, file_path))
+        module_name, _, attr_name = name.rpartition('.')
+        module = modules[module_name]
+        tensor = torch.from_numpy(array)
+        if attr_name in module._parameters:
+            module._parameters[attr_name] = torch.nn.Parameter(
+                tensor,
+                requires_grad=module._parameters[attr_name].requires_grad)
+        else:
+            module._buffers[attr_name] = tensor
+
+
+def _get_bn_arrays(bn):
+    def to_numpy(tensor):
+        return None if tensor is None else tensor.detach().cpu().numpy()
+
+    return {
+        'gamma': to_numpy(bn.weight),
+        'beta': to_numpy(bn.bias),
+        'running_mean': to_numpy(bn.running_mean),
+        'running_var': to_numpy(bn.running_var),
+        'eps': bn.eps}
+
+
+def _set_conv_weight_bias(conv,
+                          weight,
+                          bias):
+    device = conv.weight.device
+    conv.weight = nn.Parameter(
+        torch.from_numpy(weight).to(device),
+        requires_grad=conv.weight.requires_grad)
+    conv.bias = nn.Parameter(
+        torch.from_numpy(bias).to(device),
+        requires_grad=conv.weight.requires_grad)
+
+
+def fuse_for_inference(net):
+    """
+    Fold inference-mode Batch normalization layers of convolution blocks into the convolutions (the network is switched
+    into the evaluation mode). BatchNorm of `ConvBlock` is folded into the convolution after which it is applied
+    (including grouped and depthwise ones). BatchNorm of `PreConvBlock` is folded into the convolution only if the
+    block is neither activated nor returns the pre-activation, and the convolution has no padding. Folded BatchNorm
+    layers are replaced by `Identity`.
+
+    Parameters:
+    ----------
+    net : Module
+        Network.
+
+    Returns
+    -------
+    int
+        Number of folded BatchNorm layers.
+    """
+    from .pytorchcv.models.common import ConvBlock, PreConvBlock, Identity
+    net.eval()
+    fused_count = 0
+    for module in list(net.modules()):
+        if not (isinstance(module, (ConvBlock, PreConvBlock)) and isinstance(module.bn, nn.BatchNorm2d) and
+                module.bn.track_running_stats):
+            continue
+        conv = module.conv
+        weight = conv.weight.detach().cpu().numpy()
+        bias = None if conv.bias is None else conv.bias.detach().cpu().numpy()
+        if isinstance(module, ConvBlock):
+            weight, bias = fold_bn_into_prev_conv(
+                weight=weight,
+                bias=bias,
+                **_get_bn_arrays(module.bn))
+        else:
+            if module.activate or module.return_preact or any(conv.padding):
+                continue
+            weight, bias = fold_bn_into_next_conv(
+                weight=weight,
+                bias=bias,
+                groups=conv.groups,
+                **_get_bn_arrays(module.bn))
+        _set_conv_weight_bias(conv, weight, bias)
+        module.bn = Identity()
+        fused_count += 1
+    return fused_count
+
+
+def compact_condensenet(net):
+    """
+    Compact CondenseNet for inference (the network is switched into the evaluation mode). In each unit the BatchNorm of
+    the simple convolution block is folded into the grouped convolution of the complex convolution block, through the
+    inverse of the channel shuffle between them, so the convolution keeps its groups (and MACs). The channel gather and
+    the shuffle themselves are kept, since the gather reads the concatenation of features, which is shared by all next
+    units with different indices, and the shuffle mixes groups of both grouped convolutions. The feature gather of the
+    classifier is folded into its weight.
+
+    Parameters:
+    ----------
+    net : CondenseNet
+        Network.
+
+    Returns
+    -------
+    int
+        Number of compacted blocks.
+    """
+    from .pytorchcv.models.common import Identity
+    from .pytorchcv.models.condensenet import CondenseNet, CondenseUnit, CondenseLinear
+    assert isinstance(net, CondenseNet)
+    net.eval()
+    compacted_count = 0
+    for module in list(net.modules()):
+        if not isinstance(module, CondenseUnit):
+            continue
+        conv = module.conv1.conv
+        weight = conv.weight.detach().cpu().numpy()
+        # Channel `c` of the shuffle output is channel `perm[c]` of the convolution output:
+        perm = get_channel_shuffle_permutation(weight.shape[0], conv.groups)
+        bn_arrays = _get_bn_arrays(module.conv2.bn)
+        for name in ['gamma', 'beta', 'running_mean', 'running_var']:
+            if bn_arrays[name] is not None:
+                bn_arrays[name] = bn_arrays[name][np.argsort(perm)]
+        weight, bias = fold_bn_into_prev_conv(
+            weight=weight,
+            bias=None,
+            **bn_arrays)
+        _set_conv_weight_bias(conv, weight, bias)
+        module.conv2.bn = Identity()
+        compacted_count += 1
+
+    if isinstance(net.output, CondenseLinear):
+        linear = net.output.linear
+        in_features = net.features.post_activ.bn.num_features
+        weight = densify_gathered_dense(
+            weight=linear.weight.detach().cpu().numpy(),
+            index=net.output.index.cpu().numpy().astype(np.int64),
+            in_units=in_features)
+        compact_linear = nn.Linear(
+            in_features=in_features,
+            out_features=weight.shape[0])
+        compact_linear.weight.data.copy_(torch.from_numpy(weight))
+        compact_linear.bias.data.copy_(linear.bias.detach().cpu())
+        net.output = compact_linear.to(linear.weight.device)
+        compacted_count += 1
+    return compacted_count
+
+
+def _get_shuffle_permutation(shuffle,
+                             channels):
+    from .pytorchcv.models.common import ChannelShuffle2
+    if isinstance(shuffle, ChannelShuffle2):
+        return get_channel_shuffle_permutation(channels, channels // shuffle.groups)
+    return get_channel_shuffle_permutation(channels, shuffle.groups)
+
+
+def _get_channel_tensors(module):
+    # Scalar buffers (like `num_batches_tracked`) aren't per-channel ones:
+    return [tensor for tensor in list(module.parameters()) + list(module.buffers()) if tensor.dim() > 0]
+
+
+def _is_per_channel(module,
+                    channels):
+    return all([tensor.shape[0] == channels for tensor in _get_channel_tensors(module)])
+
+
+def _permute_channels(module,
+                      perm):
+    for tensor in _get_channel_tensors(module):
+        tensor.data = tensor.data[torch.from_numpy(perm).to(tensor.device)]
+
+
+def _permute_conv_inputs(conv,
+                         perm):
+    conv.weight.data = conv.weight.data[:, torch.from_numpy(perm).to(conv.weight.device)]
+
+
+def _get_sequential_leaves(module):
+    if not isinstance(module, nn.Sequential):
+        return [module]
+    return [leaf for child in module.children() for leaf in _get_sequential_leaves(child)]
+
+
+def _get_shuffle_consumers(module):
+    """
+    Get layers, which consume the output of a channel shuffle applied just before the module: per-channel layers and
+    dense (ungrouped) convolutions, which are applied to the module input (directly or after per-channel layers).
+
+    Parameters:
+    ----------
+    module : Module
+        Module.
+
+    Returns
+    -------
+    tuple of (list of Module, list of Conv2d) or None
+        Per-channel layers and convolutions (None if the module input is consumed by other layers).
+    """
+    from .pytorchcv.models.common import ConvBlock
+    from .pytorchcv.models.shufflenetv2 import ShuffleUnit as ShuffleNetV2Unit
+    from .pytorchcv.models.shufflenetv2b import ShuffleUnit as ShuffleNetV2bUnit
+    if isinstance(module, ShuffleNetV2Unit) and module.downsample:
+        per_channel_modules = [module.dw_conv4, module.dw_bn4]
+        convs = [module.expand_conv5, module.compress_conv1]
+    elif isinstance(module, ShuffleNetV2bUnit) and module.downsample:
+        per_channel_modules = [module.shortcut_dconv]
+        convs = [module.shortcut_conv.conv, module.conv1.conv]
+    elif isinstance(module, ConvBlock):
+        per_channel_modules = []
+        convs = [module.conv]
+    else:
+        return None
+    channels = convs[0].in_channels
+    if not (all([(conv.groups == 1) and (conv.in_channels == channels) for conv in convs]) and
+            all([_is_per_channel(per_channel_module, channels) for per_channel_module in per_channel_modules])):
+        return None
+    return per_channel_modules, convs
+
+
+def fold_channel_shuffles(net):
+    """
+    Fold channel shuffle layers (`ChannelShuffle` and `ChannelShuffle2`) into adjacent convolutions for inference (the
+    network is switched into the evaluation mode). A shuffle is folded into the output channel order of the previous
+    convolution (and its BatchNorm), if it's an ungrouped one (ShuffleNet and MENet units), or into the input channel
+    order of the next ungrouped convolutions (and intermediate per-channel layers), if the shuffle output is consumed
+    only by them (ShuffleNetV2 units, which are followed by a downsampling unit or by the final block). Folded shuffles
+    are replaced by `Identity`. The rest (e.g. shuffles between grouped convolutions or before a channel split) are
+    kept.
+
+    Parameters:
+    ----------
+    net : Module
+        Network.
+
+    Returns
+    -------
+    int
+        Number of folded shuffle layers.
+    """
+    from .pytorchcv.models.common import Identity, ChannelShuffle, ChannelShuffle2
+    from .pytorchcv.models.shufflenet import ShuffleUnit as ShuffleNetUnit
+    from .pytorchcv.models.menet import MEUnit
+    from .pytorchcv.models.shufflenetv2 import ShuffleUnit as ShuffleNetV2Unit
+    from .pytorchcv.models.shufflenetv2b import ShuffleUnit as ShuffleNetV2bUnit
+    net.eval()
+    folded_count = 0
+    for module in list(net.modules()):
+        if not (isinstance(module, (ShuffleNetUnit, MEUnit)) and isinstance(module.c_shuffle, ChannelShuffle) and
+                (module.compress_conv1.groups == 1)):
+            continue
+        perm = _get_shuffle_permutation(module.c_shuffle, module.compress_conv1.out_channels)
+        _permute_channels(module.compress_conv1, perm)
+        _permute_channels(module.compress_bn1, perm)
+        module.c_shuffle = Identity()
+        folded_count += 1
+
+    if hasattr(net, 'features'):
+        units = _get_sequential_leaves(net.features)
+        for unit, next_unit in zip(units[:-1], units[1:]):
+            if not (isinstance(unit, (ShuffleNetV2Unit, ShuffleNetV2bUnit)) and
+                    isinstance(unit.c_shuffle, (ChannelShuffle, ChannelShuffle2))):
+                continue
+            consumers = _get_shuffle_consumers(next_unit)
+            if consumers is None:
+                continue
+            per_channel_modules, convs = consumers
+            inv_perm = np.argsort(_get_shuffle_permutation(unit.c_shuffle, convs[0].in_channels))
+            for per_channel_module in per_channel_modules:
+                _permute_channels(per_channel_module, inv_perm)
+            for conv in convs:
+                _permute_conv_inputs(conv, inv_perm)
+            unit.c_shuffle = Identity()
+            folded_count += 1
+    return folded_count
+
+
 def prepare_model(model_name,
                   use_pretrained,
                   pretrained_model_file_path,
@@ -21,12 +506,45 @@ def prepare_model(model_name,
                   use_data_parallel=True,
                   ignore_extra=False,
                   remap_to_cpu=False,
-                  remove_module=False):
+                  remove_module=False,
+                  fuse_bn=False,
+                  use_distributed=False,
+                  jit=False,
+                  jit_cache_dir='',
+                  input_image_size=(224, 224)):
+    jit_cache_file_path = None
+    if jit and jit_cache_dir:
+        weights_sha1 = get_weights_sha1(
+            model_name=model_name,
+            use_pretrained=use_pretrained,
+            pretrained_model_file_path=pretrained_model_file_path)
+        if weights_sha1 is not None:
+            jit_cache_file_path = get_jit_cache_file_path(
+                cache_dir_path=jit_cache_dir,
+                model_name=model_name,
+                weights_sha1=weights_sha1,
+                input_image_size=tuple(input_image_size),
+                fuse_bn=fuse_bn,
+                use_cuda=use_cuda)
+            if os.path.exists(jit_cache_file_path):
+                logging.info('Loading traced module from the cache: {}'.format(jit_cache_file_path))
+                return load_jit_cache(
+                    file_path=jit_cache_file_path,
+                    use_cuda=use_cuda)
+
     kwargs = {'pretrained': use_pretrained}
 
     net = get_model(model_name, **kwargs)
 
-    if pretrained_model_file_path:
+    if pretrained_model_file_path and is_mmap_weights_file(pretrained_model_file_path):
+        assert (os.path.isfile(pretrained_model_file_path))
+        logging.info('Mapping model: {}'.format(pretrained_model_file_path))
+        load_mmap_state_dict(
+            net=net,
+            file_path=pretrained_model_file_path,
+            ignore_extra=ignore_extra,
+            remove_module=remove_module)
+    elif pretrained_model_file_path:
         assert (os.path.isfile(pretrained_model_file_path))
         logging.info('Loading model: {}'.format(pretrained_model_file_path))
         checkpoint = torch.load(
@@ -48,6 +566,30 @@ def prepare_model(model_name,
             else:
                 net.load_state_dict(checkpoint)
 
+    if fuse_bn:
+        fused_count = fuse_for_inference(net)
+        logging.info('Folded {} BatchNorm layers into convolutions'.format(fused_count))
+
+    if jit:
+        assert (not use_distributed)
+        if use_cuda:
+            net = net.cuda()
+        traced_net = trace_model(
+            net=net,
+            input_shape=((3,) + tuple(input_image_size)),
+            use_cuda=use_cuda,
+            cache_file_path=jit_cache_file_path)
+        if traced_net is not None:
+            return traced_net
+
+    if use_distributed:
+        if use_cuda:
+            net = net.cuda()
+        net = torch.nn.parallel.DistributedDataParallel(
+            module=net,
+            device_ids=([torch.cuda.current_device()] if use_cuda else None))
+        return net
+
     if use_data_parallel and use_cuda:
         net = torch.nn.DataParallel(net)
 
@@ -96,44 +638,175 @@ def accuracy(output, target, topk=(1,)):
 
         res = []
         for k in topk:
-            correct_k = correct[:k].view(-1).float().sum(0, keepdim=True)
+            correct_k = correct[:k].reshape(-1).float().sum(0, keepdim=True)
             res.append(correct_k.mul_(1.0 / batch_size))
         return res
 
 
+class DeviceMetricAccumulator(object):
+    """
+    Running training metrics (loss, top-1 and top-5 accuracy), which are accumulated on the device without
+    synchronization with the host. Values are read back only by `get`, so CUDA kernels are queued without stalls.
+    """
+    def __init__(self):
+        super(DeviceMetricAccumulator, self).__init__()
+        self.reset()
+
+    def reset(self):
+        self.sums = None
+        self.host_sums = np.zeros((3,), np.float64)
+        self.num_batches = 0
+        self.num_samples = 0
+
+    def update(self,
+               output,
+               target,
+               loss):
+        """
+        Update metrics by a batch (asynchronously).
+
+        Parameters:
+        ----------
+        output : Tensor
+            Predicted scores.
+        target : Tensor
+            Class labels.
+        loss : Tensor
+            Loss value.
+        """
+        with torch.no_grad():
+            if self.sums is None:
+                self.sums = torch.zeros((3,), dtype=torch.float64, device=output.device)
+            _, top5_inds = output.topk(min(5, output.size(1)), 1, True, True)
+            correct = top5_inds.eq(target.view(-1, 1))
+            self.sums[0] += loss.detach().double()
+            self.sums[1] += correct[:, 0].sum()
+            self.sums[2] += correct.sum()
+        self.num_batches += 1
+        self.num_samples += target.size(0)
+
+    def get(self):
+        """
+        Get metric values (with synchronization).
+
+        Returns
+        -------
+        tuple of 3 float
+            Mean loss, top-1 accuracy and top-5 accuracy.
+        """
+        sums = self.get_state()[0]
+        return (sums[0] / max(1, self.num_batches), sums[1] / max(1, self.num_samples),
+                sums[2] / max(1, self.num_samples))
+
+    def get_state(self):
+        """
+        Get the state of accumulators (with synchronization).
+
+        Returns
+        -------
+        tuple of (np.array, int, int)
+            Sums of loss, top-1 and top-5 hits, number of batches and number of samples.
+        """
+        sums = self.host_sums.copy()
+        if self.sums is not None:
+            sums += self.sums.cpu().numpy()
+        return sums, self.num_batches, self.num_samples
+
+    def set_state(self, state):
+        """
+        Restore the state of accumulators.
+
+        Parameters:
+        ----------
+        state : tuple of (np.array, int, int)
+            State from `get_state`.
+        """
+        self.reset()
+        self.host_sums = np.array(state[0], np.float64)
+        self.num_batches = state[1]
+        self.num_samples = state[2]
+
+
 def validate(acc_top1,
              acc_top5,
              net,
              val_data,
-             use_cuda):
+             use_cuda,
+             use_distributed=False):
     net.eval()
     acc_top1.reset()
     acc_top5.reset()
     with torch.no_grad():
         for data, target in val_data:
             if use_cuda:
+                data = data.cuda(non_blocking=True)
                 target = target.cuda(non_blocking=True)
             output = net(data)
             prec1, prec5 = accuracy(output, target, topk=(1, 5))
             acc_top1.update(prec1[0], data.size(0))
             acc_top5.update(prec5[0], data.size(0))
+    if use_distributed:
+        all_reduce_meter(acc_top1, use_cuda)
+        all_reduce_meter(acc_top5, use_cuda)
     top1 = acc_top1.avg.item()
     top5 = acc_top5.avg.item()
     return 1.0 - top1, 1.0 - top5
 
 
+def validate_multi(nets,
+                   val_data,
+                   use_cuda):
+    """
+    Validate several models (with the same input size) on a single pass over the data loader.
+
+    Parameters:
+    ----------
+    nets : list of Module
+        Models.
+    val_data : DataLoader
+        Validation data loader.
+    use_cuda : bool
+        Whether to use CUDA.
+
+    Returns
+    -------
+    list of tuple of 2 float
+        Top-1 and top-5 errors for each model.
+    """
+    acc_top1_list = [AverageMeter() for _ in nets]
+    acc_top5_list = [AverageMeter() for _ in nets]
+    for net in nets:
+        net.eval()
+    with torch.no_grad():
+        for data, target in val_data:
+            if use_cuda:
+                data = data.cuda(non_blocking=True)
+                target = target.cuda(non_blocking=True)
+            for net, acc_top1, acc_top5 in zip(nets, acc_top1_list, acc_top5_list):
+                output = net(data)
+                prec1, prec5 = accuracy(output, target, topk=(1, 5))
+                acc_top1.update(prec1[0], data.size(0))
+                acc_top5.update(prec5[0], data.size(0))
+    return [(1.0 - acc_top1.avg.item(), 1.0 - acc_top5.avg.item())
+            for acc_top1, acc_top5 in zip(acc_top1_list, acc_top5_list)]
+
+
 def validate1(accuracy_metric,
               net,
               val_data,
-              use_cuda):
+              use_cuda,
+              use_distributed=False):
     net.eval()
     accuracy_metric.reset()
     with torch.no_grad():
         for data, target in val_data:
             if use_cuda:
+                data = data.cuda(non_blocking=True)
                 target = target.cuda(non_blocking=True)
             output = net(data)
             accuracy_value = accuracy(output, target)
             accuracy_metric.update(accuracy_value[0], data.size(0))
+    if use_distributed:
+        all_reduce_meter(accuracy_metric, use_cuda)
     accuracy_value = accuracy_metric.avg.item()
     return 1.0 - accuracy_value
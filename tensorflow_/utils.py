@@ -5,10 +5,28 @@ from .tensorflowcv.model_provider import get_model
 
 
 def save_model_params(sess,
-                      file_path):
+                      file_path,
+                      compressed=True):
+    """
+    Save values of model variables into a NumPy archive.
+
+    Parameters:
+    ----------
+    sess: Session
+        A Session with initialized variables.
+    file_path : str
+        Path to the file (`.npz`).
+    compressed : bool, default True
+        Whether to compress the archive (an uncompressed one is bigger, but it's loaded without inflating).
+    """
     # assert file_path.endswith('.npz')
-    param_dict = {v.name: v.eval(sess) for v in tf.global_variables()}
-    np.savez_compressed(file_path, **param_dict)
+    variables = tf.global_variables()
+    param_values = sess.run(variables)
+    param_dict = {v.name: value for v, value in zip(variables, param_values)}
+    if compressed:
+        np.savez_compressed(file_path, **param_dict)
+    else:
+        np.savez(file_path, **param_dict)
 
 
 def load_model_params(net,
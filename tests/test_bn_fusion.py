@@ -0,0 +1,65 @@
+"""
+    Tests of BatchNorm folding for inference (`fuse_for_inference`): outputs of fused and unfused models are compared.
+    BatchNorm statistics and affine parameters are randomized, so that the folding is not a no-op.
+"""
+
+import numpy as np
+import pytest
+
+# Models with plain, grouped and depthwise convolutions:
+_model_names = ['resnet18', 'resnext29_32x4d_cifar10', 'mobilenet_wd4', 'shufflenetv2_wd2']
+
+
+def _check_outputs(y_ref, y):
+    max_abs_diff = np.abs(y - y_ref).max()
+    assert max_abs_diff <= 1e-4 * max(1.0, np.abs(y_ref).max()), 'max abs diff: {}'.format(max_abs_diff)
+
+
+@pytest.mark.parametrize('model_name', _model_names)
+def test_fuse_for_inference_gluon(model_name):
+    mx = pytest.importorskip('mxnet')
+    from gluon.gluoncv2.model_provider import get_model
+    from gluon.utils import fuse_for_inference
+
+    mx.random.seed(0)
+    net = get_model(model_name)
+    net.initialize(mx.init.MSRAPrelu(), ctx=mx.cpu())
+    x = mx.nd.random.normal(shape=(2, 3) + net.in_size)
+    net(x)
+    for name, param in net.collect_params().items():
+        if name.endswith('running_var'):
+            param.set_data(mx.nd.random.uniform(0.5, 2.0, shape=param.shape))
+        elif name.endswith(('running_mean', 'beta')):
+            param.set_data(mx.nd.random.normal(scale=0.1, shape=param.shape))
+        elif name.endswith('gamma'):
+            param.set_data(mx.nd.random.uniform(0.5, 1.5, shape=param.shape))
+    y_ref = net(x).asnumpy()
+
+    assert fuse_for_inference(net) > 0
+    _check_outputs(y_ref, net(x).asnumpy())
+    net.hybridize()
+    _check_outputs(y_ref, net(x).asnumpy())
+
+
+@pytest.mark.parametrize('model_name', _model_names)
+def test_fuse_for_inference_pytorch(model_name):
+    torch = pytest.importorskip('torch')
+    from pytorch.pytorchcv.model_provider import get_model
+    from pytorch.utils import fuse_for_inference
+
+    torch.manual_seed(0)
+    net = get_model(model_name)
+    with torch.no_grad():
+        for module in net.modules():
+            if isinstance(module, torch.nn.BatchNorm2d):
+                module.running_var.uniform_(0.5, 2.0)
+                module.running_mean.normal_(std=0.1)
+                module.weight.uniform_(0.5, 1.5)
+                module.bias.normal_(std=0.1)
+    net.eval()
+    x = torch.randn((2, 3) + net.in_size)
+    with torch.no_grad():
+        y_ref = net(x).numpy()
+
+        assert fuse_for_inference(net) > 0
+        _check_outputs(y_ref, net(x).numpy())
@@ -0,0 +1,68 @@
+"""
+    Tests of CondenseNet compaction for inference (`compact_condensenet`): outputs of compacted and original models are
+    compared. Channel gather indices and BatchNorm parameters are randomized, so that the compaction is not a no-op.
+"""
+
+import numpy as np
+import pytest
+
+_model_name = 'condensenet74_c4_g4'
+
+
+def _check_outputs(y_ref, y):
+    max_abs_diff = np.abs(y - y_ref).max()
+    assert max_abs_diff <= 1e-4 * max(1.0, np.abs(y_ref).max()), 'max abs diff: {}'.format(max_abs_diff)
+
+
+def test_compact_condensenet_gluon():
+    mx = pytest.importorskip('mxnet')
+    from gluon.gluoncv2.model_provider import get_model
+    from gluon.utils import compact_condensenet
+
+    mx.random.seed(0)
+    rs = np.random.RandomState(0)
+    net = get_model(_model_name)
+    net.initialize(mx.init.MSRAPrelu(), ctx=mx.cpu())
+    x = mx.nd.random.normal(shape=(2, 3) + net.in_size)
+    net(x)
+    for name, param in net.collect_params().items():
+        if name.endswith('index'):
+            param.set_data(mx.nd.array(rs.randint(0, param.shape[0], size=param.shape)))
+        elif name.endswith('running_var'):
+            param.set_data(mx.nd.random.uniform(0.5, 2.0, shape=param.shape))
+        elif name.endswith(('running_mean', 'beta')):
+            param.set_data(mx.nd.random.normal(scale=0.1, shape=param.shape))
+        elif name.endswith('gamma'):
+            param.set_data(mx.nd.random.uniform(0.5, 1.5, shape=param.shape))
+    y_ref = net(x).asnumpy()
+
+    assert compact_condensenet(net) > 0
+    _check_outputs(y_ref, net(x).asnumpy())
+    net.hybridize()
+    _check_outputs(y_ref, net(x).asnumpy())
+
+
+def test_compact_condensenet_pytorch():
+    torch = pytest.importorskip('torch')
+    from pytorch.pytorchcv.model_provider import get_model
+    from pytorch.utils import compact_condensenet
+
+    torch.manual_seed(0)
+    net = get_model(_model_name)
+    with torch.no_grad():
+        for name, buffer in net.named_buffers():
+            if name.endswith('index'):
+                buffer.random_(0, buffer.shape[0])
+        for module in net.modules():
+            if isinstance(module, torch.nn.BatchNorm2d):
+                module.running_var.uniform_(0.5, 2.0)
+                module.running_mean.normal_(std=0.1)
+                module.weight.uniform_(0.5, 1.5)
+                module.bias.normal_(std=0.1)
+    net.eval()
+    x = torch.randn((2, 3) + net.in_size)
+    with torch.no_grad():
+        y_ref = net(x).numpy()
+
+        assert compact_condensenet(net) > 0
+        _check_outputs(y_ref, net(x).numpy())
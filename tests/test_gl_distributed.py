@@ -0,0 +1,137 @@
+"""
+    Smoke test of distributed training (Gluon) with the `dist_sync` key-value store: 2 CPU workers (and a server) are
+    started by the local launcher of MXNet (`tools/launch.py -n 2 --launcher local`). The test checks gradient
+    averaging via `rescale_grad` of the trainer and sharding of RecordIO training data via `part_index`/`num_parts`.
+"""
+
+import os
+import sys
+import json
+import subprocess
+
+import pytest
+
+mx = pytest.importorskip('mxnet')
+
+_num_workers = 2
+_num_records = 8
+_lr = 0.1
+
+_worker_script = """
+import os
+import sys
+import json
+import mxnet as mx
+from mxnet import gluon, autograd
+sys.path.insert(0, '{root_dir_path}')
+from gluon.utils import prepare_mx_kvstore
+from gluon.imagenet1k import get_train_data_rec
+from train_gl import prepare_trainer
+
+kv, rank, num_workers, ctx, batch_size = prepare_mx_kvstore(
+    kvstore='dist_sync',
+    num_gpus=0,
+    batch_size=1)
+
+net = gluon.nn.Dense(units=1, in_units=1, use_bias=False)
+net.initialize(mx.init.One(), ctx=ctx)
+trainer, _ = prepare_trainer(
+    net=net,
+    optimizer_name='sgd',
+    wd=0.0,
+    momentum=0.0,
+    lr_mode='step',
+    lr={lr},
+    lr_decay_period=0,
+    lr_decay_epoch='10',
+    lr_decay=0.1,
+    target_lr=0.0,
+    poly_power=2,
+    warmup_epochs=0,
+    warmup_lr=0.0,
+    warmup_mode='linear',
+    batch_size=(batch_size * num_workers),
+    num_epochs=1,
+    num_training_samples=100,
+    dtype='float32',
+    kvstore=kv,
+    num_dist_workers=num_workers)
+# The gradient of the weight on a worker is `rank + 1`:
+x = mx.nd.full((1, 1), val=(rank + 1), ctx=ctx[0])
+with autograd.record():
+    y = net(x)
+y.backward()
+trainer.step(1)
+
+train_data = get_train_data_rec(
+    rec_train='{rec_file_path}',
+    rec_train_idx='{idx_file_path}',
+    batch_size=1,
+    num_workers=1,
+    data_shape=(3, 8, 8),
+    mean_rgb=(0.0, 0.0, 0.0),
+    std_rgb=(1.0, 1.0, 1.0),
+    jitter_param=0.4,
+    lighting_param=0.1,
+    num_parts=num_workers,
+    part_index=rank)
+labels = [int(batch.label[0].asscalar()) for batch in train_data]
+
+with open(os.path.join('{result_dir_path}', '{{}}.json'.format(rank)), 'w') as f:
+    json.dump({{
+        'num_workers': num_workers,
+        'rescale_grad': trainer._optimizer.rescale_grad,
+        'weight': float(net.weight.data().asscalar()),
+        'labels': labels}}, f)
+"""
+
+
+def _write_rec_file(rec_file_path,
+                    idx_file_path):
+    import numpy as np
+    rec = mx.recordio.MXIndexedRecordIO(idx_file_path, rec_file_path, 'w')
+    for i in range(_num_records):
+        img = np.full((16, 16, 3), fill_value=(i * 16), dtype=np.uint8)
+        header = mx.recordio.IRHeader(flag=0, label=float(i), id=i, id2=0)
+        rec.write_idx(i, mx.recordio.pack_img(header, img, img_fmt='.png'))
+    rec.close()
+
+
+def test_dist_sync_local_launcher(tmp_path):
+    launcher_file_path = os.path.join(os.path.dirname(mx.__file__), 'tools', 'launch.py')
+    if not os.path.exists(launcher_file_path):
+        pytest.skip('MXNet launcher is not found')
+    pytest.importorskip('cv2')
+    tmp_dir_path = str(tmp_path)
+    rec_file_path = os.path.join(tmp_dir_path, 'train.rec')
+    idx_file_path = os.path.join(tmp_dir_path, 'train.idx')
+    _write_rec_file(rec_file_path, idx_file_path)
+    script_file_path = os.path.join(tmp_dir_path, 'worker.py')
+    with open(script_file_path, 'w') as f:
+        f.write(_worker_script.format(
+            root_dir_path=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            lr=_lr,
+            rec_file_path=rec_file_path,
+            idx_file_path=idx_file_path,
+            result_dir_path=tmp_dir_path))
+
+    subprocess.check_call(
+        [sys.executable, launcher_file_path, '-n', str(_num_workers), '-s', '1', '--launcher', 'local',
+         sys.executable, script_file_path],
+        cwd=tmp_dir_path,
+        timeout=300)
+
+    results = []
+    for rank in range(_num_workers):
+        with open(os.path.join(tmp_dir_path, '{}.json'.format(rank)), 'r') as f:
+            results.append(json.load(f))
+    # Gradients (1 and 2) are summed by the server and averaged by the trainer:
+    mean_grad = sum([rank + 1 for rank in range(_num_workers)]) / float(_num_workers)
+    for result in results:
+        assert result['num_workers'] == _num_workers
+        assert result['rescale_grad'] == pytest.approx(1.0 / _num_workers)
+        assert result['weight'] == pytest.approx(1.0 - _lr * mean_grad)
+    # Each record is read by one worker:
+    labels = sorted(sum([result['labels'] for result in results], []))
+    assert labels == list(range(_num_records))
+    assert all([len(result['labels']) == _num_records // _num_workers for result in results])
@@ -0,0 +1,53 @@
+"""
+    Tests of model statistics: shape propagation (`analyze_model`) versus the forward pass counter (`measure_model`).
+"""
+
+import pytest
+
+_model_names = ['resnet18', 'mobilenet_w1', 'shufflenetv2_wd2', 'densenet121']
+
+# Shape propagation fails for this model (its blocks read shapes of the inputs), and the forward pass is used:
+_gluon_fallback_model_name = 'irevnet301'
+
+
+@pytest.mark.parametrize('model_name', _model_names)
+def test_analyze_model_gluon(model_name):
+    mx = pytest.importorskip('mxnet')
+    from gluon.gluoncv2.model_provider import get_model
+    from gluon.model_stats import analyze_model, measure_model
+
+    net = get_model(model_name)
+    num_flops, num_macs, num_params, activation_memory, layers = analyze_model(net, 3, net.in_size)
+    assert all([layer.num_flops is not None for layer in layers])
+    assert activation_memory > 0
+    net.initialize(ctx=mx.cpu())
+    assert tuple(measure_model(net, 3, net.in_size)) == (num_flops, num_macs, num_params)
+
+
+@pytest.mark.parametrize('model_name', _model_names)
+def test_analyze_model_pytorch(model_name):
+    torch = pytest.importorskip('torch')
+    from pytorch.pytorchcv.model_provider import get_model
+    from pytorch.model_stats import analyze_model, measure_model
+
+    with torch.device('meta'):
+        meta_net = get_model(model_name)
+    num_flops, num_macs, num_params, activation_memory, layers = analyze_model(meta_net, 3, meta_net.in_size)
+    assert all([layer.num_flops is not None for layer in layers])
+    assert activation_memory > 0
+    net = get_model(model_name)
+    assert tuple(measure_model(net, 3, net.in_size)) == (num_flops, num_macs, num_params)
+
+
+def test_fallback_gluon():
+    mx = pytest.importorskip('mxnet')
+    from gluon.gluoncv2.model_provider import get_model
+    from gluon.model_stats import analyze_model, measure_model
+
+    with pytest.raises(Exception):
+        analyze_model(get_model(_gluon_fallback_model_name), 3, (224, 224))
+    net = get_model(_gluon_fallback_model_name)
+    net.initialize(ctx=mx.cpu())
+    num_flops, num_macs, num_params = measure_model(net, 3, net.in_size)
+    assert num_flops > num_macs > 0
+    assert num_params > 0
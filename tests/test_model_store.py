@@ -0,0 +1,254 @@
+"""
+    Tests of the model stores (download, cached hash check, resume of interrupted downloads, prefetch) against a local
+    HTTP server.
+"""
+
+import os
+import io
+import time
+import zipfile
+import hashlib
+import threading
+import importlib.util
+from http.server import HTTPServer, BaseHTTPRequestHandler
+from socketserver import ThreadingMixIn
+
+import pytest
+
+pytest.importorskip('requests')
+
+_root_dir_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_model_store_file_paths = {
+    'gluon': os.path.join('gluon', 'gluoncv2', 'models', 'model_store.py'),
+    'pytorch': os.path.join('pytorch', 'pytorchcv', 'models', 'model_store.py'),
+    'chainer': os.path.join('chainer_', 'chainercv2', 'models', 'model_store.py'),
+    'keras': os.path.join('keras_', 'kerascv', 'models', 'model_store.py'),
+    'tensorflow': os.path.join('tensorflow_', 'tensorflowcv', 'models', 'model_store.py'),
+}
+
+_model_name = 'testnet'
+_repo_release_tag = 'v0.0.1'
+
+
+class _ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class _ReleaseHandler(BaseHTTPRequestHandler):
+    """
+    Handler of release assets, which responds to a range request with the status set in `server.range_status`:
+    206 (partial content), 200 (range is ignored, whole file is sent) or 416 (range not satisfiable).
+    """
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self.server.requests_log.append((self.path, self.headers.get('Range')))
+        data = self.server.files.get(self.path)
+        if data is None:
+            self.send_error(404)
+            return
+        start = 0
+        range_header = self.headers.get('Range')
+        if range_header is not None and self.server.range_status != 200:
+            start = int(range_header[len('bytes='):].split('-')[0])
+            if start >= len(data):
+                self.send_response(416)
+                self.send_header('Content-Range', 'bytes */{}'.format(len(data)))
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            self.send_response(206)
+            self.send_header('Content-Range', 'bytes {}-{}/{}'.format(start, len(data) - 1, len(data)))
+        else:
+            self.send_response(200)
+        self.send_header('Content-Length', str(len(data) - start))
+        self.end_headers()
+        # The body is sent in slices with pauses, so that concurrent downloads overlap:
+        for pos in range(start, len(data), 65536):
+            self.wfile.write(data[pos:pos + 65536])
+            time.sleep(self.server.chunk_delay)
+
+
+def _load_model_store(framework):
+    if framework == 'keras':
+        pytest.importorskip('h5py')
+        pytest.importorskip('keras')
+    module_name = '_test_model_store_{}'.format(framework)
+    spec = importlib.util.spec_from_file_location(
+        module_name, os.path.join(_root_dir_path, _model_store_file_paths[framework]))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(params=sorted(_model_store_file_paths.keys()))
+def model_store(request):
+    return _load_model_store(request.param)
+
+
+@pytest.fixture
+def release_server(model_store, monkeypatch):
+    """
+    Local HTTP server with a release of a fake model, which is registered in the model store.
+    """
+    model_file_data = os.urandom(300000)
+    sha1_hash = hashlib.sha1(model_file_data).hexdigest()
+    monkeypatch.setitem(model_store._model_sha1, _model_name, ('0000', sha1_hash, _repo_release_tag))
+    model_file_name = _get_model_file_name(model_store, sha1_hash)
+    zip_buffer = io.BytesIO()
+    with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_STORED) as zf:
+        zf.writestr(model_file_name, model_file_data)
+
+    server = _ThreadingHTTPServer(('127.0.0.1', 0), _ReleaseHandler)
+    server.zip_data = zip_buffer.getvalue()
+    server.model_file_data = model_file_data
+    server.model_file_name = model_file_name
+    server.files = {'/releases/download/{}/{}.zip'.format(_repo_release_tag, model_file_name): server.zip_data}
+    server.requests_log = []
+    server.range_status = 206
+    server.chunk_delay = 0.0
+    server_thread = threading.Thread(target=server.serve_forever)
+    server_thread.daemon = True
+    server_thread.start()
+    monkeypatch.setattr(model_store, 'imgclsmob_repo_url', 'http://127.0.0.1:{}'.format(server.server_address[1]))
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _get_model_file_name(model_store, sha1_hash):
+    extension = {
+        'gluon': '.params',
+        'pytorch': '.pth',
+        'chainer': '.npz',
+        'keras': '.h5',
+        'tensorflow': '.tf.npz',
+    }[model_store.__name__[len('_test_model_store_'):]]
+    return '{}-0000-{}{}'.format(_model_name, sha1_hash[:8], extension)
+
+
+def _count_hashing(model_store, monkeypatch):
+    calls = []
+    check_sha1 = model_store._check_sha1
+
+    def counted_check_sha1(*args, **kwargs):
+        calls.append(args[0])
+        return check_sha1(*args, **kwargs)
+
+    monkeypatch.setattr(model_store, '_check_sha1', counted_check_sha1)
+    return calls
+
+
+def _get_model_file(model_store, dir_path):
+    return model_store.get_model_file(
+        model_name=_model_name,
+        local_model_store_dir_path=str(dir_path))
+
+
+def test_download(model_store, release_server, tmp_path):
+    file_path = _get_model_file(model_store, tmp_path)
+    assert os.path.basename(file_path) == release_server.model_file_name
+    with open(file_path, 'rb') as f:
+        assert f.read() == release_server.model_file_data
+    assert os.path.exists(file_path + '.sha1')
+    assert not os.path.exists(file_path + '.zip')
+    assert not os.path.exists(file_path + '.zip.part')
+    assert len(release_server.requests_log) == 1
+
+
+def test_warm_hit_skips_hashing(model_store, release_server, tmp_path, monkeypatch):
+    file_path = _get_model_file(model_store, tmp_path)
+    hashed_file_paths = _count_hashing(model_store, monkeypatch)
+    assert _get_model_file(model_store, tmp_path) == file_path
+    assert hashed_file_paths == []
+    assert len(release_server.requests_log) == 1
+
+
+def test_stale_stamp_mtime_forces_hashing(model_store, release_server, tmp_path, monkeypatch):
+    file_path = _get_model_file(model_store, tmp_path)
+    file_stat = os.stat(file_path)
+    os.utime(file_path, (file_stat.st_atime, file_stat.st_mtime - 100.0))
+    hashed_file_paths = _count_hashing(model_store, monkeypatch)
+    assert _get_model_file(model_store, tmp_path) == file_path
+    # The content is intact, so it's hashed once and not downloaded again:
+    assert hashed_file_paths == [file_path]
+    assert len(release_server.requests_log) == 1
+    # The stamp is refreshed, and the next hit skips hashing:
+    del hashed_file_paths[:]
+    _get_model_file(model_store, tmp_path)
+    assert hashed_file_paths == []
+
+
+def test_stale_stamp_size_forces_download(model_store, release_server, tmp_path, monkeypatch):
+    file_path = _get_model_file(model_store, tmp_path)
+    with open(file_path, 'ab') as f:
+        f.write(b'\0')
+    hashed_file_paths = _count_hashing(model_store, monkeypatch)
+    assert _get_model_file(model_store, tmp_path) == file_path
+    # The corrupted file is hashed, downloaded again, and the new one is hashed:
+    assert hashed_file_paths == [file_path, file_path]
+    assert len(release_server.requests_log) == 2
+    with open(file_path, 'rb') as f:
+        assert f.read() == release_server.model_file_data
+
+
+@pytest.mark.parametrize('range_status', [206, 200, 416])
+def test_part_file_resume(model_store, release_server, tmp_path, range_status):
+    release_server.range_status = range_status
+    zip_data = release_server.zip_data
+    # The server responds with 416 only if the partial file is already complete:
+    part_size = len(zip_data) if range_status == 416 else len(zip_data) // 3
+    file_path = os.path.join(str(tmp_path), release_server.model_file_name)
+    with open(file_path + '.zip.part', 'wb') as f:
+        f.write(zip_data[:part_size])
+
+    assert _get_model_file(model_store, tmp_path) == file_path
+    with open(file_path, 'rb') as f:
+        assert f.read() == release_server.model_file_data
+    assert not os.path.exists(file_path + '.zip.part')
+    assert len(release_server.requests_log) == 1
+    assert release_server.requests_log[0][1] == 'bytes={}-'.format(part_size)
+
+
+def test_prefetch_same_model(model_store, release_server, tmp_path):
+    release_server.chunk_delay = 0.01
+    file_paths = model_store.prefetch(
+        model_names=[_model_name] * 4,
+        workers=4,
+        local_model_store_dir_path=str(tmp_path))
+    assert len(set(file_paths)) == 1 and len(file_paths) == 4
+    assert len(release_server.requests_log) == 1
+    with open(file_paths[0], 'rb') as f:
+        assert f.read() == release_server.model_file_data
+
+
+def test_concurrent_prefetch_same_model(model_store, release_server, tmp_path):
+    release_server.chunk_delay = 0.01
+    results = []
+    errors = []
+
+    def prefetch():
+        try:
+            results.append(model_store.prefetch(
+                model_names=[_model_name],
+                local_model_store_dir_path=str(tmp_path)))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=prefetch) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    assert len(results) == 3
+    file_path = results[0][0]
+    assert all(result == [file_path] for result in results)
+    # The first call downloads the model, and the others wait for it and find the file in the cache:
+    assert len(release_server.requests_log) == 1
+    with open(file_path, 'rb') as f:
+        assert f.read() == release_server.model_file_data
+    assert not os.path.exists(file_path + '.zip.part')
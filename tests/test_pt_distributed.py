@@ -0,0 +1,100 @@
+"""
+    Tests of distributed validation (PyTorch): 2 CPU processes with the gloo backend validate shards of a dataset, and
+    the all-reduced errors are compared with the ones of a single process.
+"""
+
+import os
+import json
+import socket
+
+import pytest
+
+torch = pytest.importorskip('torch')
+
+_world_size = 2
+# The number of samples isn't divisible by the world size (a padding sampler would duplicate a sample):
+_num_samples = 37
+_batch_size = 4
+
+
+def _get_dataset_and_net():
+    torch.manual_seed(0)
+    data = torch.randn(_num_samples, 3, 4, 4)
+    target = torch.randint(low=0, high=10, size=(_num_samples,))
+    net = torch.nn.Sequential(
+        torch.nn.Flatten(),
+        torch.nn.Linear(in_features=48, out_features=10))
+    return torch.utils.data.TensorDataset(data, target), net
+
+
+def _validate(use_distributed):
+    from common.shard_sampler import ShardSampler
+    from pytorch.utils import AverageMeter, validate
+
+    dataset, net = _get_dataset_and_net()
+    sampler = ShardSampler(
+        length=len(dataset),
+        num_parts=torch.distributed.get_world_size(),
+        part_index=torch.distributed.get_rank()) if use_distributed else None
+    val_data = torch.utils.data.DataLoader(
+        dataset=dataset,
+        batch_size=_batch_size,
+        shuffle=False,
+        sampler=sampler)
+    err_top1, err_top5 = validate(
+        acc_top1=AverageMeter(),
+        acc_top5=AverageMeter(),
+        net=net,
+        val_data=val_data,
+        use_cuda=False,
+        use_distributed=use_distributed)
+    indices = list(sampler) if sampler is not None else list(range(len(dataset)))
+    return indices, err_top1, err_top5
+
+
+def _worker(rank, master_port, result_dir_path):
+    from pytorch.utils import init_pt_distributed
+
+    os.environ['MASTER_ADDR'] = '127.0.0.1'
+    os.environ['MASTER_PORT'] = str(master_port)
+    os.environ['RANK'] = str(rank)
+    os.environ['WORLD_SIZE'] = str(_world_size)
+    torch.set_num_threads(1)
+    # The process group is released on exit (an explicit `destroy_process_group` sporadically hangs with gloo):
+    init_pt_distributed(backend='gloo', use_cuda=False)
+    indices, err_top1, err_top5 = _validate(use_distributed=True)
+    with open(os.path.join(result_dir_path, '{}.json'.format(rank)), 'w') as f:
+        json.dump([indices, err_top1, err_top5], f)
+
+
+def _get_free_port():
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.bind(('127.0.0.1', 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    return port
+
+
+def test_distributed_validation(tmp_path):
+    if not torch.distributed.is_available():
+        pytest.skip('torch.distributed is not available')
+    import torch.multiprocessing as mp
+
+    mp.spawn(
+        _worker,
+        args=(_get_free_port(), str(tmp_path)),
+        nprocs=_world_size,
+        join=True)
+    results = []
+    for rank in range(_world_size):
+        with open(str(tmp_path / '{}.json'.format(rank)), 'r') as f:
+            results.append(json.load(f))
+
+    # Each sample is validated exactly once:
+    indices = sorted(sum([result[0] for result in results], []))
+    assert indices == list(range(_num_samples))
+
+    _, err_top1, err_top5 = _validate(use_distributed=False)
+    for _, dist_err_top1, dist_err_top5 in results:
+        assert dist_err_top1 == pytest.approx(err_top1, abs=1e-6)
+        assert dist_err_top5 == pytest.approx(err_top5, abs=1e-6)
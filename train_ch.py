@@ -264,7 +264,8 @@ def main():
         num_workers=args.num_workers,
         num_classes=num_classes,
         input_image_size=input_image_size,
-        resize_inv_factor=args.resize_inv_factor)
+        resize_inv_factor=args.resize_inv_factor,
+        val_cache_dir=args.val_cache_dir)
 
     trainer = prepare_trainer(
         net=net,
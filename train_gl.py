@@ -2,6 +2,7 @@ import argparse
 import time
 import logging
 import os
+import json
 import numpy as np
 import random
 
@@ -9,10 +10,14 @@ import mxnet as mx
 from mxnet import gluon
 from mxnet import autograd as ag
 
-from common.logger_utils import initialize_logging
+from common.logger_utils import initialize_logging, EpochSpeedMemoryMeter
 from common.train_log_param_saver import TrainLogParamSaver
+from common.stage_profiler import StageProfiler, null_stage
+from common.step_checkpoint import ResumableRandomSampler, StepCheckpointer, load_step_checkpoint_meta,\
+    restore_rng_states
 from gluon.lr_scheduler import LRScheduler
-from gluon.utils import prepare_mx_context, prepare_model, validate
+from gluon.utils import prepare_mx_kvstore, get_mx_memory_usage, prepare_model, validate, FlatGradBuffer,\
+    DeviceMetricAccumulator
 
 from gluon.imagenet1k import add_dataset_parser_arguments
 from gluon.imagenet1k import get_batch_fn
@@ -52,12 +57,23 @@ def parse_args():
         type=str,
         default='',
         help='resume from previously saved optimizer state if not None')
+    parser.add_argument(
+        '--resume-step',
+        type=str,
+        default='',
+        help='resume from the exact batch by a step checkpoint (.resume file), not supported with --use-rec')
 
     parser.add_argument(
         '--num-gpus',
         type=int,
         default=0,
         help='number of gpus to use.')
+    parser.add_argument(
+        '--kvstore',
+        type=str,
+        default='device',
+        choices=['local', 'device', 'dist_sync', 'dist_device_sync', 'horovod'],
+        help='type of key-value store for gradient aggregation (dist_* for multi-node training) or horovod')
     parser.add_argument(
         '-j',
         '--num-data-workers',
@@ -191,6 +207,14 @@ def parse_args():
         type=int,
         default=20,
         help='number of epochs without mixup at the end of training')
+    parser.add_argument(
+        '--reversible-backprop',
+        action='store_true',
+        help='reconstruct activations by inversion during backward pass instead of storing them (for i-RevNet)')
+    parser.add_argument(
+        '--amp',
+        action='store_true',
+        help='use automatic mixed precision (float16 compute with float32 BatchNorm/softmax and dynamic loss scaling)')
 
     parser.add_argument(
         '--log-interval',
@@ -202,6 +226,29 @@ def parse_args():
         type=int,
         default=4,
         help='saving parameters epoch interval, best model will always be saved')
+    parser.add_argument(
+        '--async-save',
+        action='store_true',
+        help='write checkpoints from a background thread (training continues after parameters are copied)')
+    parser.add_argument(
+        '--checkpoint-steps',
+        type=int,
+        default=0,
+        help='interval of mid-epoch checkpoints in training steps (0 means disabled, not supported with --use-rec)')
+    parser.add_argument(
+        '--checkpoint-minutes',
+        type=float,
+        default=0.0,
+        help='interval of mid-epoch checkpoints in minutes (0 means disabled, not supported with --use-rec)')
+    parser.add_argument(
+        '--profile-stages',
+        action='store_true',
+        help='profile stages of training steps (summary in log and Chrome trace `train_trace.json` in save-dir)')
+    parser.add_argument(
+        '--profile-sample-interval',
+        type=int,
+        default=100,
+        help='interval of profiled (synchronized) training steps')
     parser.add_argument(
         '--save-dir',
         type=str,
@@ -235,6 +282,9 @@ def parse_args():
         default='',
         help='Regexp for selecting layers for fine tuning')
     args = parser.parse_args()
+    if args.use_rec and (args.checkpoint_steps or args.checkpoint_minutes or args.resume_step):
+        parser.error('step checkpoints (--checkpoint-steps, --checkpoint-minutes, --resume-step) are not '
+                     'supported with --use-rec, because ImageRecordIter can not be resumed from a batch')
     return args
 
 
@@ -268,7 +318,11 @@ def prepare_trainer(net,
                     gamma_wd_mult=1.0,
                     beta_wd_mult=1.0,
                     bias_wd_mult=1.0,
-                    state_file_path=None):
+                    state_file_path=None,
+                    kvstore='device',
+                    num_dist_workers=1,
+                    use_amp=False,
+                    update_on_kvstore=None):
 
     if gamma_wd_mult != 1.0:
         for k, v in net.collect_params('.*gamma').items():
@@ -307,14 +361,42 @@ def prepare_trainer(net,
     if dtype != 'float32':
         optimizer_params['multi_precision'] = True
 
-    trainer = gluon.Trainer(
-        params=net.collect_params(),
-        optimizer=optimizer_name,
-        optimizer_params=optimizer_params)
+    if kvstore == 'horovod':
+        import horovod.mxnet as hvd
+        hvd.broadcast_parameters(net.collect_params(), root_rank=0)
+        trainer = hvd.DistributedTrainer(
+            params=net.collect_params(),
+            optimizer=optimizer_name,
+            optimizer_params=optimizer_params)
+    elif isinstance(kvstore, mx.kvstore.KVStore):
+        # Gradients are summed over workers, so they are averaged here (as in Horovod). The update is done locally to
+        # keep the optimizer states on workers (they can't be saved from servers):
+        optimizer_params['rescale_grad'] = 1.0 / num_dist_workers
+        trainer = gluon.Trainer(
+            params=net.collect_params(),
+            optimizer=optimizer_name,
+            optimizer_params=optimizer_params,
+            kvstore=kvstore,
+            update_on_kvstore=False)
+    else:
+        trainer = gluon.Trainer(
+            params=net.collect_params(),
+            optimizer=optimizer_name,
+            optimizer_params=optimizer_params,
+            kvstore=kvstore,
+            update_on_kvstore=update_on_kvstore)
+
+    if use_amp:
+        from mxnet.contrib import amp
+        amp.init_trainer(trainer)
 
     if (state_file_path is not None) and state_file_path and os.path.exists(state_file_path):
         logging.info('Loading trainer states: {}'.format(state_file_path))
         trainer.load_states(state_file_path)
+        amp_file_path = os.path.splitext(state_file_path)[0] + '.amp'
+        if use_amp and os.path.exists(amp_file_path):
+            with open(amp_file_path, 'r') as f:
+                set_amp_loss_scaler_state(trainer, json.load(f))
         if trainer._optimizer.wd != wd:
             trainer._optimizer.wd = wd
             logging.info('Reset the weight decay: {}'.format(wd))
@@ -324,16 +406,110 @@ def prepare_trainer(net,
     return trainer, lr_scheduler
 
 
+def get_amp_loss_scaler_state(trainer):
+    # The dynamic loss scale isn't a part of trainer states, so it's saved separately:
+    if not hasattr(trainer, '_amp_loss_scaler'):
+        return None
+    loss_scaler = trainer._amp_loss_scaler
+    return {'loss_scale': loss_scaler._loss_scale,
+            'next_loss_scale': loss_scaler._next_loss_scale,
+            'unskipped': loss_scaler._unskipped}
+
+
+def set_amp_loss_scaler_state(trainer,
+                              state):
+    loss_scaler = trainer._amp_loss_scaler
+    loss_scaler._loss_scale = state['loss_scale']
+    loss_scaler._next_loss_scale = state['next_loss_scale']
+    loss_scaler._unskipped = state['unskipped']
+    logging.info('Restored AMP loss scale: {}'.format(state['loss_scale']))
+
+
+def write_amp_loss_scaler_state(file_stem,
+                                amp_loss_scaler):
+    if amp_loss_scaler is not None:
+        with open(file_stem + '.amp', 'w') as f:
+            json.dump(amp_loss_scaler, f)
+
+
 def save_params(file_stem,
                 net,
                 trainer):
     net.save_parameters(file_stem + '.params')
     trainer.save_states(file_stem + '.states')
+    write_amp_loss_scaler_state(file_stem, get_amp_loss_scaler_state(trainer))
+
+
+def snapshot_params(net,
+                    trainer):
+    params = {name: param._reduce() for name, param in net._collect_params_with_prefix().items()}
+    updater = trainer._kvstore._updater if trainer._update_on_kvstore else trainer._updaters[0]
+    states = updater.get_states(dump_optimizer=True)
+    return {'params': params, 'states': states, 'amp_loss_scaler': get_amp_loss_scaler_state(trainer)}
+
+
+def write_params(file_stem,
+                 params,
+                 states,
+                 amp_loss_scaler=None):
+    mx.nd.save(file_stem + '.params', params)
+    with open(file_stem + '.states', 'wb') as f:
+        f.write(states)
+    write_amp_loss_scaler_state(file_stem, amp_loss_scaler)
+
+
+def save_step_checkpoint(step_checkpointer,
+                         epoch,
+                         batch,
+                         net,
+                         trainer,
+                         lr_scheduler,
+                         sampler,
+                         train_metrics):
+    # MXNet doesn't expose the state of its generator, so it's reseeded from NumPy generator:
+    mx_seed = np.random.randint(2 ** 31)
+    mx.random.seed(mx_seed)
+    meta = {
+        'mx_seed': mx_seed,
+        'sampler_seed': sampler.seed,
+        'lr_scheduler': {'learning_rate': lr_scheduler.learning_rate,
+                         'iteration': epoch * lr_scheduler.n_iters + batch},
+        'train_metrics': train_metrics.get_state(),
+        'amp_loss_scaler': get_amp_loss_scaler_state(trainer),
+    }
+    step_checkpointer.save(
+        epoch=epoch,
+        batch=batch,
+        meta=meta,
+        net=net,
+        trainer=trainer)
+
+
+def update_params(trainer,
+                  grad_buffer,
+                  batch_size,
+                  grad_clip_value,
+                  use_amp):
+    if grad_clip_value is None:
+        trainer.step(batch_size)
+        return
+    # Gradients are clipped after reduction across contexts/workers:
+    trainer.allreduce_grads()
+    if use_amp:
+        # AMP gradients are unscaled by clipping, so the original gradient rescaling of the trainer is restored:
+        scale = 1.0 / trainer._amp_loss_scaler.loss_scale
+        trainer._scale = trainer._amp_original_scale
+    else:
+        scale = 1.0
+    grad_buffer.clip_global_norm(
+        max_norm=grad_clip_value,
+        scale=scale)
+    trainer.update(batch_size)
 
 
 def train_epoch(epoch,
                 net,
-                acc_top1_train,
+                train_metrics,
                 train_data,
                 batch_fn,
                 data_source_needs_reset,
@@ -350,19 +526,40 @@ def train_epoch(epoch,
                 num_classes,
                 num_epochs,
                 grad_clip_value,
-                batch_size_scale):
+                batch_size_scale,
+                reversible_backprop=False,
+                sampler=None,
+                step_checkpointer=None,
+                resume_meta=None,
+                use_amp=False,
+                grad_buffer=None,
+                profiler=None,
+                speed_memory_meter=None):
+
+    if use_amp:
+        from mxnet.contrib import amp
 
     labels_list_inds = None
     batch_size_extend_count = 0
     tic = time.time()
     if data_source_needs_reset:
         train_data.reset()
-    acc_top1_train.reset()
-    train_loss = 0.0
-
+    train_metrics.reset()
+
+    start_batch = 0
+    if resume_meta is not None:
+        start_batch = resume_meta['batch']
+        train_metrics.set_state(resume_meta['train_metrics'])
+        lr_scheduler.learning_rate = resume_meta['lr_scheduler']['learning_rate']
+    if sampler is not None:
+        sampler.set_epoch(epoch, start_index=(start_batch * batch_size))
+
+    stage = profiler.stage if profiler is not None else null_stage
+    i = start_batch - 1
     btic = time.time()
-    for i, batch in enumerate(train_data):
-        data_list, labels_list = batch_fn(batch, ctx)
+    for i, batch in enumerate(profiler.iterate(train_data) if profiler is not None else train_data, start_batch):
+        with stage('h2d'):
+            data_list, labels_list = batch_fn(batch, ctx)
 
         if mixup:
             labels_list_inds = labels_list
@@ -379,56 +576,106 @@ def train_epoch(epoch,
             labels_list_inds = labels_list
             labels_list = [Y.one_hot(depth=num_classes, on_value=on_value, off_value=off_value) for Y in labels_list]
 
-        with ag.record():
-            outputs_list = [net(X.astype(dtype, copy=False)) for X in data_list]
-            loss_list = [loss_func(yhat, y.astype(dtype, copy=False)) for yhat, y in zip(outputs_list, labels_list)]
-        for loss in loss_list:
-            loss.backward()
-        lr_scheduler.update(i, epoch)
-
-        if grad_clip_value is not None:
-            grads = [v.grad(ctx[0]) for v in net.collect_params().values() if v._grad is not None]
-            gluon.utils.clip_global_norm(grads, max_norm=grad_clip_value)
-
-        if batch_size_scale == 1:
-            trainer.step(batch_size)
+        if reversible_backprop:
+            with stage('forward_backward'):
+                outputs_list, loss_list = zip(*[net.forward_backward(
+                    X.astype(dtype, copy=False),
+                    loss_func,
+                    y.astype(dtype, copy=False)) for X, y in zip(data_list, labels_list)])
         else:
-            if (i + 1) % batch_size_scale == 0:
-                batch_size_extend_count = 0
-                trainer.step(batch_size * batch_size_scale)
-                for p in net.collect_params().values():
-                    p.zero_grad()
+            with stage('forward'):
+                with ag.record():
+                    outputs_list = [net(X.astype(dtype, copy=False)) for X in data_list]
+                    loss_list = [loss_func(yhat, y.astype(dtype, copy=False))
+                                 for yhat, y in zip(outputs_list, labels_list)]
+            with stage('backward'):
+                if use_amp:
+                    with ag.record():
+                        with amp.scale_loss(loss_list, trainer) as scaled_loss_list:
+                            ag.backward(scaled_loss_list)
+                else:
+                    for loss in loss_list:
+                        loss.backward()
+
+        with stage('update'):
+            lr_scheduler.update(i, epoch)
+
+            if grad_buffer is not None:
+                grad_buffer.attach()
+
+            if batch_size_scale == 1:
+                update_params(
+                    trainer=trainer,
+                    grad_buffer=grad_buffer,
+                    batch_size=batch_size,
+                    grad_clip_value=grad_clip_value,
+                    use_amp=use_amp)
             else:
-                batch_size_extend_count += 1
-
-        train_loss += sum([loss.mean().asscalar() for loss in loss_list]) / len(loss_list)
-
-        acc_top1_train.update(
-            labels=(labels_list if not (mixup or label_smoothing) else labels_list_inds),
-            preds=outputs_list)
+                if (i + 1) % batch_size_scale == 0:
+                    batch_size_extend_count = 0
+                    update_params(
+                        trainer=trainer,
+                        grad_buffer=grad_buffer,
+                        batch_size=(batch_size * batch_size_scale),
+                        grad_clip_value=grad_clip_value,
+                        use_amp=use_amp)
+                    grad_buffer.zero_grad()
+                else:
+                    batch_size_extend_count += 1
+
+        with stage('metric'):
+            train_metrics.update(
+                labels=(labels_list if not (mixup or label_smoothing) else labels_list_inds),
+                preds=outputs_list,
+                losses=loss_list)
+
+        if (step_checkpointer is not None) and ((i + 1) % batch_size_scale == 0) and step_checkpointer.step():
+            save_step_checkpoint(
+                step_checkpointer=step_checkpointer,
+                epoch=epoch,
+                batch=(i + 1),
+                net=net,
+                trainer=trainer,
+                lr_scheduler=lr_scheduler,
+                sampler=sampler,
+                train_metrics=train_metrics)
 
         if log_interval and not (i + 1) % log_interval:
+            _, top1, _ = train_metrics.get()
+            err_top1_train = 1.0 - top1
             speed = batch_size * log_interval / (time.time() - btic)
             btic = time.time()
-            _, top1 = acc_top1_train.get()
-            err_top1_train = 1.0 - top1
             logging.info('Epoch[{}] Batch [{}]\tSpeed: {:.2f} samples/sec\ttop1-err={:.4f}\tlr={:.5f}'.format(
                 epoch + 1, i, speed, err_top1_train, trainer.learning_rate))
+            if profiler is not None:
+                profiler.log_summary('Epoch[{}] Batch [{}]'.format(epoch + 1, i))
 
     if (batch_size_scale != 1) and (batch_size_extend_count > 0):
-        trainer.step(batch_size * batch_size_extend_count)
-        for p in net.collect_params().values():
-            p.zero_grad()
-
-    throughput = int(batch_size * (i + 1) / (time.time() - tic))
-    logging.info('[Epoch {}] speed: {:.2f} samples/sec\ttime cost: {:.2f} sec'.format(
-        epoch + 1, throughput, time.time() - tic))
-
-    train_loss /= (i + 1)
-    _, top1 = acc_top1_train.get()
+        update_params(
+            trainer=trainer,
+            grad_buffer=grad_buffer,
+            batch_size=(batch_size * batch_size_extend_count),
+            grad_clip_value=grad_clip_value,
+            use_amp=use_amp)
+        grad_buffer.zero_grad()
+
+    mx.nd.waitall()
+    throughput = int(batch_size * (i + 1 - start_batch) / (time.time() - tic))
+    if speed_memory_meter is None:
+        speed_memory_meter = EpochSpeedMemoryMeter()
+    speed_str, memory_str = speed_memory_meter.update(
+        throughput=throughput,
+        memory_usage=get_mx_memory_usage(ctx[0]))
+    logging.info('[Epoch {}] speed: {}\ttime cost: {:.2f} sec\tmemory: {}'.format(
+        epoch + 1, speed_str, time.time() - tic, memory_str))
+    if profiler is not None:
+        profiler.log_summary('[Epoch {}]'.format(epoch + 1))
+
+    train_loss, top1, top5 = train_metrics.get()
     err_top1_train = 1.0 - top1
-    logging.info('[Epoch {}] training: err-top1={:.4f}\tloss={:.4f}'.format(
-        epoch + 1, err_top1_train, train_loss))
+    err_top5_train = 1.0 - top5
+    logging.info('[Epoch {}] training: err-top1={:.4f}\terr-top5={:.4f}\tloss={:.4f}'.format(
+        epoch + 1, err_top1_train, err_top5_train, train_loss))
 
     return err_top1_train, train_loss
 
@@ -452,26 +699,41 @@ def train_net(batch_size,
               num_classes,
               grad_clip_value,
               batch_size_scale,
-              ctx):
+              ctx,
+              reversible_backprop=False,
+              sampler=None,
+              step_checkpointer=None,
+              resume_meta=None,
+              use_amp=False,
+              profiler=None):
 
     assert (not (mixup and label_smoothing))
+    assert (not reversible_backprop) or hasattr(net, 'forward_backward')
 
     if batch_size_scale != 1:
         for p in net.collect_params().values():
             p.grad_req = 'add'
 
+    if (grad_clip_value is not None) or (batch_size_scale != 1):
+        grad_buffer = FlatGradBuffer(net.collect_params())
+    else:
+        grad_buffer = None
+
     if isinstance(ctx, mx.Context):
         ctx = [ctx]
 
     acc_top1_val = mx.metric.Accuracy()
     acc_top5_val = mx.metric.TopKAccuracy(5)
-    acc_top1_train = mx.metric.Accuracy()
+    train_metrics = DeviceMetricAccumulator()
+    speed_memory_meter = EpochSpeedMemoryMeter()
 
     loss_func = gluon.loss.SoftmaxCrossEntropyLoss(sparse_label=(not (mixup or label_smoothing)))
 
     assert (type(start_epoch1) == int)
     assert (start_epoch1 >= 1)
-    if start_epoch1 > 1:
+    if resume_meta is not None:
+        logging.info('Start training from [Epoch {}] Batch [{}]'.format(start_epoch1, resume_meta['batch']))
+    elif start_epoch1 > 1:
         logging.info('Start training from [Epoch {}]'.format(start_epoch1))
         err_top1_val, err_top5_val = validate(
             acc_top1=acc_top1_val,
@@ -490,7 +752,7 @@ def train_net(batch_size,
         err_top1_train, train_loss = train_epoch(
             epoch=epoch,
             net=net,
-            acc_top1_train=acc_top1_train,
+            train_metrics=train_metrics,
             train_data=train_data,
             batch_fn=batch_fn,
             data_source_needs_reset=data_source_needs_reset,
@@ -507,7 +769,16 @@ def train_net(batch_size,
             num_classes=num_classes,
             num_epochs=num_epochs,
             grad_clip_value=grad_clip_value,
-            batch_size_scale=batch_size_scale)
+            batch_size_scale=batch_size_scale,
+            reversible_backprop=reversible_backprop,
+            sampler=sampler,
+            step_checkpointer=step_checkpointer,
+            resume_meta=resume_meta,
+            use_amp=use_amp,
+            grad_buffer=grad_buffer,
+            profiler=profiler,
+            speed_memory_meter=speed_memory_meter)
+        resume_meta = None
 
         err_top1_val, err_top5_val = validate(
             acc_top1=acc_top1_val,
@@ -533,22 +804,46 @@ def train_net(batch_size,
     if lp_saver is not None:
         logging.info('Best err-top5: {:.4f} at {} epoch'.format(
             lp_saver.best_eval_metric_value, lp_saver.best_eval_metric_epoch))
+    if profiler is not None:
+        profiler.close()
 
 
 def main():
     args = parse_args()
+    if args.amp:
+        assert (args.dtype == 'float32'), 'AMP keeps float32 weights, so it is used with --dtype float32'
+        assert (not args.reversible_backprop)
+        # Operators are patched for mixed precision before the network is created:
+        from mxnet.contrib import amp
+        amp.init()
+    kv, rank, num_dist_workers, ctx, batch_size = prepare_mx_kvstore(
+        kvstore=args.kvstore,
+        num_gpus=args.num_gpus,
+        batch_size=args.batch_size)
+    # All workers should share the permutation of training samples:
+    sampler_seed = max(0, args.seed)
     args.seed = init_rand(seed=args.seed)
+    if num_dist_workers == 1:
+        sampler_seed = args.seed
 
     _, log_file_exist = initialize_logging(
-        logging_dir_path=args.save_dir,
+        logging_dir_path=(args.save_dir if rank == 0 else ''),
         logging_file_name=args.logging_file_name,
         script_args=args,
         log_packages=args.log_packages,
         log_pip_packages=args.log_pip_packages)
-
-    ctx, batch_size = prepare_mx_context(
-        num_gpus=args.num_gpus,
-        batch_size=args.batch_size)
+    if rank > 0:
+        logging.getLogger().setLevel(logging.WARNING)
+    if num_dist_workers > 1:
+        logging.info('Distributed training ({}): {} workers'.format(args.kvstore, num_dist_workers))
+
+    if args.resume_step:
+        resume_file_stem, resume_meta = load_step_checkpoint_meta(args.resume_step)
+        args.resume = resume_file_stem + '.params'
+        args.resume_state = resume_file_stem + '.states'
+        args.start_epoch = resume_meta['epoch'] + 1
+    else:
+        resume_meta = None
 
     net = prepare_model(
         model_name=args.model,
@@ -565,11 +860,27 @@ def main():
     num_classes = net.classes if hasattr(net, 'classes') else 1000
     input_image_size = net.in_size if hasattr(net, 'in_size') else (args.input_size, args.input_size)
 
+    if args.checkpoint_steps or args.checkpoint_minutes or args.resume_step:
+        assert (num_dist_workers == 1), 'Step checkpoints are not supported in distributed mode'
+        if resume_meta is not None:
+            sampler_seed = resume_meta['sampler_seed']
+        sampler = ResumableRandomSampler(seed=sampler_seed)
+    elif (num_dist_workers > 1) and (not args.use_rec):
+        sampler = ResumableRandomSampler(
+            seed=sampler_seed,
+            num_parts=num_dist_workers,
+            part_index=rank)
+    else:
+        sampler = None
     train_data = get_train_data_source(
         dataset_args=args,
         batch_size=batch_size,
         num_workers=args.num_workers,
-        input_image_size=input_image_size)
+        input_image_size=input_image_size,
+        sampler=sampler,
+        num_parts=num_dist_workers,
+        part_index=rank,
+        prefetch_ctx=(ctx if args.shm_prefetch else None))
     val_data = get_val_data_source(
         dataset_args=args,
         batch_size=batch_size,
@@ -594,16 +905,20 @@ def main():
         warmup_epochs=args.warmup_epochs,
         warmup_lr=args.warmup_lr,
         warmup_mode=args.warmup_mode,
-        batch_size=batch_size,
+        batch_size=(batch_size * num_dist_workers),
         num_epochs=args.num_epochs,
         num_training_samples=num_training_samples,
         dtype=args.dtype,
         gamma_wd_mult=args.gamma_wd_mult,
         beta_wd_mult=args.beta_wd_mult,
         bias_wd_mult=args.bias_wd_mult,
-        state_file_path=args.resume_state)
+        state_file_path=args.resume_state,
+        kvstore=kv,
+        num_dist_workers=num_dist_workers,
+        use_amp=args.amp,
+        update_on_kvstore=(False if args.grad_clip is not None else None))
 
-    if args.save_dir and args.save_interval:
+    if args.save_dir and args.save_interval and (rank == 0):
         lp_saver = TrainLogParamSaver(
             checkpoint_file_name_prefix='imagenet_{}'.format(args.model),
             last_checkpoint_file_name_suffix="last",
@@ -613,7 +928,9 @@ def main():
             last_checkpoint_file_count=2,
             best_checkpoint_file_count=2,
             checkpoint_file_save_callback=save_params,
-            checkpoint_file_exts=('.params', '.states'),
+            checkpoint_file_snapshot_callback=(snapshot_params if args.async_save else None),
+            checkpoint_file_write_callback=(write_params if args.async_save else None),
+            checkpoint_file_exts=(('.params', '.states', '.amp') if args.amp else ('.params', '.states')),
             save_interval=args.save_interval,
             num_epochs=args.num_epochs,
             param_names=['Val.Top1', 'Train.Top1', 'Val.Top5', 'Train.Loss', 'LR'],
@@ -626,6 +943,31 @@ def main():
     else:
         lp_saver = None
 
+    if args.save_dir and (args.checkpoint_steps or args.checkpoint_minutes):
+        step_checkpointer = StepCheckpointer(
+            checkpoint_file_path_prefix=os.path.join(args.save_dir, 'imagenet_{}_step'.format(args.model)),
+            checkpoint_file_save_callback=save_params,
+            checkpoint_file_exts=(('.params', '.states', '.amp') if args.amp else ('.params', '.states')),
+            interval_steps=args.checkpoint_steps,
+            interval_minutes=args.checkpoint_minutes)
+    else:
+        step_checkpointer = None
+
+    if args.profile_stages:
+        write_trace = args.save_dir and (rank == 0)
+        profiler = StageProfiler(
+            sync_func=mx.nd.waitall,
+            sample_interval=args.profile_sample_interval,
+            trace_file_path=(os.path.join(args.save_dir, 'train_trace.json') if write_trace else None))
+    else:
+        profiler = None
+
+    if resume_meta is not None:
+        restore_rng_states(resume_meta)
+        mx.random.seed(resume_meta['mx_seed'])
+        if args.amp and (resume_meta.get('amp_loss_scaler') is not None):
+            set_amp_loss_scaler_state(trainer, resume_meta['amp_loss_scaler'])
+
     train_net(
         batch_size=batch_size,
         num_epochs=args.num_epochs,
@@ -646,7 +988,13 @@ def main():
         num_classes=num_classes,
         grad_clip_value=args.grad_clip,
         batch_size_scale=args.batch_size_scale,
-        ctx=ctx)
+        ctx=ctx,
+        reversible_backprop=args.reversible_backprop,
+        sampler=sampler,
+        step_checkpointer=step_checkpointer,
+        resume_meta=resume_meta,
+        use_amp=args.amp,
+        profiler=profiler)
 
 
 if __name__ == '__main__':
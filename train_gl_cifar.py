@@ -572,7 +572,8 @@ def main():
         dataset_name=args.dataset,
         dataset_dir=args.data_dir,
         batch_size=batch_size,
-        num_workers=args.num_workers)
+        num_workers=args.num_workers,
+        prefetch_ctx=(ctx if args.shm_prefetch else None))
     val_data = get_val_data_source(
         dataset_name=args.dataset,
         dataset_dir=args.data_dir,
@@ -538,7 +538,8 @@ def main():
         dataset_args=args,
         batch_size=batch_size,
         num_workers=args.num_workers,
-        input_image_size=input_image_size)
+        input_image_size=input_image_size,
+        prefetch_ctx=(ctx if args.shm_prefetch else None))
     val_data = get_val_data_source(
         dataset_args=args,
         batch_size=batch_size,
@@ -10,10 +10,14 @@ import torch.nn as nn
 import torch.backends.cudnn as cudnn
 import torch.utils.data
 
-from common.logger_utils import initialize_logging
+from common.logger_utils import initialize_logging, EpochSpeedMemoryMeter
 from common.train_log_param_saver import TrainLogParamSaver
+from common.stage_profiler import StageProfiler, null_stage
+from common.step_checkpoint import ResumableRandomSampler, StepCheckpointer, load_step_checkpoint_meta,\
+    restore_rng_states
 from pytorch.imagenet1k import add_dataset_parser_arguments, get_train_data_loader, get_val_data_loader
-from pytorch.utils import prepare_pt_context, prepare_model, validate, accuracy, AverageMeter
+from pytorch.utils import prepare_pt_context, init_pt_distributed, get_pt_memory_usage, reset_pt_memory_usage,\
+    get_autocast_context, keep_batchnorm_fp32, prepare_model, validate, AverageMeter, DeviceMetricAccumulator
 
 
 def parse_args():
@@ -42,12 +46,30 @@ def parse_args():
         type=str,
         default='',
         help='resume from previously saved optimizer state if not None')
+    parser.add_argument(
+        '--resume-step',
+        type=str,
+        default='',
+        help='resume from the exact batch by a step checkpoint (.resume file) if not None')
 
     parser.add_argument(
         '--num-gpus',
         type=int,
         default=0,
         help='number of gpus to use.')
+    parser.add_argument(
+        '--distributed',
+        action='store_true',
+        help='use distributed data-parallel training (one process per GPU/CPU, launched by torchrun)')
+    parser.add_argument(
+        '--amp',
+        action='store_true',
+        help='use automatic mixed precision (float16 on GPU/bfloat16 on CPU with dynamic loss scaling on GPU)')
+    parser.add_argument(
+        '--dist-backend',
+        type=str,
+        default='',
+        help='backend for distributed training (nccl or gloo), default is nccl for GPUs and gloo for CPU')
     parser.add_argument(
         '-j',
         '--num-data-workers',
@@ -138,6 +160,29 @@ def parse_args():
         type=int,
         default=4,
         help='saving parameters epoch interval, best model will always be saved')
+    parser.add_argument(
+        '--async-save',
+        action='store_true',
+        help='write checkpoints from a background thread (training continues after parameters are copied)')
+    parser.add_argument(
+        '--checkpoint-steps',
+        type=int,
+        default=0,
+        help='interval of mid-epoch checkpoints in training steps (0 means disabled)')
+    parser.add_argument(
+        '--checkpoint-minutes',
+        type=float,
+        default=0.0,
+        help='interval of mid-epoch checkpoints in minutes (0 means disabled)')
+    parser.add_argument(
+        '--profile-stages',
+        action='store_true',
+        help='profile stages of training steps (summary in log and Chrome trace `train_trace.json` in save-dir)')
+    parser.add_argument(
+        '--profile-sample-interval',
+        type=int,
+        default=100,
+        help='interval of profiled (synchronized) training steps')
     parser.add_argument(
         '--save-dir',
         type=str,
@@ -197,7 +242,8 @@ def prepare_trainer(net,
                     # batch_size,
                     num_epochs,
                     # num_training_samples,
-                    state_file_path):
+                    state_file_path,
+                    grad_scaler=None):
 
     optimizer_name = optimizer_name.lower()
     if (optimizer_name == 'sgd') or (optimizer_name == 'nag'):
@@ -215,6 +261,8 @@ def prepare_trainer(net,
         if type(checkpoint) == dict:
             optimizer.load_state_dict(checkpoint['optimizer'])
             start_epoch = checkpoint['epoch']
+            if (grad_scaler is not None) and (checkpoint.get('grad_scaler') is not None):
+                grad_scaler.load_state_dict(checkpoint['grad_scaler'])
         else:
             start_epoch = None
     else:
@@ -262,54 +310,155 @@ def save_params(file_stem,
         f=(file_stem + '.states'))
 
 
+def copy_to_host(obj):
+    if isinstance(obj, torch.Tensor):
+        return obj.detach().to('cpu', copy=True)
+    elif isinstance(obj, dict):
+        return type(obj)((k, copy_to_host(v)) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple)):
+        return type(obj)(copy_to_host(v) for v in obj)
+    else:
+        return obj
+
+
+def snapshot_params(state):
+    return {'state': copy_to_host(state)}
+
+
+def save_step_checkpoint(step_checkpointer,
+                         epoch,
+                         batch,
+                         net,
+                         optimizer,
+                         lr_scheduler,
+                         sampler,
+                         train_metrics,
+                         grad_scaler=None):
+    meta = {
+        'torch_rng_state': torch.get_rng_state(),
+        'cuda_rng_states': (torch.cuda.get_rng_state_all() if torch.cuda.is_available() else None),
+        'sampler_seed': sampler.seed,
+        'lr_scheduler': lr_scheduler.state_dict(),
+        'train_metrics': train_metrics.get_state(),
+        'grad_scaler': (grad_scaler.state_dict() if grad_scaler is not None else None),
+    }
+    state = {
+        'epoch': epoch,
+        'state_dict': net.state_dict(),
+        'optimizer': optimizer.state_dict(),
+    }
+    step_checkpointer.save(
+        epoch=epoch,
+        batch=batch,
+        meta=meta,
+        state=state)
+
+
 def train_epoch(epoch,
-                acc_top1,
+                train_metrics,
                 net,
                 train_data,
                 use_cuda,
                 L,
                 optimizer,
-                # lr_scheduler,
+                lr_scheduler,
                 batch_size,
-                log_interval):
+                log_interval,
+                sampler=None,
+                step_checkpointer=None,
+                resume_meta=None,
+                use_amp=False,
+                grad_scaler=None,
+                profiler=None,
+                speed_memory_meter=None):
 
     tic = time.time()
     net.train()
-    acc_top1.reset()
-    train_loss = 0.0
+    train_metrics.reset()
+    reset_pt_memory_usage(use_cuda)
+
+    start_batch = 0
+    if resume_meta is not None:
+        start_batch = resume_meta['batch']
+        train_metrics.set_state(resume_meta['train_metrics'])
+    if sampler is not None:
+        if start_batch > 0:
+            sampler.set_epoch(epoch, start_index=(start_batch * batch_size))
+        else:
+            sampler.set_epoch(epoch)
 
+    stage = profiler.stage if profiler is not None else null_stage
+    i = start_batch - 1
     btic = time.time()
-    for i, (data, target) in enumerate(train_data):
-        if use_cuda:
-            data = data.cuda(non_blocking=True)
-            target = target.cuda(non_blocking=True)
-        output = net(data)
-        loss = L(output, target)
-        optimizer.zero_grad()
-        loss.backward()
-        optimizer.step()
-
-        train_loss += loss.item()
-        prec1 = accuracy(output, target, topk=(1, ))
-        acc_top1.update(prec1[0], data.size(0))
+    for i, (data, target) in enumerate(profiler.iterate(train_data) if profiler is not None else train_data,
+                                       start_batch):
+        with stage('h2d'):
+            if use_cuda:
+                data = data.cuda(non_blocking=True)
+                target = target.cuda(non_blocking=True)
+        with stage('forward'):
+            with get_autocast_context(use_amp=use_amp, use_cuda=use_cuda):
+                output = net(data)
+            # The loss (with softmax) is calculated in float32 outside of autocast:
+            loss = L(output.float(), target)
+        with stage('backward'):
+            optimizer.zero_grad()
+            if grad_scaler is not None:
+                grad_scaler.scale(loss).backward()
+            else:
+                loss.backward()
+        with stage('update'):
+            if grad_scaler is not None:
+                # The update is skipped if the scaled gradients overflow:
+                grad_scaler.step(optimizer)
+                grad_scaler.update()
+            else:
+                optimizer.step()
+
+        with stage('metric'):
+            train_metrics.update(
+                output=output,
+                target=target,
+                loss=loss)
+
+        if (step_checkpointer is not None) and step_checkpointer.step():
+            save_step_checkpoint(
+                step_checkpointer=step_checkpointer,
+                epoch=epoch,
+                batch=(i + 1),
+                net=net,
+                optimizer=optimizer,
+                lr_scheduler=lr_scheduler,
+                sampler=sampler,
+                train_metrics=train_metrics,
+                grad_scaler=grad_scaler)
 
         if log_interval and not (i + 1) % log_interval:
-            top1 = acc_top1.avg.item()
+            _, top1, _ = train_metrics.get()
             err_top1_train = 1.0 - top1
             speed = batch_size * log_interval / (time.time() - btic)
             logging.info('Epoch[{}] Batch [{}]\tSpeed: {:.2f} samples/sec\ttop1-err={:.4f}\tlr={:.4f}'.format(
                 epoch + 1, i, speed, err_top1_train, optimizer.param_groups[0]['lr']))
+            if profiler is not None:
+                profiler.log_summary('Epoch[{}] Batch [{}]'.format(epoch + 1, i))
             btic = time.time()
 
-    top1 = acc_top1.avg.item()
+    train_loss, top1, top5 = train_metrics.get()
     err_top1_train = 1.0 - top1
-    train_loss /= (i + 1)
-    throughput = int(batch_size * (i + 1) / (time.time() - tic))
-
-    logging.info('[Epoch {}] training: err-top1={:.4f}\tloss={:.4f}'.format(
-        epoch + 1, err_top1_train, train_loss))
-    logging.info('[Epoch {}] speed: {:.2f} samples/sec\ttime cost: {:.2f} sec'.format(
-        epoch + 1, throughput, time.time() - tic))
+    err_top5_train = 1.0 - top5
+    throughput = int(batch_size * (i + 1 - start_batch) / (time.time() - tic))
+
+    logging.info('[Epoch {}] training: err-top1={:.4f}\terr-top5={:.4f}\tloss={:.4f}'.format(
+        epoch + 1, err_top1_train, err_top5_train, train_loss))
+    if speed_memory_meter is None:
+        speed_memory_meter = EpochSpeedMemoryMeter()
+    speed_str, memory_str = speed_memory_meter.update(
+        throughput=throughput,
+        memory_usage=get_pt_memory_usage(use_cuda))
+    logging.info('[Epoch {}] speed: {}\ttime cost: {:.2f} sec\tmemory: {}'.format(
+        epoch + 1, speed_str, time.time() - tic, memory_str))
+    if profiler is not None:
+        profiler.log_summary('[Epoch {}]'.format(epoch + 1))
 
     return err_top1_train, train_loss
 
@@ -324,9 +473,18 @@ def train_net(batch_size,
               lr_scheduler,
               lp_saver,
               log_interval,
-              use_cuda):
+              use_cuda,
+              use_distributed=False,
+              sampler=None,
+              step_checkpointer=None,
+              resume_meta=None,
+              use_amp=False,
+              grad_scaler=None,
+              profiler=None):
     acc_top1 = AverageMeter()
     acc_top5 = AverageMeter()
+    train_metrics = DeviceMetricAccumulator()
+    speed_memory_meter = EpochSpeedMemoryMeter()
 
     L = nn.CrossEntropyLoss()
     if use_cuda:
@@ -334,14 +492,18 @@ def train_net(batch_size,
 
     assert (type(start_epoch1) == int)
     assert (start_epoch1 >= 1)
-    if start_epoch1 > 1:
+    if resume_meta is not None:
+        logging.info('Start training from [Epoch {}] Batch [{}]'.format(start_epoch1, resume_meta['batch']))
+        lr_scheduler.load_state_dict(resume_meta['lr_scheduler'])
+    elif start_epoch1 > 1:
         logging.info('Start training from [Epoch {}]'.format(start_epoch1))
         err_top1_val, err_top5_val = validate(
             acc_top1=acc_top1,
             acc_top5=acc_top5,
             net=net,
             val_data=val_data,
-            use_cuda=use_cuda)
+            use_cuda=use_cuda,
+            use_distributed=use_distributed)
         logging.info('[Epoch {}] validation: err-top1={:.4f}\terr-top5={:.4f}'.format(
             start_epoch1 - 1, err_top1_val, err_top5_val))
 
@@ -350,26 +512,36 @@ def train_net(batch_size,
 
     gtic = time.time()
     for epoch in range(start_epoch1 - 1, num_epochs):
-        lr_scheduler.step()
+        if resume_meta is None:
+            lr_scheduler.step()
 
         err_top1_train, train_loss = train_epoch(
             epoch,
-            acc_top1,
+            train_metrics,
             net,
             train_data,
             use_cuda,
             L,
             optimizer,
-            # lr_scheduler,
+            lr_scheduler,
             batch_size,
-            log_interval)
+            log_interval,
+            sampler=sampler,
+            step_checkpointer=step_checkpointer,
+            resume_meta=resume_meta,
+            use_amp=use_amp,
+            grad_scaler=grad_scaler,
+            profiler=profiler,
+            speed_memory_meter=speed_memory_meter)
+        resume_meta = None
 
         err_top1_val, err_top5_val = validate(
             acc_top1=acc_top1,
             acc_top5=acc_top5,
             net=net,
             val_data=val_data,
-            use_cuda=use_cuda)
+            use_cuda=use_cuda,
+            use_distributed=use_distributed)
 
         logging.info('[Epoch {}] validation: err-top1={:.4f}\terr-top5={:.4f}'.format(
             epoch + 1, err_top1_val, err_top5_val))
@@ -379,6 +551,7 @@ def train_net(batch_size,
                 'epoch': epoch + 1,
                 'state_dict': net.state_dict(),
                 'optimizer': optimizer.state_dict(),
+                'grad_scaler': (grad_scaler.state_dict() if grad_scaler is not None else None),
             }
             lp_saver_kwargs = {'state': state}
             lp_saver.epoch_test_end_callback(
@@ -390,45 +563,84 @@ def train_net(batch_size,
     if lp_saver is not None:
         logging.info('Best err-top5: {:.4f} at {} epoch'.format(
             lp_saver.best_eval_metric_value, lp_saver.best_eval_metric_epoch))
+    if profiler is not None:
+        profiler.close()
 
 
 def main():
     args = parse_args()
     args.seed = init_rand(seed=args.seed)
 
+    if args.distributed:
+        rank, world_size = init_pt_distributed(
+            backend=args.dist_backend,
+            use_cuda=(args.num_gpus > 0))
+    else:
+        rank, world_size = 0, 1
+
     _, log_file_exist = initialize_logging(
-        logging_dir_path=args.save_dir,
+        logging_dir_path=(args.save_dir if rank == 0 else ''),
         logging_file_name=args.logging_file_name,
         script_args=args,
         log_packages=args.log_packages,
         log_pip_packages=args.log_pip_packages)
+    if rank > 0:
+        logging.getLogger().setLevel(logging.WARNING)
+    if args.distributed:
+        logging.info('Distributed training: {} processes'.format(world_size))
 
     use_cuda, batch_size = prepare_pt_context(
-        num_gpus=args.num_gpus,
+        num_gpus=(min(1, args.num_gpus) if args.distributed else args.num_gpus),
         batch_size=args.batch_size)
 
+    if args.resume_step:
+        resume_file_stem, resume_meta = load_step_checkpoint_meta(args.resume_step)
+        args.resume = resume_file_stem + '.pth'
+        args.resume_state = resume_file_stem + '.states'
+        args.start_epoch = resume_meta['epoch'] + 1
+    else:
+        resume_meta = None
+
     net = prepare_model(
         model_name=args.model,
         use_pretrained=args.use_pretrained,
         pretrained_model_file_path=args.resume.strip(),
-        use_cuda=use_cuda)
+        use_cuda=use_cuda,
+        use_distributed=args.distributed)
+    if args.amp:
+        bn_count = keep_batchnorm_fp32(net)
+        logging.info('AMP: {} BatchNorm layers are kept in float32'.format(bn_count))
     if hasattr(net, 'module'):
         input_image_size = net.module.in_size[0] if hasattr(net.module, 'in_size') else args.input_size
     else:
         input_image_size = net.in_size[0] if hasattr(net, 'in_size') else args.input_size
 
+    if args.checkpoint_steps or args.checkpoint_minutes or args.resume_step:
+        assert (not args.distributed), 'Step checkpoints are not supported in distributed mode'
+        sampler = ResumableRandomSampler(seed=(resume_meta['sampler_seed'] if resume_meta is not None else args.seed))
+    else:
+        sampler = None
     train_data = get_train_data_loader(
         data_dir=args.data_dir,
         batch_size=batch_size,
         num_workers=args.num_workers,
-        input_image_size=input_image_size)
+        input_image_size=input_image_size,
+        sampler=sampler,
+        use_distributed=args.distributed)
+    if args.distributed:
+        sampler = train_data.sampler
 
     val_data = get_val_data_loader(
         data_dir=args.data_dir,
         batch_size=batch_size,
         num_workers=args.num_workers,
         input_image_size=input_image_size,
-        resize_inv_factor=args.resize_inv_factor)
+        resize_inv_factor=args.resize_inv_factor,
+        cache_dir=args.val_cache_dir,
+        use_distributed=args.distributed)
+
+    # Loss scaling is needed only for float16 (on GPU), bfloat16 (on CPU) has the range of float32:
+    grad_scaler = torch.cuda.amp.GradScaler() if (args.amp and use_cuda) else None
 
     # num_training_samples = 1281167
     optimizer, lr_scheduler, start_epoch = prepare_trainer(
@@ -445,11 +657,12 @@ def main():
         # batch_size=batch_size,
         num_epochs=args.num_epochs,
         # num_training_samples=num_training_samples,
-        state_file_path=args.resume_state)
+        state_file_path=args.resume_state,
+        grad_scaler=grad_scaler)
     # if start_epoch is not None:
     #     args.start_epoch = start_epoch
 
-    if args.save_dir and args.save_interval:
+    if args.save_dir and args.save_interval and (rank == 0):
         lp_saver = TrainLogParamSaver(
             checkpoint_file_name_prefix='imagenet_{}'.format(args.model),
             last_checkpoint_file_name_suffix="last",
@@ -459,6 +672,8 @@ def main():
             last_checkpoint_file_count=2,
             best_checkpoint_file_count=2,
             checkpoint_file_save_callback=save_params,
+            checkpoint_file_snapshot_callback=(snapshot_params if args.async_save else None),
+            checkpoint_file_write_callback=(save_params if args.async_save else None),
             checkpoint_file_exts=('.pth', '.states'),
             save_interval=args.save_interval,
             num_epochs=args.num_epochs,
@@ -472,6 +687,33 @@ def main():
     else:
         lp_saver = None
 
+    if args.save_dir and (args.checkpoint_steps or args.checkpoint_minutes):
+        step_checkpointer = StepCheckpointer(
+            checkpoint_file_path_prefix=os.path.join(args.save_dir, 'imagenet_{}_step'.format(args.model)),
+            checkpoint_file_save_callback=save_params,
+            checkpoint_file_exts=('.pth', '.states'),
+            interval_steps=args.checkpoint_steps,
+            interval_minutes=args.checkpoint_minutes)
+    else:
+        step_checkpointer = None
+
+    if args.profile_stages:
+        write_trace = args.save_dir and (rank == 0)
+        profiler = StageProfiler(
+            sync_func=(torch.cuda.synchronize if use_cuda else None),
+            sample_interval=args.profile_sample_interval,
+            trace_file_path=(os.path.join(args.save_dir, 'train_trace.json') if write_trace else None))
+    else:
+        profiler = None
+
+    if resume_meta is not None:
+        restore_rng_states(resume_meta)
+        torch.set_rng_state(resume_meta['torch_rng_state'])
+        if (resume_meta['cuda_rng_states'] is not None) and torch.cuda.is_available():
+            torch.cuda.set_rng_state_all(resume_meta['cuda_rng_states'])
+        if (grad_scaler is not None) and (resume_meta.get('grad_scaler') is not None):
+            grad_scaler.load_state_dict(resume_meta['grad_scaler'])
+
     train_net(
         batch_size=batch_size,
         num_epochs=args.num_epochs,
@@ -483,7 +725,14 @@ def main():
         lr_scheduler=lr_scheduler,
         lp_saver=lp_saver,
         log_interval=args.log_interval,
-        use_cuda=use_cuda)
+        use_cuda=use_cuda,
+        use_distributed=args.distributed,
+        sampler=sampler,
+        step_checkpointer=step_checkpointer,
+        resume_meta=resume_meta,
+        use_amp=args.amp,
+        grad_scaler=grad_scaler,
+        profiler=profiler)
 
 
 if __name__ == '__main__':
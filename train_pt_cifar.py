@@ -13,7 +13,7 @@ import torch.utils.data
 from common.logger_utils import initialize_logging
 from common.train_log_param_saver import TrainLogParamSaver
 from pytorch.cifar import add_dataset_parser_arguments, get_train_data_loader, get_val_data_loader
-from pytorch.utils import prepare_pt_context, prepare_model, validate1, accuracy, AverageMeter
+from pytorch.utils import prepare_pt_context, init_pt_distributed, prepare_model, validate1, accuracy, AverageMeter
 
 
 def parse_args():
@@ -55,6 +55,15 @@ def parse_args():
         type=int,
         default=0,
         help='number of gpus to use.')
+    parser.add_argument(
+        '--distributed',
+        action='store_true',
+        help='use distributed data-parallel training (one process per GPU/CPU, launched by torchrun)')
+    parser.add_argument(
+        '--dist-backend',
+        type=str,
+        default='',
+        help='backend for distributed training (nccl or gloo), default is nccl for GPUs and gloo for CPU')
     parser.add_argument(
         '-j',
         '--num-data-workers',
@@ -278,12 +287,15 @@ def train_epoch(epoch,
                 optimizer,
                 # lr_scheduler,
                 batch_size,
-                log_interval):
+                log_interval,
+                sampler=None):
 
     tic = time.time()
     net.train()
     acc_metric_train.reset()
     train_loss = 0.0
+    if sampler is not None:
+        sampler.set_epoch(epoch)
 
     btic = time.time()
     for i, (data, target) in enumerate(train_data):
@@ -331,7 +343,9 @@ def train_net(batch_size,
               lr_scheduler,
               lp_saver,
               log_interval,
-              use_cuda):
+              use_cuda,
+              use_distributed=False,
+              sampler=None):
     acc_metric_val = AverageMeter()
     acc_metric_train = AverageMeter()
 
@@ -347,7 +361,8 @@ def train_net(batch_size,
             accuracy_metric=acc_metric_val,
             net=net,
             val_data=val_data,
-            use_cuda=use_cuda)
+            use_cuda=use_cuda,
+            use_distributed=use_distributed)
         logging.info('[Epoch {}] validation: err={:.4f}'.format(
             start_epoch1 - 1, err_val))
 
@@ -365,13 +380,15 @@ def train_net(batch_size,
             optimizer,
             # lr_scheduler,
             batch_size,
-            log_interval)
+            log_interval,
+            sampler=sampler)
 
         err_val = validate1(
             accuracy_metric=acc_metric_val,
             net=net,
             val_data=val_data,
-            use_cuda=use_cuda)
+            use_cuda=use_cuda,
+            use_distributed=use_distributed)
 
         logging.info('[Epoch {}] validation: err={:.4f}'.format(
             epoch + 1, err_val))
@@ -398,34 +415,48 @@ def main():
     args = parse_args()
     args.seed = init_rand(seed=args.seed)
 
+    if args.distributed:
+        rank, world_size = init_pt_distributed(
+            backend=args.dist_backend,
+            use_cuda=(args.num_gpus > 0))
+    else:
+        rank, world_size = 0, 1
+
     _, log_file_exist = initialize_logging(
-        logging_dir_path=args.save_dir,
+        logging_dir_path=(args.save_dir if rank == 0 else ''),
         logging_file_name=args.logging_file_name,
         script_args=args,
         log_packages=args.log_packages,
         log_pip_packages=args.log_pip_packages)
+    if rank > 0:
+        logging.getLogger().setLevel(logging.WARNING)
+    if args.distributed:
+        logging.info('Distributed training: {} processes'.format(world_size))
 
     use_cuda, batch_size = prepare_pt_context(
-        num_gpus=args.num_gpus,
+        num_gpus=(min(1, args.num_gpus) if args.distributed else args.num_gpus),
         batch_size=args.batch_size)
 
     net = prepare_model(
         model_name=args.model,
         use_pretrained=args.use_pretrained,
         pretrained_model_file_path=args.resume.strip(),
-        use_cuda=use_cuda)
+        use_cuda=use_cuda,
+        use_distributed=args.distributed)
 
     train_data = get_train_data_loader(
         dataset_name=args.dataset,
         dataset_dir=args.data_dir,
         batch_size=batch_size,
-        num_workers=args.num_workers)
+        num_workers=args.num_workers,
+        use_distributed=args.distributed)
 
     val_data = get_val_data_loader(
         dataset_name=args.dataset,
         dataset_dir=args.data_dir,
         batch_size=batch_size,
-        num_workers=args.num_workers)
+        num_workers=args.num_workers,
+        use_distributed=args.distributed)
 
     # num_training_samples = 1281167
     optimizer, lr_scheduler, start_epoch = prepare_trainer(
@@ -446,7 +477,7 @@ def main():
     # if start_epoch is not None:
     #     args.start_epoch = start_epoch
 
-    if args.save_dir and args.save_interval:
+    if args.save_dir and args.save_interval and (rank == 0):
         lp_saver = TrainLogParamSaver(
             checkpoint_file_name_prefix='{}_{}'.format(args.dataset.lower(), args.model),
             last_checkpoint_file_name_suffix="last",
@@ -480,7 +511,9 @@ def main():
         lr_scheduler=lr_scheduler,
         lp_saver=lp_saver,
         log_interval=args.log_interval,
-        use_cuda=use_cuda)
+        use_cuda=use_cuda,
+        use_distributed=args.distributed,
+        sampler=(train_data.sampler if args.distributed else None))
 
 
 if __name__ == '__main__':